@@ -0,0 +1,84 @@
+# LiDAR 스캔 처리 벤치마크
+# 기존 process_scan(Python 반복)과 process_scan_array(np.bincount) 비교
+#
+# 사용법:
+#   python3 bench_process_scan.py                      # 합성 스캔 사용
+#   python3 bench_process_scan.py --scans scans.json   # 기록된 스캔 사용
+#   python3 bench_process_scan.py --scans session.clrs # record_session.py 세션 파일 사용
+#
+# scans.json 형식: [[[quality, angle, distance], ...], ...] (iter_scans 출력 그대로)
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+from sensors.lidar_processor import LidarProcessor, ANGLE_LUT_RESOLUTION
+from sensors.session_log import SessionLog
+
+
+# 합성 스캔 생성 (RPLiDAR A1 한 바퀴 ≈ 360개 측정값, 1/64도 각도 분해능)
+def make_synthetic_scans(num_scans: int, points_per_scan: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    scans = []
+    for _ in range(num_scans):
+        angles = np.sort(rng.integers(0, 360 * ANGLE_LUT_RESOLUTION, points_per_scan)) / ANGLE_LUT_RESOLUTION
+        dists = rng.uniform(150, 8000, points_per_scan).round(2)
+        dists[rng.random(points_per_scan) < 0.05] = 0.0
+        scans.append([(15, float(a), float(d)) for a, d in zip(angles, dists)])
+    return scans
+
+
+# 기록된 스캔 로드 (JSON 또는 세션 파일)
+def load_scans(path: str):
+    if not path.endswith('.json'):
+        return SessionLog(path).scans
+    with open(path, 'r') as f:
+        return [[tuple(m) for m in scan] for scan in json.load(f)]
+
+
+# 함수 실행 시간 측정 (스캔 1개당 평균, 초)
+def time_per_scan(func, scans, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for scan in scans:
+            func(scan)
+    return (time.perf_counter() - start) / (repeat * len(scans))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='process_scan 벤치마크')
+    parser.add_argument('--scans', help='기록된 스캔 JSON 파일 또는 세션 파일')
+    parser.add_argument('--num-scans', type=int, default=200, help='합성 스캔 개수')
+    parser.add_argument('--points', type=int, default=360, help='합성 스캔당 측정값 개수')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수')
+    args = parser.parse_args()
+    
+    if args.scans:
+        scans = load_scans(args.scans)
+    else:
+        scans = make_synthetic_scans(args.num_scans, args.points)
+    
+    # 결과 일치 확인
+    mismatches = sum(
+        not np.array_equal(LidarProcessor.process_scan(scan), LidarProcessor.process_scan_array(scan))
+        for scan in scans
+    )
+    
+    t_loop = time_per_scan(LidarProcessor.process_scan, scans, args.repeat)
+    t_vec = time_per_scan(LidarProcessor.process_scan_array, scans, args.repeat)
+    
+    # 미리 배열로 변환된 입력 (전처리 단계에서 배열을 재사용하는 경우)
+    arrays = [np.asarray(scan, dtype=np.float64) for scan in scans]
+    t_arr = time_per_scan(LidarProcessor.process_scan_array, arrays, args.repeat)
+    
+    print(f"scans: {len(scans)}, mismatches: {mismatches}")
+    print(f"process_scan        : {t_loop * 1e3:8.3f} ms/scan")
+    print(f"process_scan_array  : {t_vec * 1e3:8.3f} ms/scan  (x{t_loop / t_vec:.1f})")
+    print(f"  (ndarray input)   : {t_arr * 1e3:8.3f} ms/scan  (x{t_loop / t_arr:.1f})")
+    
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
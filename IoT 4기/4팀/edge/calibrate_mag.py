@@ -0,0 +1,65 @@
+# 지자기 보정값 측정 도구
+# IMU를 카트에 장착한 상태에서 카트를 평평한 바닥에서 천천히 한 바퀴 이상 돌리며 지자기 X/Y를 기록하고
+# config.py에 넣을 IMU_MAG_HARD_IRON / IMU_MAG_SOFT_IRON_SCALE 값을 출력
+# (금속 카트의 자화로 생기는 치우침 보정, 기울기 보정은 하지 않으므로 카트가 수평일 때만 유효)
+#
+# 사용법:
+#   python3 calibrate_mag.py                 # 30초 동안 측정
+#   python3 calibrate_mag.py --duration 60
+import sys
+import time
+import argparse
+import numpy as np
+
+from sensors import IMUHandler
+
+# 측정 방향 사이 최대 빈 각도 (이보다 크면 한 바퀴를 다 돌지 않은 것으로 판단)
+MAX_HEADING_GAP_DEG = 45.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지자기 hard-iron/축 배율 보정값 측정')
+    parser.add_argument('--duration', type=float, default=30.0, help='측정 시간 (초)')
+    parser.add_argument('--rate', type=float, default=50.0, help='측정 주기 (Hz)')
+    args = parser.parse_args()
+    
+    imu = IMUHandler()
+    if imu.mpu is None:
+        print("IMU 연결 실패")
+        return 1
+    
+    print(f"{args.duration:.0f}초 동안 카트를 제자리에서 천천히 한 바퀴 이상 돌려 주세요")
+    samples = []
+    end = time.perf_counter() + args.duration
+    while time.perf_counter() < end:
+        xy = imu.read_mag_xy()
+        if xy is not None:
+            samples.append(xy)
+        time.sleep(1.0 / args.rate)
+    
+    if len(samples) < 10:
+        print(f"지자기 측정값 부족 ({len(samples)}개)")
+        return 1
+    
+    samples = np.array(samples)
+    offset, scale = IMUHandler.fit_mag_calibration(samples[:, 0], samples[:, 1])
+    
+    # 보정 후 방향 분포로 한 바퀴를 다 돌았는지 확인
+    headings = np.sort(np.degrees(np.arctan2((samples[:, 1] - offset[1]) * scale[1],
+                                             (samples[:, 0] - offset[0]) * scale[0])) % 360)
+    gaps = np.diff(np.concatenate([headings, headings[:1] + 360]))
+    
+    print(f"측정값 {len(samples)}개, 방향 최대 빈 구간 {gaps.max():.1f}°")
+    if gaps.max() > MAX_HEADING_GAP_DEG:
+        print(f"한 바퀴를 다 돌지 않았습니다 (빈 구간 > {MAX_HEADING_GAP_DEG:.0f}°), 다시 측정해 주세요")
+        return 1
+    
+    print()
+    print("# config.py")
+    print(f"IMU_MAG_HARD_IRON = ({offset[0]:.2f}, {offset[1]:.2f})")
+    print(f"IMU_MAG_SOFT_IRON_SCALE = ({scale[0]:.4f}, {scale[1]:.4f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
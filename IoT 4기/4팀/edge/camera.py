@@ -1,10 +1,17 @@
 import os
 import sys
 import time
+import threading
 import cv2
-import socketio
-from picamera2 import Picamera2
-from ultralytics import YOLO
+
+try:
+    from ultralytics import YOLO
+except ImportError:  # 오프라인(리플레이 테스트) 환경에서는 모델 없이 ItemCamera만 사용
+    YOLO = None
+
+from vision import ChangeDetector, IoUTracker, crop_roi, roi_image_size, open_frame_source
+from utils import LatestQueue, StageLatency
+from communication import SocketClient, AsyncEmitter
 
 # ==========================================
 # ⚙️ 설정
@@ -18,128 +25,286 @@ IMG_SIZE = 640
 DIFF_THRESHOLD = 20
 DIFF_AREA_MIN = 1000
 YOLO_INTERVAL = 1.0  # 분석 주기 (초)
+FRAME_SIZE = (640, 480)
+CHANGE_DOWNSCALE = 4  # 변화 감지용 축소 배율 (640x480 → 160x120)
+ROI_MARGIN = 32       # 변화 영역 경계 상자 여백 (px)
+ROI_MIN_SIZE = 160    # YOLO 입력 ROI 최소 크기 (px)
+YOLO_ON_ROI = True    # False면 전체 프레임으로 추론
+EMIT_QUEUE_SIZE = 64  # 전송 대기 이벤트 최대 수 (서버 재연결 중 보관)
+EMIT_RETRY_INTERVAL = 1.0  # 서버 연결/전송 실패 시 재시도 간격 (초)
+EMIT_MAX_RETRIES = 3  # 연결된 상태에서 전송이 실패한 이벤트의 재시도 횟수 (초과 시 버림, 재연결 대기는 무제한)
+STATS_INTERVAL = 10.0  # 처리 통계 출력 주기 (초)
+TRACK_IOU_THRESHOLD = 0.3  # 같은 물품으로 연결할 최소 IoU
+TRACK_MIN_HITS = 2    # 진입(update_item)으로 확정할 검출 횟수 (1이면 오검출 한 번에 바로 청구)
+TRACK_MAX_MISSES = 2  # 이탈(remove_item)로 판정할 연속 누락 횟수 (추론 영역 안에 있을 때만 셈)
+TRACK_MIN_COVERAGE = 0.5  # 누락으로 셀 추론 영역의 트랙 상자 포함 비율
 
 # 🎯 허용된 물체 목록
 ALLOWED_ITEMS = {'scissors', 'remote', 'mouse'}
 
-# 소켓 클라이언트
-sio = socketio.Client()
-
-def connect_socket():
-    try:
-        if not sio.connected:
-            sio.connect(SERVER_IP)
-            print(f"✅ 소켓 서버 연결 성공: {SERVER_IP}")
-    except Exception as e:
-        print(f"⚠️ 소켓 연결 실패: {e}")
-
 def find_model_path(name):
     paths = [f"./{name}", f"{os.path.expanduser('~')}/Desktop/{name}"]
     for p in paths:
         if os.path.exists(p): return p
     return None
 
-def load_model():
-    p_v11 = find_model_path("yolo11n_ncnn_model")
+def load_model(path=None):
+    if YOLO is None:
+        raise RuntimeError("❌ ultralytics가 설치되어 있지 않습니다.")
+    p_v11 = path or find_model_path("yolo11n_ncnn_model")
     if p_v11:
         print(f"✅ 모델 로드 성공: {p_v11}")
         return YOLO(p_v11, task="detect")
     raise FileNotFoundError("❌ 모델 폴더를 찾을 수 없습니다.")
 
-def send_to_server(item_name):
-    if item_name:
-        print(f"📡 [서버 전송] '{item_name}' 전송 완료 (중복 방지 처리됨)")
-        try:
-            if not sio.connected:
-                connect_socket()
-            sio.emit('update_item', {'item_name': item_name})
-        except Exception as e:
-            print(f"❌ 전송 실패: {e}")
 
-def main():
-    connect_socket()
+class ItemCamera:
+    # 장바구니 물품 인식 파이프라인 (단계마다 별도 스레드)
+    #   capture  : capture_array → 변화 감지 → 변화가 있는 프레임만 frame_slot (최신 1장만 유지, 밀린 프레임은 버림)
+    #   inference: frame_slot → YOLO (YOLO_INTERVAL 간격) → IoUTracker → 진입 update_item / 이탈 remove_item 전송 예약
+    #              미확정 트랙이 있으면 변화 프레임이 없어도 최신 프레임의 트랙 영역으로 다시 추론 (TRACK_MIN_HITS번 검출되어야 진입)
+    #   emitter  : 전송 큐 → Socket.IO (AsyncEmitter, 재연결 중에도 캡처/추론은 계속)
+    # YOLO가 도는 동안에도 캡처와 변화 감지는 계속되므로 추론이 끝나면 항상 최신 변화 프레임을 사용
+    # camera는 capture_array()만 있으면 됨 (vision.frame_source: Picamera2 / 영상·이미지 폴더 리플레이, 끝나면 None)
+    # 설정 인자 기본값은 위 ⚙️ 설정 (리플레이 벤치마크에서 값을 바꿔 비교)
+    
+    def __init__(self, camera, model, emitter, yolo_conf=YOLO_CONF, img_size=IMG_SIZE,
+                 yolo_interval=YOLO_INTERVAL, diff_threshold=DIFF_THRESHOLD, diff_area_min=DIFF_AREA_MIN,
+                 yolo_on_roi=YOLO_ON_ROI, latency_window=200):
+        self.camera = camera
+        self.model = model
+        self.emitter = emitter
+        self.yolo_conf = yolo_conf
+        self.img_size = img_size
+        self.yolo_interval = yolo_interval
+        self.yolo_on_roi = yolo_on_roi
+        self.detector = ChangeDetector(FRAME_SIZE, CHANGE_DOWNSCALE, diff_threshold, diff_area_min, ROI_MARGIN)
+        
+        # (캡처 시각, 프레임, 변화 영역)
+        self.frame_slot = LatestQueue(1)
+        # 변화와 무관한 최신 (캡처 시각, 프레임) - 미확정 트랙 재추론용
+        self.latest_frame = None
+        self.inference_latency = StageLatency(latency_window)
+        # 검출 지연: 변화 프레임 캡처 → 추론/트랙 갱신 완료 (frame_slot 대기 + 쿨타임 + YOLO)
+        self.detection_latency = StageLatency(latency_window)
+        self.stop_event = threading.Event()
+        self.capture_done = threading.Event()
+        self.threads = []
+        
+        # 물품 트랙 (추론 스레드에서만 갱신, 같은 물품을 여러 번 세지 않고 같은 종류 여러 개는 각각 셈)
+        self.tracker = IoUTracker(TRACK_IOU_THRESHOLD, TRACK_MIN_HITS, TRACK_MAX_MISSES, TRACK_MIN_COVERAGE)
+        
+        # 처리 통계
+        self.frames_captured = 0
+        self.frames_changed = 0
+        self.inferences = 0
+        self.confirm_inferences = 0
+        self.capture_errors = 0
+        self.inference_errors = 0
+        self._stats_time = time.perf_counter()
+        self._stats_counts = (0, 0)
+    
+    # 파이프라인 시작 (기준 프레임 설정 후 스레드 시작)
+    def start(self):
+        self.capture_done.clear()
+        self.detector.reset(self.camera.capture_array())
+        self.emitter.start()
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name='camera-capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='camera-inference', daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+    
+    # 파이프라인 정지 (남은 전송 이벤트는 emitter가 잠시 더 전송 시도)
+    def stop(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=2.0)
+        self.threads = []
+        self.emitter.stop()
+    
+    # 실행 중 여부 (리플레이가 끝나면 남은 변화 프레임까지 추론한 뒤 False)
+    def is_running(self):
+        return not self.stop_event.is_set() and any(thread.is_alive() for thread in self.threads)
+    
+    # 처리 통계 반환 (fps/추론 빈도는 직전 get_stats 호출 이후 구간 기준)
+    def get_stats(self):
+        now = time.perf_counter()
+        elapsed = max(now - self._stats_time, 1e-9)
+        frames, inferences = self.frames_captured, self.inferences
+        last_frames, last_inferences = self._stats_counts
+        self._stats_time = now
+        self._stats_counts = (frames, inferences)
+        
+        return {
+            'capture_fps': (frames - last_frames) / elapsed,
+            'inference_rate': (inferences - last_inferences) / elapsed,
+            'frames_captured': frames,
+            'frames_changed': self.frames_changed,
+            'frames_dropped': self.frame_slot.dropped,
+            'frame_queue_depth': len(self.frame_slot),
+            'inferences': inferences,
+            'confirm_inferences': self.confirm_inferences,
+            'inference_ms': self.inference_latency.snapshot(),
+            'detection_ms': self.detection_latency.snapshot(),
+            'capture_errors': self.capture_errors,
+            'inference_errors': self.inference_errors,
+            'tracks': len(self.tracker.tracks),
+            'items_in_cart': self.tracker.confirmed_count(),
+            'emit': self.emitter.get_stats(),
+        }
+    
+    # [capture 스레드] 프레임 캡처 및 변화 감지
+    def _capture_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                frame_rgb = self.camera.capture_array()
+            except Exception as e:
+                self.capture_errors += 1
+                self.stop_event.wait(0.1)
+                continue
+            
+            # 리플레이 끝
+            if frame_rgb is None:
+                break
+            
+            self.frames_captured += 1
+            self.latest_frame = (time.perf_counter(), frame_rgb)
+            change_box = self.detector.detect(frame_rgb)
+            if change_box is not None:
+                self.frames_changed += 1
+                self.frame_slot.put((time.perf_counter(), frame_rgb, change_box))
+        
+        self.capture_done.set()
+    
+    # [inference 스레드] 최신 변화 프레임으로 YOLO 추론
+    def _inference_loop(self):
+        last_yolo_time = 0.0
+        while not self.stop_event.is_set():
+            # 쿨타임 동안 대기 (그 사이 들어온 변화 프레임 중 최신 것만 남음)
+            wait = self.yolo_interval - (time.perf_counter() - last_yolo_time)
+            if wait > 0 and self.stop_event.wait(wait):
+                break
+            
+            # 미확정 트랙이 있으면 변화 프레임을 기다리지 않고 최신 프레임으로 재추론
+            pending = self.tracker.pending_box()
+            item = self.frame_slot.get(timeout=0.5 if pending is None else 0.0)
+            if item is None and pending is not None:
+                item = self._confirmation_item(pending)
+            if item is None:
+                if self.capture_done.is_set() and len(self.frame_slot) == 0:
+                    break
+                continue
+            
+            captured_at, frame_rgb, change_box = item
+            last_yolo_time = time.perf_counter()
+            try:
+                with self.inference_latency.measure():
+                    results, region = self._predict(frame_rgb, change_box)
+                self.inferences += 1
+                self._handle_results(results, region)
+                self.detection_latency.record(time.perf_counter() - captured_at)
+            except Exception as e:
+                self.inference_errors += 1
+    
+    # 미확정 트랙 재추론 항목 (최신 프레임, 트랙 영역 + ROI_MARGIN), 캡처 전이면 None
+    def _confirmation_item(self, pending):
+        if self.latest_frame is None:
+            return None
+        captured_at, frame_rgb = self.latest_frame
+        frame_h, frame_w = frame_rgb.shape[:2]
+        x1 = max(0, int(pending[0]) - ROI_MARGIN)
+        y1 = max(0, int(pending[1]) - ROI_MARGIN)
+        x2 = min(frame_w, int(pending[2]) + 1 + ROI_MARGIN)
+        y2 = min(frame_h, int(pending[3]) + 1 + ROI_MARGIN)
+        self.confirm_inferences += 1
+        return captured_at, frame_rgb, (x1, y1, x2 - x1, y2 - y1)
+    
+    # YOLO 추론 (변화 영역만 BGR 변환, 입력 크기도 ROI에 맞춤)
+    # 반환: (추론 결과, 추론 영역 (x1, y1, x2, y2) 원본 좌표)
+    def _predict(self, frame_rgb, change_box):
+        if self.yolo_on_roi:
+            roi, offset = crop_roi(frame_rgb, change_box, ROI_MIN_SIZE)
+            model_input = cv2.cvtColor(roi, cv2.COLOR_RGB2BGR)
+            imgsz = roi_image_size(model_input, self.img_size)
+        else:
+            offset = (0, 0)
+            model_input = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+            imgsz = self.img_size
+        
+        height, width = model_input.shape[:2]
+        region = (offset[0], offset[1], offset[0] + width, offset[1] + height)
+        return self.model.predict(model_input, imgsz=imgsz, conf=self.yolo_conf, verbose=False), region
+    
+    # 추론 결과로 트랙 갱신 후 진입/이탈 물품 전송 예약
+    def _handle_results(self, results, region):
+        detections = []
+        if results and results[0].boxes:
+            # ROI 좌표 → 원본 프레임 좌표 (트랙은 ROI가 달라도 같은 좌표계에서 비교)
+            dx, dy = region[0], region[1]
+            for box in results[0].boxes:
+                class_name = results[0].names[int(box.cls[0])]
+                if class_name not in ALLOWED_ITEMS:
+                    continue
+                x1, y1, x2, y2 = (float(v) for v in box.xyxy[0])
+                detections.append((class_name, float(box.conf[0]), (x1 + dx, y1 + dy, x2 + dx, y2 + dy)))
+        
+        entered, exited = self.tracker.update(detections, region)
+        
+        for track in entered:
+            self._emit_item('update_item', track)
+        for track in exited:
+            self._emit_item('remove_item', track)
+    
+    def _emit_item(self, event_name, track):
+        data = {'item_name': track.class_name, 'track_id': track.track_id}
+        if self.emitter.emit(event_name, data):
+            print(f"📡 [전송 예약] {event_name} '{track.class_name}' (트랙 {track.track_id}, 장바구니 {self.tracker.confirmed_count()}개)")
+        else:
+            print(f"❌ 전송 큐 가득 참: {event_name} '{track.class_name}'")
 
-    picam2 = Picamera2()
-    config = picam2.create_preview_configuration(main={"format": "BGR888", "size": (640, 480)})
-    picam2.configure(config)
-    picam2.start()
-    print("📷 카메라 가동 시작...")
+def print_stats(stats):
+    emit = stats['emit']
+    print(f"📊 캡처 {stats['capture_fps']:.1f}fps | 추론 {stats['inference_rate']:.2f}회/s "
+          f"(p95 {stats['inference_ms']['p95_ms']:.0f}ms) | 물품 {stats['items_in_cart']}개 | 프레임 큐 {stats['frame_queue_depth']} "
+          f"(버림 {stats['frames_dropped']}) | 전송 큐 {emit['queue_depth']} "
+          f"(전송 {emit['sent']}, 재시도 {emit['retries']}, 실패 {emit['failed']}, {'연결됨' if emit['connected'] else '연결 끊김'})")
 
+# 사용법: python3 camera.py [영상 파일 | 이미지 폴더]  (인자가 없으면 Picamera2 실시간 캡처)
+def main():
+    source_path = sys.argv[1] if len(sys.argv) > 1 else None
+    
+    client = SocketClient(SERVER_IP, send_mode='immediate')
+    emitter = AsyncEmitter(client, EMIT_QUEUE_SIZE, EMIT_RETRY_INTERVAL, EMIT_MAX_RETRIES)
+    
+    source = open_frame_source(source_path, FRAME_SIZE)
     model = load_model()
-    time.sleep(2)
-    baseline_frame = cv2.cvtColor(picam2.capture_array(), cv2.COLOR_RGB2BGR).copy()
-
-    # ==========================================
-    # 🛡️ 핵심: 이미 보낸 물품 목록 (집합)
-    # ==========================================
-    sent_items = set() 
     
-    last_yolo_time = 0
-
+    # 리플레이는 모델 로드 후 재생 시작 (대기 중 영상 시간이 흐르지 않도록)
+    source.start()
+    if source_path is None:
+        print("📷 카메라 가동 시작...")
+        time.sleep(2)
+    else:
+        print(f"📼 리플레이 시작: {source_path}")
+    
+    item_camera = ItemCamera(source, model, emitter)
+    
     try:
-        while True:
-            # --- 모든 물품을 다 찾았으면 루프 종료 가능 (선택 사항) ---
-            # if len(sent_items) == len(ALLOWED_ITEMS):
-            #     print("🎉 모든 물품 감지 완료! 프로그램을 종료합니다.")
-            #     break
-
-            # 1. 캡처 & 움직임 감지
-            frame_rgb = picam2.capture_array()
-            curr_frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-            
-            gray_curr = cv2.cvtColor(curr_frame, cv2.COLOR_BGR2GRAY)
-            gray_base = cv2.cvtColor(baseline_frame, cv2.COLOR_BGR2GRAY)
-            frame_diff = cv2.absdiff(gray_base, gray_curr)
-            _, thresh = cv2.threshold(frame_diff, DIFF_THRESHOLD, 255, cv2.THRESH_BINARY)
-            diff_pixels = cv2.countNonZero(thresh)
-
-            current_time = time.time()
-
-            # 2. 움직임 있고 + 쿨타임 지남
-            if diff_pixels > DIFF_AREA_MIN and (current_time - last_yolo_time > YOLO_INTERVAL):
-                
-                results = model.predict(curr_frame, imgsz=IMG_SIZE, conf=YOLO_CONF, verbose=False)
-                last_yolo_time = current_time
-
-                if results and results[0].boxes:
-                    # 이번 프레임에서 가장 확실한 물건 하나 찾기
-                    best_item = None
-                    best_conf = 0
-
-                    for box in results[0].boxes:
-                        class_idx = int(box.cls[0])
-                        class_name = results[0].names[class_idx]
-                        conf = float(box.conf[0])
-
-                        # 1. 허용된 물건인가? AND
-                        # 2. 이미 보낸 물건이 아닌가? (⭐️ 핵심 조건)
-                        if (class_name in ALLOWED_ITEMS) and (class_name not in sent_items):
-                            if conf > best_conf:
-                                best_conf = conf
-                                best_item = class_name
-                    
-                    # 3. 새로운 물건이 발견되었다면?
-                    if best_item:
-                        # 서버로 전송
-                        send_to_server(best_item)
-                        
-                        # [중요] 보낸 목록에 추가 -> 이제 영원히 다시 전송 안 함
-                        sent_items.add(best_item)
-                        
-                        print(f"🔒 [Lock] '{best_item}' 등록됨. 현재 보낸 목록: {sent_items}")
-
-            # 배경 갱신
-            baseline_frame = curr_frame.copy()
-            time.sleep(0.1)
-
+        item_camera.start()
+        while item_camera.is_running():
+            item_camera.stop_event.wait(STATS_INTERVAL)
+            print_stats(item_camera.get_stats())
+    
     except KeyboardInterrupt:
         print("\n🛑 프로그램 종료")
-        if sio.connected:
-            sio.disconnect()
     except Exception as e:
         print(f"⚠️ 오류 발생: {e}")
     finally:
-        picam2.stop()
+        item_camera.stop()
+        client.disconnect()
+        source.stop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,92 @@
+# 물품 인식 카메라 리플레이 벤치마크
+# 녹화한 쇼핑 영상(또는 이미지 폴더)으로 ItemCamera를 카메라/서버 없이 구동하여
+# 처리량, YOLO 호출 빈도, 변화 감지로 건너뛴 프레임 비율, 검출 지연 시간, 진입/이탈 이벤트 수를 보고
+#
+# 사용법:
+#   python3 camera_benchmark.py session.mp4                        # 기록 속도대로 재생 (기본)
+#   python3 camera_benchmark.py frames/ --fps 15                    # 이미지 폴더 (파일 이름 순서)
+#   python3 camera_benchmark.py session.mp4 --max-speed             # 대기 없이 모든 프레임 처리 (처리 한계 속도)
+#   python3 camera_benchmark.py session.mp4 --imgsz 320 --conf 0.4  # YOLO 입력 크기/신뢰도 비교
+#   python3 camera_benchmark.py session.mp4 --diff-threshold 30 --diff-area 2000 --full-frame
+#
+# 녹화 예: rpicam-vid -t 60000 --width 640 --height 480 -o session.mp4
+import sys
+import time
+import argparse
+
+import camera
+from camera import ItemCamera, load_model
+from communication import RecordingEmitter
+from vision import open_frame_source
+
+
+def main():
+    parser = argparse.ArgumentParser(description='물품 인식 카메라 리플레이 벤치마크')
+    parser.add_argument('source', help='녹화 영상 파일 또는 이미지 폴더')
+    parser.add_argument('--max-speed', action='store_true', help='대기 없이 모든 프레임 처리 (기본: 기록 속도대로 재생)')
+    parser.add_argument('--fps', type=float, default=30.0, help='이미지 폴더 프레임 속도 (기본 30)')
+    parser.add_argument('--model', help='YOLO 모델 경로 (기본: yolo11n_ncnn_model 탐색)')
+    parser.add_argument('--imgsz', type=int, default=camera.IMG_SIZE, help='YOLO 최대 입력 크기')
+    parser.add_argument('--conf', type=float, default=camera.YOLO_CONF, help='YOLO 신뢰도 하한')
+    parser.add_argument('--interval', type=float, default=camera.YOLO_INTERVAL, help='YOLO 최소 실행 간격 (초)')
+    parser.add_argument('--diff-threshold', type=int, default=camera.DIFF_THRESHOLD, help='변화로 볼 밝기 차이')
+    parser.add_argument('--diff-area', type=int, default=camera.DIFF_AREA_MIN, help='변화로 볼 최소 픽셀 수')
+    parser.add_argument('--full-frame', action='store_true', help='ROI 대신 전체 프레임으로 추론')
+    args = parser.parse_args()
+    
+    source = open_frame_source(args.source, camera.FRAME_SIZE, realtime=not args.max_speed, fps=args.fps)
+    model = load_model(args.model)
+    emitter = RecordingEmitter()
+    
+    # 벤치마크는 전체 구간 백분위수 (기본 최근 200개 대신 모든 샘플)
+    item_camera = ItemCamera(
+        source, model, emitter,
+        yolo_conf=args.conf, img_size=args.imgsz, yolo_interval=args.interval,
+        diff_threshold=args.diff_threshold, diff_area_min=args.diff_area,
+        yolo_on_roi=not args.full_frame, latency_window=1_000_000,
+    )
+    
+    source.start()
+    start = time.perf_counter()
+    item_camera.start()
+    try:
+        while item_camera.is_running():
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        print("\n🛑 중단 (중단 시점까지 결과 출력)")
+    elapsed = time.perf_counter() - start
+    item_camera.stop()
+    source.stop()
+    
+    stats = item_camera.get_stats()
+    frames = stats['frames_captured']
+    changed = stats['frames_changed']
+    inferences = stats['inferences']
+    media_time = source.media_time()
+    events = emitter.event_counts()
+    
+    print(f"소스: {args.source} ({source.frame_count}프레임, {source.fps:.1f}fps, 재생 {media_time:.1f}초)")
+    print(f"재생 모드: {'최대 속도' if args.max_speed else '기록 속도'}, 소요 {elapsed:.2f}초")
+    print(f"설정: imgsz {args.imgsz}, conf {args.conf}, interval {args.interval}s, "
+          f"diff {args.diff_threshold}/{args.diff_area}px, {'전체 프레임' if args.full_frame else 'ROI'}")
+    print()
+    print(f"처리 프레임: {frames}개 ({frames / elapsed:.1f} fps end-to-end), 늦어서 건너뛴 프레임 {source.frames_skipped}개")
+    print(f"변화 감지로 건너뜀: {frames - changed}개 ({(frames - changed) / max(frames, 1) * 100:.1f}%), "
+          f"변화 프레임 중 추론 전에 교체됨: {stats['frames_dropped']}개")
+    print(f"YOLO 호출: {inferences}회 ({inferences / elapsed * 60:.1f}회/분, 영상 기준 {inferences / max(media_time, 1e-9) * 60:.1f}회/분), "
+          f"그중 미확정 트랙 재추론 {stats['confirm_inferences']}회")
+    print(f"이벤트: update_item {events.get('update_item', 0)}개, remove_item {events.get('remove_item', 0)}개, "
+          f"종료 시 장바구니 {stats['items_in_cart']}개")
+    if stats['capture_errors'] or stats['inference_errors']:
+        print(f"오류: 캡처 {stats['capture_errors']}회, 추론 {stats['inference_errors']}회")
+    print()
+    print(f"{'stage':<12}{'count':>8}{'avg':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for stage, s in (('inference', stats['inference_ms']), ('detection', stats['detection_ms'])):
+        print(f"{stage:<12}{s['count']:>8}{s['avg_ms']:>10.2f}{s['p50_ms']:>10.2f}"
+              f"{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,69 +1,318 @@
 # LiDAR와 IMU를 사용한 실시간 로컬라이제이션 시스템
-from config import MAP_FILE, LIDAR_PORT, LIDAR_BAUDRATE, ENABLE_SERVER_COMMUNICATION
+import os
+import time
+import threading
+
+from config import (
+    MAP_FILE,
+    LIDAR_PORT,
+    LIDAR_BAUDRATE,
+    ENABLE_SERVER_COMMUNICATION,
+    LOCALIZER_ENGINE,
+    TRACKING_ENABLED,
+    ROTATION_SEARCH_BINS,
+    HEADING_CORRECTION_GAIN,
+    SCAN_QUEUE_SIZE,
+    SCAN_MAX_AGE,
+    LATENCY_WINDOW,
+    LIDAR_DESKEW_ENABLED,
+    TELEMETRY_ENABLED,
+    TELEMETRY_INTERVAL,
+    TELEMETRY_EVENT,
+    TELEMETRY_FILE,
+    MAP_RELOAD_ENABLED,
+    MAP_RELOAD_INTERVAL
+)
 from sensors import IMUHandler, LidarProcessor
-from localization import Localizer
+from localization import Localizer, ParticleLocalizer, LikelihoodFieldLocalizer
 from communication import SocketClient
 from utils import calculate_confidence_score, format_coordinates, print_status, is_confident
+from utils import LatestQueue, StageLatency, LATENCY_BUCKETS_MS, PipelineCounters, TelemetryReporter
+
+
+# 위치 추정 엔진 (config.LOCALIZER_ENGINE)
+LOCALIZER_ENGINES = {
+    'brute_force': Localizer,
+    'particle': ParticleLocalizer,
+    'likelihood_field': LikelihoodFieldLocalizer,
+}
 
 
 class CartLocalizationSystem:
     # 카트 위치 추적 시스템 메인 클래스
+    # 파이프라인 구조 (단계마다 별도 스레드):
+    #   reader  : iter_scans → scan_queue (최신 스캔만 유지, 밀린 스캔은 버림)
+    #   worker  : scan_queue → process_scan + 위치 추정 → result_queue
+    #   sender  : result_queue → 서버 전송
+    #   map-watcher (MAP_RELOAD_ENABLED): 맵 파일 변경 감지 → localizer.reload_map (worker는 교체 전까지 기존 테이블 사용)
+    # 매칭이 느려져도 reader는 막히지 않으므로 RPLiDAR 시리얼 버퍼가 넘치지 않음
+    # 텔레메트리: 단계별 카운터/오류/지연 시간 분포를 TELEMETRY_INTERVAL마다 서버 이벤트 + 로컬 파일로 보고
+    
+    # 파이프라인 단계 이름
+    STAGES = ('read', 'process', 'localize', 'emit')
     
     # 시스템 초기화
-    def __init__(self):        
+    # imu / lidar를 넘기면 해당 객체를 사용 (예: ReplayIMUHandler, ReplayLidarProcessor)
+    # map_reload / telemetry: 맵 감시 스레드와 주기 통계 보고 사용 여부 (벤치마크는 끄고 실행)
+    def __init__(self, imu=None, lidar=None, enable_server: bool = ENABLE_SERVER_COMMUNICATION,
+                 map_reload: bool = MAP_RELOAD_ENABLED, telemetry: bool = TELEMETRY_ENABLED):
         # 1. IMU 센서 초기화 및 시작
-        self.imu = IMUHandler()
+        self.imu = imu if imu is not None else IMUHandler()
         self.imu.start()
         
         # 2. 로컬라이저 초기화
-        self.localizer = Localizer(MAP_FILE)
+        self.localizer = LOCALIZER_ENGINES[LOCALIZER_ENGINE](MAP_FILE)
         
         # 3. LiDAR 초기화
-        self.lidar = LidarProcessor(LIDAR_PORT, LIDAR_BAUDRATE)
+        self.lidar = lidar if lidar is not None else LidarProcessor(LIDAR_PORT, LIDAR_BAUDRATE)
         self.lidar.connect()
         
         # 4. 서버 클라이언트 초기화 (선택적)
-        if ENABLE_SERVER_COMMUNICATION:
+        if enable_server:
             self.socket_client = SocketClient()
             self.socket_client.connect()
         else:
             self.socket_client = None
+        
+        # 5. 파이프라인 큐 및 단계별 지연 시간 통계
+        self.scan_queue = LatestQueue(SCAN_QUEUE_SIZE)
+        self.result_queue = LatestQueue(1)
+        self.latency = {stage: StageLatency(LATENCY_WINDOW) for stage in self.STAGES}
+        self.counters = PipelineCounters()
+        
+        # 6. 주기 통계 보고 (선택적)
+        self.map_reload = map_reload
+        if telemetry:
+            self.telemetry = TelemetryReporter(self.get_pipeline_stats, TELEMETRY_INTERVAL, TELEMETRY_FILE,
+                                               self.socket_client, TELEMETRY_EVENT)
+        else:
+            self.telemetry = None
+        
+        self.stop_event = threading.Event()
+        self.reader_done = threading.Event()
+        self.worker_done = threading.Event()
+        self.threads = []
+        self.map_watcher = None
+        self.result_listeners = []
+    
+    # 위치 결과 수신 콜백 등록
+    # callback(scan_time, position_yx, error, angle) - scan_time은 스캔 수신 시점 perf_counter
+    def add_result_listener(self, callback):
+        self.result_listeners.append(callback)
     
     # 메인 루프 실행
     def run(self):        
+        try:
+            self.threads = [
+                threading.Thread(target=self._reader_loop, name='lidar-reader', daemon=True),
+                threading.Thread(target=self._localize_loop, name='localizer', daemon=True),
+                threading.Thread(target=self._sender_loop, name='sender', daemon=True),
+            ]
+            for thread in self.threads:
+                thread.start()
+            # 맵 감시 스레드는 파이프라인 종료를 기다리지 않음 (cleanup에서 stop_event로 즉시 정지)
+            if self.map_reload:
+                self.map_watcher = threading.Thread(target=self._map_watch_loop, name='map-watcher', daemon=True)
+                self.map_watcher.start()
+            if self.telemetry is not None:
+                self.telemetry.start()
+            
+            # 스캔이 끝나고(스캔 종료/오류) 남은 결과까지 처리되거나 중단될 때까지 대기
+            for thread in self.threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            self.counters.record_error('run', e)
+        finally:
+            self.cleanup()
+    
+    # 파이프라인 통계 반환
+    # counts: scans_received(수신) → scans_dropped(큐에서 밀림) / scans_stale(오래되어 버림)
+    #         → scans_localized / scans_unlocalized → below_confidence(신뢰도 미달) / results_emitted
+    def get_pipeline_stats(self):
+        counters = self.counters.snapshot()
+        counts = counters['counts']
+        counts['scans_dropped'] = self.scan_queue.dropped
+        counts['results_dropped'] = self.result_queue.dropped
+        return {
+            'uptime_s': counters['uptime_s'],
+            'counts': counts,
+            'errors': counters['errors'],
+            'last_errors': counters['last_errors'],
+            'latency': {stage: timer.snapshot() for stage, timer in self.latency.items()},
+            'histogram': {stage: timer.histogram() for stage, timer in self.latency.items()},
+            'histogram_bounds_ms': list(LATENCY_BUCKETS_MS),
+            'scans_queued': self.scan_queue.put_count,
+            'scans_dropped': self.scan_queue.dropped,
+            'scans_stale': counts.get('scans_stale', 0),
+            'results_dropped': self.result_queue.dropped,
+            'imu': self.imu.get_stats(),
+            'socket': self.socket_client.get_stats() if self.socket_client is not None else None,
+            'map_reload': self.localizer.last_reload,
+        }
+    
+    # [reader 스레드] LiDAR 스캔 수신
+    def _reader_loop(self):
         try:
             # 초기 몇 스캔 스킵 (안정화)
             scan_count = 0
+            last_time = time.perf_counter()
+            prev_sensor_time = None
             
             for scan in self.lidar.iter_scans():
+                now = time.perf_counter()
+                self.latency['read'].record(now - last_time)
+                last_time = now
+                
+                if self.stop_event.is_set():
+                    break
+                
+                self.counters.count('scans_received')
+                
+                # 스캔 완료 시각 (IMU 기록과 같은 시간 기준) - 이전 스캔 완료 ~ 현재가 이번 스캔 구간
+                sensor_time = self.lidar.scan_timestamp()
+                scan_start = prev_sensor_time
+                prev_sensor_time = sensor_time
+                
                 scan_count += 1
                 if scan_count < 3:
                     continue
                 
-                self._process_scan(scan)
-                
-        except KeyboardInterrupt:
-            pass
+                self.scan_queue.put((now, scan_start, sensor_time, scan))
         except Exception as e:
-            pass
+            self.counters.record_error('read', e)
         finally:
-            self.cleanup()
+            self.reader_done.set()
+    
+    # [worker 스레드] 스캔 처리 및 위치 추정
+    def _localize_loop(self):
+        while not self.stop_event.is_set():
+            item = self.scan_queue.get(timeout=0.1)
+            if item is None:
+                # 스캔 수신이 끝났고 남은 스캔도 없으면 종료
+                if self.reader_done.is_set():
+                    break
+                continue
+            
+            scan_time, scan_start, scan_end, scan = item
+            
+            # 처리 전에 이미 오래된 스캔은 버림
+            if time.perf_counter() - scan_time > SCAN_MAX_AGE:
+                self.counters.count('scans_stale')
+                continue
+            
+            # 예외는 처리/위치 추정 단계 오류로 집계
+            try:
+                result = self._process_scan(scan, scan_start, scan_end)
+            except Exception as e:
+                self.counters.record_error('localize', e)
+                continue
+            
+            if result is None:
+                self.counters.count('scans_unlocalized')
+                continue
+            
+            self.counters.count('scans_localized')
+            if not is_confident(result[1]):
+                self.counters.count('below_confidence')
+            self.result_queue.put((scan_time, *result))
+        
+        self.worker_done.set()
+    
+    # [sender 스레드] 위치 결과 전송
+    def _sender_loop(self):
+        while not self.stop_event.is_set():
+            result = self.result_queue.get(timeout=0.1)
+            if result is None:
+                if self.worker_done.is_set():
+                    break
+                continue
+            
+            scan_time, position_yx, error, angle = result
+            try:
+                with self.latency['emit'].measure():
+                    self._handle_location_found(position_yx, error, angle)
+                for callback in self.result_listeners:
+                    callback(scan_time, position_yx, error, angle)
+                self.counters.count('results_emitted')
+            except Exception as e:
+                self.counters.record_error('emit', e)
+    
+    # [map-watcher 스레드] 맵 파일 변경 시 다시 로드
+    def _map_watch_loop(self):
+        path = self.localizer.map_path
+        loaded_mtime = self._file_mtime(path)
+        pending_mtime = None
+        
+        while not self.stop_event.wait(MAP_RELOAD_INTERVAL):
+            mtime = self._file_mtime(path)
+            if mtime is None or mtime == loaded_mtime:
+                pending_mtime = None
+                continue
+            
+            # 저장 중인 파일을 읽지 않도록 한 주기 동안 더 바뀌지 않은 경우에만 반영
+            if mtime != pending_mtime:
+                pending_mtime = mtime
+                continue
+            
+            # 실패해도 같은 파일을 반복해서 읽지 않음 (다시 저장하면 재시도)
+            loaded_mtime = mtime
+            try:
+                if self.localizer.reload_map(path)['swapped']:
+                    self.counters.count('map_reloads')
+            except Exception as e:
+                self.counters.record_error('map_reload', e)
+    
+    # 정적 메서드: 파일 수정 시각 (없으면 None)
+    @staticmethod
+    def _file_mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
     
     # 단일 스캔 처리
-    def _process_scan(self, scan):
-        # 1. 현재 각도 읽기
-        current_angle = self.imu.get_angle_int()
+    # scan_start / scan_end: 스캔 구간 시각 (IMU 기록 기준), scan_start가 None이면 빔별 보정 생략
+    def _process_scan(self, scan, scan_start, scan_end):
+        # 1. LiDAR 스캔 데이터 처리 (스캔 완료 시점 방향 기준으로 빔별 회전 보정)
+        with self.latency['process'].measure():
+            current_angle = self.imu.get_angle_at(scan_end)
+            beam_offsets = None
+            if LIDAR_DESKEW_ENABLED and scan_start is not None and len(scan) > 0:
+                beam_offsets = self._beam_offsets(scan_start, scan_end, len(scan), current_angle)
+            scan_vector = LidarProcessor.process_scan_array(scan, beam_offsets)
         
-        # 2. LiDAR 스캔 데이터 처리
-        scan_vector = LidarProcessor.process_scan(scan)
+        # 2. 위치 및 방향 찾기 (추적 모드: 이전 위치 주변 탐색, 실패 시 전역 탐색)
+        with self.latency['localize'].measure():
+            if TRACKING_ENABLED:
+                best_yx, heading, error = self.localizer.track_pose(scan_vector, current_angle)
+            else:
+                best_yx, heading, error = self.localizer.find_pose(scan_vector, current_angle)
         
-        # 3. 위치 찾기
-        best_yx, error = self.localizer.find_location(scan_vector, current_angle)
+        if best_yx is None:
+            return None
         
-        if best_yx is not None:
-            self._handle_location_found(best_yx, error, current_angle)
-        else:
-            pass
+        # 3. 신뢰할 수 있는 매칭이면 방향 오차를 IMU에 되먹임
+        if ROTATION_SEARCH_BINS > 0 and self.localizer.heading_feedback and is_confident(error):
+            self._correct_heading(heading, current_angle)
+        
+        return best_yx, error, int(heading)
+    
+    # 빔별 방향 보정값 계산 (빔 측정 시점 방향 - 스캔 완료 시점 방향, -180 ~ 180)
+    def _beam_offsets(self, scan_start, scan_end, count, reference_angle):
+        # 측정값이 스캔 구간에 균등한 간격으로 도착했다고 가정
+        beam_angles = self.imu.get_beam_angles(scan_start, scan_end, count)
+        return (beam_angles - reference_angle + 180) % 360 - 180
+    
+    # 스캔 매칭 방향으로 IMU 드리프트 보정
+    def _correct_heading(self, heading, imu_angle):
+        # -180 ~ 180 범위의 방향 차이
+        delta = (heading - imu_angle + 180) % 360 - 180
+        if delta != 0:
+            self.imu.apply_heading_correction(delta * HEADING_CORRECTION_GAIN)
     
     # 위치 발견 후 처리
     def _handle_location_found(self, position_yx, error, angle):
@@ -81,17 +330,32 @@ class CartLocalizationSystem:
             # 도난 알림 전송 (신뢰도 임계값 이하)
             if not is_confident(error):
                 self.socket_client.send_theft_alert(confidence)
-                
+            
             self.socket_client.send_state(x_meter, y_meter, angle)
     
     # 시스템 정리 및 종료
     def cleanup(self):        
+        # 파이프라인 스레드 정지
+        self.stop_event.set()
+        
         # IMU 정지
         self.imu.stop()
         
-        # LiDAR 정리
+        # LiDAR 정리 (reader 스레드의 iter_scans 종료)
         self.lidar.disconnect()
         
+        for thread in self.threads:
+            thread.join(timeout=2.0)
+        if self.map_watcher is not None:
+            self.map_watcher.join(timeout=2.0)
+        
+        # 탐색 워커 프로세스 종료
+        self.localizer.close()
+        
+        # 통계 보고 정지 (최종 통계 보고 후 종료)
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        
         # 서버 연결 해제 (활성화된 경우만)
         if self.socket_client is not None and self.socket_client.is_connected:
-            self.socket_client.disconnect()
\ No newline at end of file
+            self.socket_client.disconnect()
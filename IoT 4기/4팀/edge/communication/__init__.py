@@ -1,4 +1,5 @@
 # 통신 관련 모듈
 from .socket_client import SocketClient
+from .async_emitter import AsyncEmitter, RecordingEmitter
 
-__all__ = ['SocketClient']
+__all__ = ['SocketClient', 'AsyncEmitter', 'RecordingEmitter']
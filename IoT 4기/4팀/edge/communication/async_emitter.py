@@ -0,0 +1,157 @@
+# 비동기 이벤트 전송 모듈
+# 전송 대기 큐 + 전용 스레드로 Socket.IO 이벤트를 보내 호출 측(카메라 추론 등)이 연결/재연결을 기다리지 않게 함
+import time
+import queue
+import threading
+from typing import Any, Dict, Optional
+
+
+class AsyncEmitter:
+    """
+    큐 기반 비동기 이벤트 전송
+    
+    - emit(): 큐에 넣고 바로 반환 (큐가 가득 차면 버리고 False)
+    - 전송 스레드: 큐에서 꺼낸 이벤트를 client.send_event로 전송
+      - 연결이 끊겼으면 retry_interval마다 재연결 후 같은 이벤트를 다시 전송 (순서 유지, 유실 없음)
+      - 연결된 상태에서 전송이 실패하면 max_retries번까지만 재시도하고 버림 (뒤 이벤트가 막히지 않도록, failed로 집계)
+    - client: connect() / is_connected / send_event(event, data) 인터페이스 (SocketClient 또는 테스트용 스텁)
+    """
+    
+    def __init__(self, client, maxsize: int = 64, retry_interval: float = 1.0, max_retries: int = 3):
+        self.client = client
+        self.retry_interval = retry_interval
+        self.max_retries = max_retries
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        # 전송 통계
+        self.queued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retries = 0
+        self.last_latency = 0.0
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._send_loop, name='event-emitter', daemon=True)
+        self._thread.start()
+    
+    # 전송 스레드 정지 (timeout 동안 남은 이벤트 전송 시도)
+    def stop(self, timeout: float = 2.0):
+        if self._thread is None:
+            return
+        deadline = time.perf_counter() + timeout
+        while not self._queue.empty() and time.perf_counter() < deadline:
+            time.sleep(0.05)
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+    
+    # 이벤트 전송 예약 (대기 없음)
+    def emit(self, event_name: str, data: Dict[str, Any]) -> bool:
+        try:
+            self._queue.put_nowait((time.perf_counter(), event_name, data))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.queued += 1
+        return True
+    
+    # 전송 대기 이벤트 수
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+    
+    # 전송 통계 반환
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued': self.queued,
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'retries': self.retries,
+            'queue_depth': self.queue_depth(),
+            'connected': bool(self.client.is_connected),
+            'last_latency_ms': self.last_latency * 1e3,
+        }
+    
+    def _send_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                queued_at, event_name, data = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            # 연결이 끊긴 동안은 재연결될 때까지, 연결된 상태의 전송 실패는 max_retries번까지 재시도 (정지 요청 시 중단)
+            failures = 0
+            while not self._stop_event.is_set():
+                result = self._try_send(event_name, data)
+                if result == 'sent':
+                    self.sent += 1
+                    self.last_latency = time.perf_counter() - queued_at
+                    break
+                if result == 'failed':
+                    failures += 1
+                    if failures > self.max_retries:
+                        self.failed += 1
+                        break
+                self.retries += 1
+                self._stop_event.wait(self.retry_interval)
+    
+    # 1회 전송 시도 (연결이 없으면 먼저 연결)
+    # 반환: 'sent' | 'disconnected' (연결 실패/전송 중 끊김) | 'failed' (연결된 상태에서 전송 실패)
+    def _try_send(self, event_name: str, data: Dict[str, Any]) -> str:
+        try:
+            if not self.client.is_connected:
+                self.client.connect()
+            if self.client.is_connected and self.client.send_event(event_name, data):
+                return 'sent'
+        except Exception:
+            pass
+        return 'failed' if self.client.is_connected else 'disconnected'
+
+
+class RecordingEmitter:
+    """
+    서버 없이 쓰는 스텁 전송기 (AsyncEmitter와 같은 인터페이스)
+    
+    emit()한 이벤트를 (perf_counter 시각, 이벤트 이름, 데이터)로 기록만 함 → 리플레이 벤치마크/오프라인 테스트용
+    """
+    
+    def __init__(self):
+        self.events = []
+    
+    def start(self):
+        pass
+    
+    def stop(self, timeout: float = 2.0):
+        pass
+    
+    def emit(self, event_name: str, data: Dict[str, Any]) -> bool:
+        self.events.append((time.perf_counter(), event_name, data))
+        return True
+    
+    def queue_depth(self) -> int:
+        return 0
+    
+    # 이벤트 이름별 기록 수
+    def event_counts(self) -> Dict[str, int]:
+        counts = {}
+        for _, event_name, _ in self.events:
+            counts[event_name] = counts.get(event_name, 0) + 1
+        return counts
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued': len(self.events),
+            'sent': len(self.events),
+            'dropped': 0,
+            'failed': 0,
+            'retries': 0,
+            'queue_depth': 0,
+            'connected': False,
+            'last_latency_ms': 0.0,
+        }
@@ -1,22 +1,59 @@
 # Socket.IO 클라이언트 모듈
 # Flask 서버와의 실시간 통신
+import time
+import struct
+import threading
 import socketio
 from typing import Dict, Any
 
-from config import SERVER_URL
+from config import (
+    SERVER_URL,
+    CART_DEVICE_ID,
+    SOCKET_SEND_MODE,
+    SOCKET_FLUSH_RATE,
+    POSE_DEADBAND_M,
+    ANGLE_DEADBAND_DEG
+)
+
+# batched 모드 압축 프레임: flags(uint8), x(float32), y(float32), angle(int16), confidence(uint8)
+# flags: bit0 = 상태(x, y, angle) 포함, bit1 = 도난 경고(confidence) 포함
+PACKED_EVENT = 'update_packed'
+PACKED_FRAME = struct.Struct('<BffhB')
+FLAG_STATE = 0x01
+FLAG_ALERT = 0x02
 
 
 # Socket.IO 클라이언트 래퍼 클래스
 class SocketClient:
     # - 서버 연결 관리
     # - 데이터 전송(성공 여부 반환)
+    # - 접속 시 auth로 카트 식별자(device_id) 전송 → 서버가 카트별 상태/장바구니로 처리
+    # - send_mode='batched': 상태/경고를 버퍼에 모아 SOCKET_FLUSH_RATE 주기로 압축 프레임 1개로 전송
+    #   (필드별 최신 값만 유지, 데드밴드 이내의 위치 변화는 생략)
     
     # 초기화
-    def __init__(self, server_url: str = SERVER_URL):
+    def __init__(self, server_url: str = SERVER_URL, send_mode: str = SOCKET_SEND_MODE,
+                 device_id: str = CART_DEVICE_ID):
         self.server_url = server_url
+        self.device_id = device_id
+        self.send_mode = send_mode
         self.sio = socketio.Client(logger=False, engineio_logger=False)
         self.is_connected = False
         
+        # batched 모드 전송 버퍼 (필드별 최신 값)
+        self._pending_lock = threading.Lock()
+        self._pending_state = None
+        self._pending_confidence = None
+        self._last_state = None
+        self._flush_event = threading.Event()
+        self._flush_thread = None
+        
+        # 전송 통계
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.updates_coalesced = 0
+        self.deadband_skipped = 0
+        
         # 이벤트 핸들러 등록
         self._setup_handlers()
     
@@ -32,14 +69,24 @@ class SocketClient:
     
     # 서버 연결 시도
     def connect(self) -> bool:
+        if self.send_mode == 'batched' and self._flush_thread is None:
+            self._flush_event.clear()
+            self._flush_thread = threading.Thread(target=self._flush_loop, name='socket-flush', daemon=True)
+            self._flush_thread.start()
+        
         try:
-            self.sio.connect(self.server_url)
+            self.sio.connect(self.server_url, auth={'device_id': self.device_id, 'role': 'edge'})
             return True
         except Exception as e:
             return False
     
     # 서버 연결 해제
     def disconnect(self):        
+        if self._flush_thread is not None:
+            self._flush_event.set()
+            self._flush_thread.join(timeout=2.0)
+            self._flush_thread = None
+        
         if self.is_connected:
             self.sio.disconnect()
     
@@ -48,6 +95,9 @@ class SocketClient:
         if not self.is_connected:
             return False
         
+        if self.send_mode == 'batched':
+            return self._queue_state(x, y, angle)
+        
         try:
             payload = {
                 'x': x,
@@ -75,6 +125,13 @@ class SocketClient:
         if not self.is_connected:
             return False
         
+        if self.send_mode == 'batched':
+            with self._pending_lock:
+                if self._pending_confidence is not None:
+                    self.updates_coalesced += 1
+                self._pending_confidence = confidence
+            return True
+        
         try:
             payload = {
                 'confidence': confidence
@@ -83,6 +140,74 @@ class SocketClient:
         except Exception as e:
             return False
     
+    # 전송 통계 반환
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'frames_sent': self.frames_sent,
+            'frames_dropped': self.frames_dropped,
+            'updates_coalesced': self.updates_coalesced,
+            'deadband_skipped': self.deadband_skipped,
+        }
+    
+    # [batched] 상태를 버퍼에 저장 (마지막으로 전송에 성공한 상태 대비 데드밴드 이내 변화는 생략)
+    # 전송 대기 중인 상태가 있으면 데드밴드와 무관하게 최신 값으로 교체
+    def _queue_state(self, x: float, y: float, angle: int) -> bool:
+        with self._pending_lock:
+            last = self._last_state
+            if last is not None and self._pending_state is None:
+                angle_diff = abs((angle - last[2] + 180) % 360 - 180)
+                if (abs(x - last[0]) < POSE_DEADBAND_M and abs(y - last[1]) < POSE_DEADBAND_M
+                        and angle_diff < ANGLE_DEADBAND_DEG):
+                    self.deadband_skipped += 1
+                    return True
+            
+            if self._pending_state is not None:
+                self.updates_coalesced += 1
+            self._pending_state = (x, y, angle)
+        return True
+    
+    # [batched] 주기적 버퍼 전송 스레드
+    def _flush_loop(self):
+        interval = 1.0 / SOCKET_FLUSH_RATE
+        while not self._flush_event.wait(interval):
+            self._flush()
+        # 종료 전 남은 데이터 전송
+        self._flush()
+    
+    # [batched] 버퍼의 최신 값을 압축 프레임 1개로 전송
+    def _flush(self):
+        with self._pending_lock:
+            state, confidence = self._pending_state, self._pending_confidence
+            self._pending_state = self._pending_confidence = None
+        
+        if state is None and confidence is None:
+            return
+        
+        flags = 0
+        x, y, angle = 0.0, 0.0, 0
+        if state is not None:
+            flags |= FLAG_STATE
+            x, y, angle = state
+        if confidence is not None:
+            flags |= FLAG_ALERT
+        
+        frame = PACKED_FRAME.pack(flags, x, y, int(angle), int(confidence or 0))
+        
+        if not self.is_connected:
+            self.frames_dropped += 1
+            return
+        try:
+            self.sio.emit(PACKED_EVENT, frame)
+            self.frames_sent += 1
+        except Exception as e:
+            self.frames_dropped += 1
+            return
+        
+        # 데드밴드 기준은 실제로 전송된 상태만 갱신 (버려진 프레임 이후의 작은 이동도 다시 전송)
+        if state is not None:
+            with self._pending_lock:
+                self._last_state = state
+    
     
     # 연결 상태 확인
     @property
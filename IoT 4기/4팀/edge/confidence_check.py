@@ -0,0 +1,85 @@
+# 위치 추정 엔진별 신뢰도 판정 점검 도구
+# 맵과 맞는 스캔(정답 자세)과 맞지 않는 스캔(틀린 자세)을 엔진별 find_pose로 평가하여
+# is_confident 판정 비율을 보고 (틀린 자세를 신뢰한다고 판정하면 도난 경고/추적 재초기화가 동작하지 않음)
+#
+# 틀린 자세 스캔: 정답 스캔의 구간 순서 섞기 / 거리 1.5~2배 확대 / 같은 구간에 임의 거리(0.3~8m)
+#
+# 사용법:
+#   python3 confidence_check.py                                    # config.MAP_FILE, 전수 조사 + 우도 필드
+#   python3 confidence_check.py --engines likelihood_field --queries 500
+#   python3 confidence_check.py --max-wrong 0.2 --min-correct 0.9   # 기준을 넘으면 종료 코드 1
+import sys
+import argparse
+import numpy as np
+
+from config import MAP_FILE, ANGLE_STEP
+from localization import Localizer, LikelihoodFieldLocalizer
+from utils import is_confident
+from scan_table_report import make_synthetic_queries
+
+ENGINES = {
+    'brute_force': Localizer,
+    'likelihood_field': LikelihoodFieldLocalizer,
+}
+
+
+# 틀린 자세 질의 생성 (정답 질의를 변형, 세 가지 방식 번갈아 사용)
+# 대칭 구조가 많은 매장 맵에서는 IMU 각도만 틀린 스캔도 다른 위치와 실제로 맞을 수 있으므로 사용하지 않음
+def make_wrong_queries(queries, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    wrong = []
+    for i, (scan, angle) in enumerate(queries):
+        kind = i % 3
+        if kind == 0:
+            wrong.append((rng.permutation(scan), angle))
+        elif kind == 1:
+            wrong.append((scan * rng.uniform(1.5, 2.0), angle))
+        else:
+            noise = np.where(scan > 0, rng.uniform(0.3, 8.0, len(scan)), 0.0)
+            wrong.append((noise, angle))
+    return wrong
+
+
+# 신뢰 판정 비율과 오차 분포
+def confident_ratio(localizer, queries):
+    errors = np.array([localizer.find_pose(scan, angle)[2] for scan, angle in queries])
+    confident = sum(is_confident(error) for error in errors)
+    return confident / max(1, len(queries)), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='엔진별 정답/틀린 자세 신뢰도 판정 비율')
+    parser.add_argument('--map', default=MAP_FILE, help='맵 파일 (JSON 또는 .cmap)')
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES), help='점검할 엔진')
+    parser.add_argument('--queries', type=int, default=300, help='종류별 질의 수')
+    parser.add_argument('--max-wrong', type=float, default=0.2, help='틀린 자세를 신뢰로 판정해도 되는 최대 비율')
+    parser.add_argument('--min-correct', type=float, default=0.9, help='정답 자세를 신뢰로 판정해야 하는 최소 비율')
+    args = parser.parse_args()
+    
+    # 정답 스캔은 가상 스캔 테이블로 생성 (우도 필드 엔진은 테이블이 없음)
+    reference = Localizer(args.map)
+    correct = make_synthetic_queries(reference, args.queries)
+    wrong = make_wrong_queries(correct)
+    
+    print(f"맵: {args.map}, 질의 정답 {len(correct)}개 / 틀린 자세 {len(wrong)}개, 각도 구간 {ANGLE_STEP}°")
+    print()
+    print(f"{'engine':<18}{'correct':>10}{'wrong':>10}   wrong error p5/p50/p95 (m)")
+    
+    failed = False
+    for name in args.engines:
+        localizer = reference if ENGINES[name] is Localizer else ENGINES[name](args.map)
+        correct_ratio, _ = confident_ratio(localizer, correct)
+        wrong_ratio, wrong_errors = confident_ratio(localizer, wrong)
+        p5, p50, p95 = np.percentile(wrong_errors, [5, 50, 95])
+        print(f"{name:<18}{100 * correct_ratio:>9.1f}%{100 * wrong_ratio:>9.1f}%   {p5:.2f}/{p50:.2f}/{p95:.2f}")
+        failed |= wrong_ratio > args.max_wrong or correct_ratio < args.min_correct
+    
+    if failed:
+        print()
+        print(f"기준 미달: 틀린 자세 신뢰 비율 > {args.max_wrong:.0%} 또는 정답 자세 신뢰 비율 < {args.min_correct:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,11 @@
 # 서버 설정
 ENABLE_SERVER_COMMUNICATION = True  # False로 변경하면 서버 통신 비활성화
 SERVER_URL = 'http://192.168.0.10:8000'  # 서버 IP 주소. 디폴트: 192.168.0.10:8000
+CART_DEVICE_ID = 'cart-01'  # 카트 식별자 (접속 시 서버에 전송, 카트마다 다르게 설정. 위치 추정/물품 카메라가 같은 값 사용)
+SOCKET_SEND_MODE = 'immediate'  # 'immediate': 결과마다 전송, 'batched': 주기적으로 모아서 압축 프레임 전송
+SOCKET_FLUSH_RATE = 10  # batched 모드 전송 주기 (Hz)
+POSE_DEADBAND_M = 0.05  # batched 모드에서 이보다 작은 위치 변화는 전송 생략 (m)
+ANGLE_DEADBAND_DEG = 2  # batched 모드에서 이보다 작은 각도 변화는 전송 생략 (도)
 
 # 하드웨어 설정
 
@@ -15,17 +20,68 @@ IMU_I2C_BUS = 1
 IMU_CALIBRATION_SAMPLES = 200
 IMU_UPDATE_RATE = 0.005  # 200Hz
 IMU_DEADZONE_THRESHOLD = 0.5  # 자이로 노이즈 제거 임계값 (deg/s)
+IMU_HISTORY_SIZE = 1024  # 시각별 각도 기록 샘플 수 (200Hz 기준 약 5초)
+IMU_ACQUISITION_MODE = 'poll'  # 'poll': 샘플마다 레지스터 읽기, 'fifo': 센서 FIFO에 쌓인 샘플을 묶어서 읽기
+IMU_FIFO_SAMPLE_RATE = 200  # fifo 모드 센서 샘플링 주기 (Hz, 1000의 약수)
+IMU_FIFO_READ_INTERVAL = 0.02  # fifo 모드 FIFO 읽기 간격 (초)
+IMU_MAG_FUSION_ENABLED = False  # fifo 모드에서 지자기 방향으로 자이로 드리프트 보정 (IMU_MAG_HARD_IRON 보정값이 있어야 동작)
+IMU_MAG_FUSION_GAIN = 0.02  # 읽기마다 지자기 방향 오차를 반영하는 비율 (0~1)
+IMU_MAG_HARD_IRON = None  # 지자기 X/Y hard-iron 오프셋 (원시 측정 단위, calibrate_mag.py로 카트에 장착한 상태에서 측정), None이면 지자기 보정 안 함
+IMU_MAG_SOFT_IRON_SCALE = (1.0, 1.0)  # 지자기 X/Y 축 배율 (calibrate_mag.py 출력값)
 
 # 맵 설정
 MAP_FILE = 'localization/occupancy_grid_2d.json'
+SCAN_CACHE_ENABLED = True  # 가상 스캔 테이블 디스크 캐시 사용 여부
+SCAN_CACHE_DIR = 'localization/cache'  # 가상 스캔 캐시 저장 경로
+MAP_RELOAD_ENABLED = True  # 실행 중 맵 파일이 바뀌면 다시 로드 (바뀐 셀을 지나는 후보의 가상 스캔만 재계산)
+MAP_RELOAD_INTERVAL = 2.0  # 맵 파일 변경 확인 주기 (초), 한 주기 동안 더 바뀌지 않으면 반영
 
 # 로컬라이제이션 설정
 ANGLE_STEP = 2  # 각도 스텝 (도 단위)
 MIN_DIST_MM = 200  # 최소 거리 (mm) - 노이즈 필터링
 INITIAL_MAP_ANGLE_OFFSET = 0  # 초기 맵 각도 오프셋
+MATCH_CHUNK_SIZE = 4096  # 한 번에 비교할 후보 수 (최대 메모리 제한)
+SCAN_TABLE_FORMAT = 'float32'  # 가상 스캔 테이블 형식 ('float32': 미터, 'uint16_mm': 밀리미터 정수 + int16 좌표, 메모리 1/2, 속도 이점 없음)
+LOCALIZER_WORKERS = 1  # 후보 탐색 워커 프로세스 수 (1이면 프로세스 내 실행, Pi 4는 3 권장)
+PARALLEL_MIN_CANDIDATES = 8192  # 후보가 이 이상일 때만 워커에 나누어 탐색 (작은 탐색은 전달 비용이 더 큼)
+
+# 위치 추정 엔진
+LOCALIZER_ENGINE = 'brute_force'  # 'brute_force': 가상 스캔 전수 조사, 'particle': 파티클 필터, 'likelihood_field': 거리 필드 평가
+LF_MAX_DIST = 1.0  # likelihood_field 엔진에서 끝점-장애물 거리 상한 (m, 동적 장애물 영향 제한)
+
+# 추적 모드 설정 (이전 위치 주변만 탐색)
+TRACKING_ENABLED = False  # True면 이전 위치 주변만 탐색 (신뢰 기준 미달 시 전역 재탐색), False면 매 스캔 전역 전수 조사
+TRACKING_WINDOW_CELLS = 4  # 이전 위치 기준 탐색 반경 (셀)
+COARSE_GRID_STEP = 3  # 전역 재탐색 시 거친 후보 간격 (셀)
+
+# 회전 탐색 설정 (IMU 드리프트 보정)
+ROTATION_SEARCH_BINS = 0  # IMU 각도 주변 ±k 구간(ANGLE_STEP 단위) 회전 함께 탐색 (예: 3), 0이면 비활성화 (켜면 후보 선택 기준이 L1 대신 제곱 오차)
+HEADING_CORRECTION_GAIN = 0.5  # 매칭된 방향 오차를 IMU에 반영하는 비율 (0~1)
+
+# 파티클 필터 설정 (LOCALIZER_ENGINE = 'particle')
+PF_MIN_PARTICLES = 200  # 최소 파티클 수
+PF_MAX_PARTICLES = 2000  # 최대 파티클 수 (초기화/복구 시 사용)
+PF_PARTICLES_PER_CELL = 20  # 파티클이 차지한 셀당 파티클 수 (적응형 개수)
+PF_MOTION_STD = 0.7  # 스캔당 위치 랜덤 워크 표준편차 (셀)
+PF_HEADING_STD = 1.0  # 스캔당 방향 잡음 표준편차 (도)
+PF_INIT_STD = 1.5  # 초기화 시 전수 조사 결과 주변 분산 (셀)
+PF_SENSOR_SIGMA = 0.1  # 스캔 오차 → 가중치 변환 스케일 (m)
+PF_RESAMPLE_RATIO = 0.5  # 유효 파티클 비율이 이보다 낮으면 재샘플링
+
+# 파이프라인 설정 (reader → worker → sender 스레드)
+SCAN_QUEUE_SIZE = 1  # 처리 대기 스캔 수 (가득 차면 오래된 스캔을 버림)
+SCAN_MAX_AGE = 0.5  # 이보다 오래된 스캔은 처리하지 않고 버림 (초)
+LATENCY_WINDOW = 200  # 단계별 지연 시간 백분위 계산에 사용할 최근 샘플 수
+LIDAR_DESKEW_ENABLED = True  # 스캔 한 바퀴 동안의 회전을 IMU 기록으로 빔별 보정
+
+# 텔레메트리 설정 (단계별 카운터/오류/지연 시간 분포 주기 보고)
+TELEMETRY_ENABLED = True  # False로 변경하면 주기 보고 비활성화 (카운터 집계는 유지)
+TELEMETRY_INTERVAL = 5.0  # 보고 주기 (초)
+TELEMETRY_EVENT = 'edge_stats'  # 서버로 보내는 요약 통계 Socket.IO 이벤트 이름
+TELEMETRY_FILE = '/tmp/cart_stats.json'  # 전체 통계를 기록할 로컬 파일 (None이면 기록 안 함)
 
 # 위치 추정 신뢰도 임계값
-CONFIDENCE_THRESHOLD = 7  # 신뢰도 점수 (0-10)
+CONFIDENCE_THRESHOLD = 7  # 신뢰도 점수 (0-10), 추적 결과 채택 기준도 겸함 (7이면 평균 오차 약 0.67m 이하)
 
 # 노이즈 각도 범위 (하드웨어 특성)
 NOISE_ANGLE_RANGES = [
@@ -0,0 +1,35 @@
+# JSON 맵 → 바이너리 맵 변환 도구
+# Occupancy Grid, 후보 인덱스, 가상 스캔 테이블(현재 ANGLE_STEP 기준)을 하나의 .cmap 파일로 저장
+#
+# 사용법:
+#   python3 convert_map.py localization/occupancy_grid_2d.json localization/occupancy_grid_2d.cmap
+#   (이후 config.py의 MAP_FILE을 .cmap 경로로 변경)
+import sys
+import argparse
+
+from config import ANGLE_STEP
+from localization import Localizer
+from localization.map_format import write_binary_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON 맵을 바이너리 맵(.cmap)으로 변환')
+    parser.add_argument('input', help='JSON 맵 파일')
+    parser.add_argument('output', help='저장할 바이너리 맵 파일')
+    parser.add_argument('--no-scans', action='store_true', help='가상 스캔 테이블 제외 (부팅 시 계산)')
+    args = parser.parse_args()
+    
+    localizer = Localizer(args.input)
+    scans = None if args.no_scans else localizer.virtual_scans()
+    
+    write_binary_map(
+        args.output, localizer.grid, localizer.res, localizer.scan_coords,
+        scans=scans, angle_step=ANGLE_STEP
+    )
+    
+    print(f"변환 완료: {args.output} ({localizer.width}×{localizer.height}, 후보 {len(localizer.scan_coords)}개)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
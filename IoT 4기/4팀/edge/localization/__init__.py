@@ -1,4 +1,6 @@
 # 로컬라이제이션 관련 모듈
 from .localizer import Localizer
+from .particle_localizer import ParticleLocalizer
+from .likelihood_localizer import LikelihoodFieldLocalizer
 
-__all__ = ['Localizer']
+__all__ = ['Localizer', 'ParticleLocalizer', 'LikelihoodFieldLocalizer']
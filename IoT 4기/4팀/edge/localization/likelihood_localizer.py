@@ -0,0 +1,196 @@
+# 우도 필드 위치 추정 모듈
+# 가상 스캔 테이블 대신 장애물 거리 필드 1장으로 후보 위치를 평가
+import numpy as np
+from typing import Tuple, Optional
+
+from config import (
+    ANGLE_STEP,
+    MIN_DIST_MM,
+    MATCH_CHUNK_SIZE,
+    ROTATION_SEARCH_BINS,
+    LF_MAX_DIST
+)
+from .localizer import Localizer
+
+
+# 우도 필드 위치 추정 클래스
+class LikelihoodFieldLocalizer(Localizer):
+    # Localizer와 같은 find_pose / track_pose 인터페이스 (추적/거친 탐색 로직 공유)
+    # - 전처리: 장애물 표면 셀(빈 공간과 맞닿은 장애물 셀)까지의 유클리드 거리 변환 (셀 수만큼의 float32 1장)
+    #   두꺼운 벽/맵 바깥 영역 내부는 표면에서 멀수록 큰 값이 되어 끝점이 장애물 속으로 들어간 후보를 구분
+    # - 평가: 실제 스캔 끝점을 후보 위치 + 방향으로 투영하여 끝점이 놓인 셀의 표면 거리를 조회
+    #   후보 선택 점수 = 끝점별 min(표면 거리, LF_MAX_DIST)의 평균 (m), 맵 밖 끝점은 LF_MAX_DIST
+    # - 반환 오차: 선택된 자세 1개만 Ray Marching으로 가상 스캔을 만들어 구한 평균 L1 거리 오차
+    #   (선택 점수는 LF_MAX_DIST로 잘려 1.0m를 넘지 않으므로 is_confident/신뢰도 점수 기준에 그대로 쓸 수 없음,
+    #    전수 조사 엔진과 같은 척도로 맞춰 CONFIDENCE_THRESHOLD/추적 재초기화 기준을 공유)
+    # - 메모리: O(후보 수 × 각도 구간 수) 테이블 → O(셀 수) 필드
+    
+    # 가상 스캔 테이블 대신 거리 필드 생성
+    # 거리 필드는 셀 수에 비례하는 가벼운 계산이므로 맵을 다시 로드할 때도(previous) 전체 재계산
+    def precompute_scans(self, previous=None):
+        check_angles = np.arange(0, 360, ANGLE_STEP)
+        self.sin_table = np.sin(np.deg2rad(check_angles))
+        self.cos_table = np.cos(np.deg2rad(check_angles))
+        self.scan_coords = np.array(self.candidates_yx)
+        
+        # 바이너리 맵의 테이블은 사용하지 않음 (memmap이므로 접근하지 않으면 메모리도 차지하지 않음)
+        self.scan_table = np.zeros((0, len(check_angles)), dtype=np.float32)
+        self.scan_scale = 1.0
+        self.rows_computed = 0
+        self.distance_field = self.build_distance_field(np.asarray(self.grid), self.res)
+    
+    # 정적 메서드: 장애물 거리 필드 생성
+    @staticmethod
+    def build_distance_field(grid: np.ndarray, resolution: float) -> np.ndarray:
+        """
+        각 셀에서 가장 가까운 장애물 표면 셀까지의 유클리드 거리 계산
+        
+        표면 셀: 8방향 이웃 중 빈 셀이 있는 장애물 셀 (광선이 처음 부딪히는 셀)
+        맵 밖으로 나가는 광선도 경계에서 멈추므로(simulate_lidar와 동일) 맵 둘레 1칸을 장애물로 둘러서 계산
+        
+        Args:
+            grid: 점유 격자 (1 = 장애물)
+            resolution: 셀 크기 (m)
+        
+        Returns:
+            np.ndarray: (height + 2, width + 2) float32 거리 필드 (m), 경계 포함
+        """
+        occupied = np.pad(grid == 1, 1, constant_values=True)
+        height, width = occupied.shape
+        cols = np.arange(width, dtype=np.float64)
+        
+        # 0. 표면 셀 추출 (빈 셀을 8방향으로 1칸 팽창한 영역과 장애물의 교집합)
+        free = np.pad(~occupied, 1, constant_values=False)
+        near_free = np.zeros_like(occupied)
+        for dy in (0, 1, 2):
+            for dx in (0, 1, 2):
+                near_free |= free[dy:dy + height, dx:dx + width]
+        surface = occupied & near_free
+        
+        # 1. 행 방향: 같은 행의 가장 가까운 표면 셀까지의 가로 거리 (좌/우 누적 최대/최소)
+        left = np.maximum.accumulate(np.where(surface, cols, -np.inf), axis=1)
+        right = np.minimum.accumulate(np.where(surface, cols, np.inf)[:, ::-1], axis=1)[:, ::-1]
+        horizontal_sq = np.minimum(cols - left, right - cols) ** 2
+        
+        # 2. 열 방향: d²(y, x) = min_y' ((y - y')² + h²(y', x)) (열마다 선형 시간 1차원 거리 변환)
+        field = np.sqrt(LikelihoodFieldLocalizer._column_distance_sq(horizontal_sq)).astype(np.float32)
+        
+        field *= resolution
+        return field
+    
+    # 정적 메서드: 열 방향 1차원 제곱 거리 변환 (모든 열을 한꺼번에 진행)
+    @staticmethod
+    def _column_distance_sq(f: np.ndarray) -> np.ndarray:
+        """
+        열마다 d(y) = min_y' ((y - y')² + f(y')) 계산 (Felzenszwalb-Huttenlocher 하한 포락선)
+        
+        포물선 (y - y')² + f(y')의 하한 포락선을 위에서 아래로 한 번 만들고 한 번 조회하므로
+        열 하나에 O(높이) (행 쌍을 모두 비교하는 O(높이²) 대신), 열 방향 반복은 NumPy 벡터 연산
+        
+        Args:
+            f: (height, width) 행 방향 제곱 거리 (표면 셀이 없는 행은 inf)
+        
+        Returns:
+            np.ndarray: (height, width) float64 제곱 거리 (표면 셀이 없는 열은 inf)
+        """
+        height, width = f.shape
+        cols = np.arange(width)
+        parabolas = np.zeros((height, width), dtype=np.int64)   # 포락선을 이루는 포물선의 꼭짓점 행
+        bounds = np.full((height + 1, width), np.inf)            # 포물선 k가 최소인 구간의 시작 위치
+        last = np.full(width, -1, dtype=np.int64)                # 열별 마지막 포물선 번호 (-1 = 비어 있음)
+        
+        # 1. 하한 포락선 생성: 새 포물선과의 교점이 마지막 포물선 구간 시작보다 앞이면 마지막 포물선 제거
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for q in range(height):
+                fq = f[q] + q * q
+                active = np.isfinite(fq)
+                while True:
+                    top = np.maximum(last, 0)
+                    vk = parabolas[top, cols]
+                    cross = (fq - (f[vk, cols] + vk * vk)) / (2 * (q - vk))
+                    pop = active & (last >= 0) & (cross <= bounds[top, cols])
+                    if not pop.any():
+                        break
+                    last[pop] -= 1
+                
+                top = np.maximum(last, 0)
+                vk = parabolas[top, cols]
+                cross = (fq - (f[vk, cols] + vk * vk)) / (2 * (q - vk))
+                start = np.where(last >= 0, cross, -np.inf)
+                last[active] += 1
+                parabolas[last[active], cols[active]] = q
+                bounds[last[active], cols[active]] = start[active]
+                bounds[last[active] + 1, cols[active]] = np.inf
+        
+        # 2. 조회: 위에서 아래로 현재 행을 포함하는 포물선 구간으로 진행
+        dist_sq = np.full((height, width), np.inf)
+        has_surface = last >= 0
+        k = np.zeros(width, dtype=np.int64)
+        for q in range(height):
+            while True:
+                advance = has_surface & (k < last) & (bounds[k + 1, cols] < q)
+                if not advance.any():
+                    break
+                k[advance] += 1
+            vk = parabolas[k, cols]
+            dist_sq[q] = np.where(has_surface, (q - vk) ** 2 + f[vk, cols], np.inf)
+        return dist_sq
+    
+    # 회전 탐색 여부에 따른 후보 평가
+    def _search(self, real_scan_vector: np.ndarray, current_angle_int: int,
+                indices: Optional[np.ndarray] = None) -> Optional[Tuple[int, int, float]]:
+        # 반환: (후보 행 번호, IMU 각도 대비 회전 보정 구간 수, 평균 L1 오차)
+        if len(self.scan_coords) == 0:
+            return None
+        
+        valid_bins = np.flatnonzero(real_scan_vector > (MIN_DIST_MM / 1000.0))
+        if len(valid_bins) < 5:
+            return None
+        
+        # 스캔 구간 b는 회전 s만큼 돌린 뒤 맵 기준 (b + s) 구간 방향 (np.roll과 동일)
+        shift_idx = int(current_angle_int / ANGLE_STEP)
+        shifts = np.arange(-ROTATION_SEARCH_BINS, ROTATION_SEARCH_BINS + 1)
+        num_bins = len(real_scan_vector)
+        map_bins = (valid_bins[None, :] + shift_idx + shifts[:, None]) % num_bins
+        
+        # 후보 기준 끝점 오프셋 (셀 단위, 회전 × 유효 구간)
+        ranges = real_scan_vector[valid_bins] / self.res
+        cell_x = np.floor(ranges * self.cos_table[map_bins]).astype(np.int32) + 1
+        cell_y = np.floor(ranges * self.sin_table[map_bins]).astype(np.int32) + 1
+        
+        field_h, field_w = self.distance_field.shape
+        flat_field = self.distance_field.ravel()
+        coords = self.scan_coords if indices is None else self.scan_coords[indices]
+        
+        best_row, best_k = 0, 0
+        best_sum = np.inf
+        
+        # (후보 × 회전 × 유효 구간) 임시 배열 크기를 MATCH_CHUNK_SIZE 행 수준으로 제한
+        chunk_size = max(1, MATCH_CHUNK_SIZE // len(shifts))
+        for start in range(0, len(coords), chunk_size):
+            chunk = coords[start:start + chunk_size].astype(np.int32)
+            
+            # 끝점 셀 (경계 1칸 포함 필드 좌표, 후보 좌표가 정수이므로 floor(x + o) = x + floor(o))
+            end_x = chunk[:, 1, None, None] + cell_x[None]
+            end_y = chunk[:, 0, None, None] + cell_y[None]
+            inside = (end_x >= 0) & (end_x < field_w) & (end_y >= 0) & (end_y < field_h)
+            flat = np.clip(end_y, 0, field_h - 1) * field_w + np.clip(end_x, 0, field_w - 1)
+            
+            dist = np.where(inside, np.minimum(flat_field[flat], LF_MAX_DIST), LF_MAX_DIST)
+            sums = dist.sum(axis=2)
+            
+            flat_idx = int(np.argmin(sums))
+            row, k = divmod(flat_idx, len(shifts))
+            if sums[row, k] < best_sum:
+                best_sum = float(sums[row, k])
+                best_row, best_k = start + row, k
+        
+        best_idx = best_row if indices is None else int(indices[best_row])
+        return best_idx, int(shifts[best_k]), self._range_error(real_scan_vector, shift_idx + shifts[best_k], best_idx)
+    
+    # 선택된 자세의 평균 L1 거리 오차 (전수 조사 엔진의 반환 오차와 같은 정의)
+    def _range_error(self, real_scan_vector: np.ndarray, shift: int, idx: int) -> float:
+        rotated_scan = np.roll(real_scan_vector, shift)
+        valid_mask = rotated_scan > (MIN_DIST_MM / 1000.0)
+        virtual_scan = self.simulate_lidar_batch(self.scan_coords[idx:idx + 1])[0]
+        return float(np.abs(virtual_scan[valid_mask] - rotated_scan[valid_mask]).mean())
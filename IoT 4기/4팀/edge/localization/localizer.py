@@ -3,26 +3,78 @@
 import os
 import sys
 import json
+import time
+import threading
 import numpy as np
-from typing import Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
 
-from config import ANGLE_STEP, MIN_DIST_MM
+from config import (
+    ANGLE_STEP,
+    MIN_DIST_MM,
+    MATCH_CHUNK_SIZE,
+    SCAN_CACHE_ENABLED,
+    TRACKING_WINDOW_CELLS,
+    COARSE_GRID_STEP,
+    ROTATION_SEARCH_BINS,
+    SCAN_TABLE_FORMAT,
+    LOCALIZER_WORKERS,
+    PARALLEL_MIN_CANDIDATES
+)
+from utils.helpers import is_confident
+from .scan_cache import scan_cache_key, load_scan_cache, save_scan_cache
+from .map_format import is_binary_map, read_binary_map
+
+# 양자화 테이블 단위 (uint16 1 = 1mm, 최대 65.535m)
+MM_PER_M = 1000
+
+# 맵 변경 영역 묶음 크기 (셀), 바뀐 셀을 이 크기 블록별 경계 상자로 묶어 광선 교차 판정
+MAP_DIFF_TILE = 8
 
 
 # 위치 추정 클래스
 class Localizer:
+    # 매칭된 방향을 IMU 드리프트 보정에 되먹일지 여부
+    heading_feedback = True
+    
     # 초기화
-    def __init__(self, map_path: str):
+    # table_format: 가상 스캔 테이블 형식 ('float32' 또는 'uint16_mm', 기본값은 config.SCAN_TABLE_FORMAT)
+    def __init__(self, map_path: str, table_format: str = SCAN_TABLE_FORMAT):
+        # 추적 모드에서 마지막으로 채택된 위치 (y, x)
+        self.last_yx = None
+        self.table_format = table_format
+        self.map_path = map_path
+        
+        # 맵 교체(reload_map)와 위치 추정이 겹치지 않도록 보호 (탐색 1회 단위)
+        self.map_lock = threading.RLock()
+        self.last_reload = None
+        
         self.load_map(map_path)
         self.precompute_scans()
+        self.start_search_pool()
     
     # 맵 로드
     def load_map(self, path: str):
         if not os.path.exists(path):
             sys.exit(1)
         
-        with open(path, 'r') as f:
-            data = json.load(f)
+        # 바이너리 맵에 포함된 가상 스캔 테이블 (없으면 precompute_scans에서 계산)
+        self.preloaded_scans = None
+        
+        if is_binary_map(path):
+            self._load_binary_map(path)
+        else:
+            self._load_json_map(path)
+        
+        self._build_candidate_index()
+    
+    # JSON 맵 로드
+    def _load_json_map(self, path: str):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        
+        # 맵 내용 해시 (가상 스캔 캐시 키로 사용)
+        self.map_key = scan_cache_key(raw, ANGLE_STEP, data['resolution'])
         
         self.width = data['width']
         self.height = data['height']
@@ -32,17 +84,304 @@ class Localizer:
         # 후보 위치 추출 (빈 공간)
         self.candidates_yx = np.argwhere(self.grid == 0)
     
+    # 바이너리 맵 로드 (grid / 후보 / 가상 스캔 모두 memmap, 복사 없음)
+    def _load_binary_map(self, path: str):
+        bmap = read_binary_map(path)
+        
+        self.width = bmap.width
+        self.height = bmap.height
+        self.res = bmap.resolution
+        self.grid = bmap.grid
+        self.candidates_yx = bmap.coords_yx
+        
+        # 같은 각도 스텝으로 계산된 테이블만 사용
+        if bmap.scans is not None and bmap.angle_step == ANGLE_STEP:
+            self.preloaded_scans = bmap.scans
+        
+        # 테이블이 없을 때를 위한 캐시 키 (grid 내용 기준)
+        self.map_key = scan_cache_key(np.asarray(self.grid).tobytes(), ANGLE_STEP, self.res)
+    
+    # 후보 위치 인덱스 생성 (추적/거친 탐색용)
+    def _build_candidate_index(self):
+        # 그리드 셀 → 후보 행 번호 (후보가 아니면 -1)
+        self.cand_index = np.full((self.height, self.width), -1, dtype=np.int32)
+        self.cand_index[self.candidates_yx[:, 0], self.candidates_yx[:, 1]] = np.arange(len(self.candidates_yx))
+        
+        # 거친 후보 집합: COARSE_GRID_STEP × COARSE_GRID_STEP 블록마다 대표 후보 1개
+        block_y = self.candidates_yx[:, 0] // COARSE_GRID_STEP
+        block_x = self.candidates_yx[:, 1] // COARSE_GRID_STEP
+        block_ids = block_y * (self.width // COARSE_GRID_STEP + 1) + block_x
+        _, first_idx = np.unique(block_ids, return_index=True)
+        self.coarse_indices = np.sort(first_idx)
+    
     # 미리 계산된 스캔 데이터 생성
-    def precompute_scans(self):
-        # 0도 기준 가상 스캠 데이터 미리 계산
-        self.virtual_scans = []
+    def precompute_scans(self, previous: Optional['Localizer'] = None):
+        # 0도 기준 가상 스캔 데이터 미리 계산
+        # - scan_table: (후보 수 × 각도 구간 수) 연속 행렬
+        #   'float32': 미터 단위 float32 / 'uint16_mm': 밀리미터 단위 uint16 (scan_scale = 0.001)
+        # - scan_coords: scan_table 각 행에 대응하는 (y, x) 좌표 ('uint16_mm'이면 int16)
+        # - previous: 같은 크기의 이전 맵 Localizer (맵 다시 로드 시), 바뀐 셀을 지나는 후보만 재계산
+        # - rows_computed: Ray Marching으로 새로 계산한 행 수 (캐시/바이너리 테이블 사용 시 0)
         check_angles = np.arange(0, 360, ANGLE_STEP)
         self.sin_table = np.sin(np.deg2rad(check_angles))
         self.cos_table = np.cos(np.deg2rad(check_angles))
         
-        for y, x in self.candidates_yx:
-            v_scan = self.simulate_lidar(x, y)
-            self.virtual_scans.append({'yx': (y, x), 'scan': v_scan})
+        quantized = self.table_format == 'uint16_mm'
+        self.scan_scale = 1.0 / MM_PER_M if quantized else 1.0
+        table_dtype = np.uint16 if quantized else np.float32
+        cache_key = f"{self.map_key}_mm16" if quantized else self.map_key
+        
+        coords_dtype = np.int16 if quantized and max(self.height, self.width) <= np.iinfo(np.int16).max else None
+        self.scan_coords = np.array(self.candidates_yx, dtype=coords_dtype)
+        self.rows_computed = 0
+        shape = (len(self.scan_coords), len(check_angles))
+        
+        # 1. 바이너리 맵에 포함된 테이블 또는 캐시 확인 (mmap으로 바로 사용)
+        if self.preloaded_scans is not None and self.preloaded_scans.shape == shape:
+            self.scan_table = self.quantize_scans(self.preloaded_scans) if quantized else self.preloaded_scans
+            return
+        
+        if SCAN_CACHE_ENABLED:
+            cached = load_scan_cache(cache_key, shape, table_dtype)
+            if cached is not None:
+                self.scan_table = cached
+                return
+        
+        # 2. 이전 맵과 크기가 같으면 바뀐 부분만 계산, 아니면 전체 후보 × 전체 각도 일괄 Ray Marching
+        if previous is not None and self._can_update_from(previous, table_dtype):
+            self.scan_table = self._update_scans(previous)
+        elif quantized:
+            # 후보 묶음 단위로 계산 후 바로 양자화 (float32 전체 테이블을 만들지 않음)
+            self.scan_table = np.empty(shape, dtype=np.uint16)
+            self._compute_rows(np.arange(shape[0]))
+        else:
+            self.scan_table = self.simulate_lidar_batch(self.scan_coords)
+            self.rows_computed = shape[0]
+        
+        if SCAN_CACHE_ENABLED:
+            save_scan_cache(cache_key, self.scan_table)
+    
+    # 지정한 행만 Ray Marching으로 계산하여 scan_table에 기록 (묶음 단위, 양자화 테이블은 바로 변환)
+    def _compute_rows(self, rows: np.ndarray):
+        for start in range(0, len(rows), MATCH_CHUNK_SIZE):
+            chunk = rows[start:start + MATCH_CHUNK_SIZE]
+            scans = self.simulate_lidar_batch(self.scan_coords[chunk])
+            self.scan_table[chunk] = self.quantize_scans(scans) if self.scan_table.dtype == np.uint16 else scans
+        self.rows_computed += len(rows)
+    
+    # 이전 맵 테이블을 재사용할 수 있는지 (크기/해상도/테이블 형식이 같은 맵)
+    def _can_update_from(self, previous: 'Localizer', table_dtype) -> bool:
+        table = getattr(previous, 'scan_table', None)
+        return (table is not None and previous.width == self.width and previous.height == self.height
+                and previous.res == self.res and table.dtype == table_dtype
+                and len(table) == len(previous.candidates_yx) and len(table) > 0)
+    
+    # 이전 맵 테이블에서 바뀐 셀의 영향을 받는 행만 다시 계산
+    def _update_scans(self, previous: 'Localizer') -> np.ndarray:
+        # - 계속 빈 공간인 후보: 광선(정지 지점까지)이 바뀐 셀을 지나지 않으면 이전 행 복사
+        #   (바뀐 셀보다 앞에서 멈춘 광선은 결과가 같음)
+        # - 새로 빈 공간이 된 후보와 광선이 바뀐 셀을 지나는 후보: Ray Marching으로 재계산
+        changed = np.asarray(previous.grid) != np.asarray(self.grid)
+        num_rows, num_bins = len(self.scan_coords), len(self.sin_table)
+        self.scan_table = np.empty((num_rows, num_bins), dtype=previous.scan_table.dtype)
+        
+        # 1. 새 후보 행 → 이전 후보 행 (-1: 이전에는 장애물이던 셀)
+        old_rows = previous.cand_index[self.candidates_yx[:, 0], self.candidates_yx[:, 1]]
+        kept = np.flatnonzero(old_rows >= 0)
+        affected = previous._rays_crossing(changed, old_rows[kept])
+        
+        # 2. 영향 없는 행 복사 (묶음 단위)
+        reuse = kept[~affected]
+        for start in range(0, len(reuse), MATCH_CHUNK_SIZE):
+            rows = reuse[start:start + MATCH_CHUNK_SIZE]
+            self.scan_table[rows] = previous.scan_table[old_rows[rows]]
+        
+        # 3. 나머지 행 재계산
+        recompute = np.sort(np.concatenate([np.flatnonzero(old_rows < 0), kept[affected]]))
+        self._compute_rows(recompute)
+        return self.scan_table
+    
+    # 지정한 후보 행의 광선 중 바뀐 셀을 지나는 광선이 있는지 판정
+    def _rays_crossing(self, changed: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """
+        각 후보의 광선(정지 지점까지)이 바뀐 셀 영역을 지나는지 판정
+        
+        광선은 후보 (x, y)에서 s = 1 .. 정지 스텝까지 s·(cos, sin) 지점의 셀을 확인하므로,
+        선분과 바뀐 셀 묶음 경계 상자의 교차로 보수적으로 판정 (재계산이 더 많을 수는 있어도 누락은 없음)
+        
+        Args:
+            changed: 이전 맵과 값이 다른 셀 (height × width bool)
+            rows: 판정할 scan_table 행 번호
+        
+        Returns:
+            np.ndarray: 행별 교차 여부 (bool)
+        """
+        hit = np.zeros(len(rows), dtype=bool)
+        rects = self._changed_rects(changed)
+        if len(rects) == 0 or len(rows) == 0:
+            return hit
+        
+        # 축과 평행한 광선: 방향 성분이 0에 가까우면(cos 90° ≈ 6e-17 등) 광선 지점이 셀 경계를 넘지 못하므로
+        # 성분을 양의 아주 작은 값으로 대체 (시작 좌표가 상자 범위 안이면 항상 통과, 밖이면 통과 안 함)
+        # 상자는 eps만큼 넓혀 경계 지점의 부동소수점 오차로 인한 누락 방지
+        eps = 1e-6
+        cos_a = np.where(np.abs(self.cos_table) < 1e-9, 1e-12, self.cos_table)
+        sin_a = np.where(np.abs(self.sin_table) < 1e-9, 1e-12, self.sin_table)
+        rects = rects + np.array([-eps, eps, -eps, eps])
+        
+        for start in range(0, len(rows), MATCH_CHUNK_SIZE):
+            chunk = rows[start:start + MATCH_CHUNK_SIZE]
+            steps = np.rint(self.virtual_scans(chunk) / self.res) + eps
+            start_x = self.scan_coords[chunk, 1].astype(np.float64)[:, None]
+            start_y = self.scan_coords[chunk, 0].astype(np.float64)[:, None]
+            crossed = np.zeros(steps.shape, dtype=bool)
+            
+            for x0, x1, y0, y1 in rects:
+                tx0, tx1 = (x0 - start_x) / cos_a, (x1 - start_x) / cos_a
+                ty0, ty1 = (y0 - start_y) / sin_a, (y1 - start_y) / sin_a
+                t_enter = np.maximum(np.minimum(tx0, tx1), np.minimum(ty0, ty1))
+                t_exit = np.minimum(np.maximum(tx0, tx1), np.maximum(ty0, ty1))
+                crossed |= (t_enter <= t_exit) & (t_exit >= 1 - eps) & (t_enter <= steps)
+            
+            hit[start:start + len(chunk)] = crossed.any(axis=1)
+        return hit
+    
+    # 정적 메서드: 바뀐 셀을 MAP_DIFF_TILE 블록별 경계 상자 (x0, x1, y0, y1)로 묶기 (연속 좌표)
+    @staticmethod
+    def _changed_rects(changed: np.ndarray) -> np.ndarray:
+        ys, xs = np.nonzero(changed)
+        if len(ys) == 0:
+            return np.zeros((0, 4))
+        
+        tile_ids = (ys // MAP_DIFF_TILE) * (changed.shape[1] // MAP_DIFF_TILE + 1) + xs // MAP_DIFF_TILE
+        _, inverse = np.unique(tile_ids, return_inverse=True)
+        count = inverse.max() + 1
+        x0 = np.full(count, np.inf)
+        y0 = np.full(count, np.inf)
+        x1 = np.full(count, -np.inf)
+        y1 = np.full(count, -np.inf)
+        np.minimum.at(x0, inverse, xs)
+        np.minimum.at(y0, inverse, ys)
+        np.maximum.at(x1, inverse, xs + 1)
+        np.maximum.at(y1, inverse, ys + 1)
+        
+        # trunc는 -1 < v < 0도 0번 셀로 보내므로 0번 행/열에 닿은 상자는 한 칸 확장
+        x0[x0 == 0] = -1
+        y0[y0 == 0] = -1
+        return np.stack([x0, x1, y0, y1], axis=1)
+    
+    # 맵 다시 로드 (실행 중 교체)
+    def reload_map(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        맵 파일을 다시 읽어 가상 스캔 테이블 교체
+        
+        새 맵 상태는 별도 객체에서 만들고(그동안 위치 추정은 기존 테이블 사용),
+        완성된 뒤 map_lock 안에서 한 번에 교체 (탐색 도중 테이블이 바뀌지 않음)
+        
+        Args:
+            path: 맵 파일 경로 (None이면 현재 맵 경로)
+        
+        Returns:
+            Dict[str, Any]: changed_cells, candidates, rows_computed, elapsed_s, swapped
+        """
+        path = self.map_path if path is None else path
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        start = time.perf_counter()
+        
+        # 1. 새 맵 로드 (같은 클래스, __init__ 없이 맵 관련 상태만 생성)
+        snapshot = self.__class__.__new__(self.__class__)
+        snapshot.table_format = self.table_format
+        snapshot.map_path = path
+        snapshot.load_map(path)
+        
+        same_shape = (snapshot.height, snapshot.width) == (self.height, self.width)
+        changed_cells = int(np.count_nonzero(np.asarray(snapshot.grid) != np.asarray(self.grid))) if same_shape else -1
+        
+        stats = {
+            'changed_cells': changed_cells,
+            'candidates': len(snapshot.candidates_yx),
+            'rows_computed': 0,
+            'elapsed_s': 0.0,
+            'swapped': False,
+        }
+        if snapshot.map_key == self.map_key:
+            stats['elapsed_s'] = time.perf_counter() - start
+            return stats
+        
+        # 2. 가상 스캔 테이블 (바뀐 부분만 계산) 및 병렬 탐색 풀 준비
+        snapshot.precompute_scans(previous=self)
+        snapshot.start_search_pool()
+        stats['rows_computed'] = snapshot.rows_computed
+        stats['elapsed_s'] = time.perf_counter() - start
+        stats['swapped'] = True
+        snapshot.last_reload = stats
+        
+        # 3. 교체 (추적 위치 / 파티클 등 맵과 무관한 상태는 유지)
+        with self.map_lock:
+            old_pool = self.search_pool
+            self.__dict__.update(vars(snapshot))
+        
+        # 이전 테이블을 쓰는 탐색은 더 이상 없으므로 이전 풀 종료
+        if old_pool is not None:
+            old_pool.close()
+        return stats
+    
+    # 정적 메서드: 미터 단위 거리 → uint16 밀리미터 (묶음 단위 변환으로 임시 메모리 제한)
+    @staticmethod
+    def quantize_scans(scans_m: np.ndarray) -> np.ndarray:
+        limit = np.iinfo(np.uint16).max
+        quantized = np.empty(scans_m.shape, dtype=np.uint16)
+        for start in range(0, len(scans_m), MATCH_CHUNK_SIZE):
+            rows = slice(start, start + MATCH_CHUNK_SIZE)
+            chunk = np.rint(np.asarray(scans_m[rows], dtype=np.float64) * MM_PER_M)
+            quantized[rows] = np.clip(chunk, 0, limit)
+        return quantized
+    
+    # 미터 단위 가상 스캔 (테이블 형식과 무관하게 float32, rows로 일부 행만 선택 가능)
+    def virtual_scans(self, rows=slice(None)) -> np.ndarray:
+        scans = np.asarray(self.scan_table[rows], dtype=np.float32)
+        if self.scan_scale != 1.0:
+            scans = scans * np.float32(self.scan_scale)
+        return scans
+    
+    # 여러 위치에서의 가상 LiDAR 스캔 일괄 시뮬레이션
+    def simulate_lidar_batch(self, coords_yx: np.ndarray) -> np.ndarray:
+        # 모든 (후보, 각도) 광선을 1차원으로 펼친 뒤 한 스텝씩 동시에 전진시키고,
+        # 종료된 광선은 활성 목록에서 제거 (simulate_lidar와 동일한 결과)
+        num_bins = len(self.sin_table)
+        ranges = np.zeros((len(coords_yx), num_bins), dtype=np.float32)
+        if len(coords_yx) == 0:
+            return ranges
+        
+        start_x = np.repeat(coords_yx[:, 1].astype(np.float64), num_bins)
+        start_y = np.repeat(coords_yx[:, 0].astype(np.float64), num_bins)
+        cos_a = np.tile(self.cos_table, len(coords_yx))
+        sin_a = np.tile(self.sin_table, len(coords_yx))
+        active = np.arange(len(start_x))
+        flat_ranges = ranges.reshape(-1)
+        dist_step = 0
+        
+        while len(active) > 0:
+            dist_step += 1
+            curr_x = np.trunc(start_x + dist_step * cos_a).astype(np.int64)
+            curr_y = np.trunc(start_y + dist_step * sin_a).astype(np.int64)
+            
+            # 맵 경계 체크
+            stopped = ~((curr_x >= 0) & (curr_x < self.width) & (curr_y >= 0) & (curr_y < self.height))
+            
+            # 장애물 체크 (경계 안의 광선만)
+            inside = ~stopped
+            stopped[inside] = self.grid[curr_y[inside], curr_x[inside]] == 1
+            
+            flat_ranges[active[stopped]] = dist_step * self.res
+            
+            keep = ~stopped
+            active = active[keep]
+            start_x, start_y = start_x[keep], start_y[keep]
+            cos_a, sin_a = cos_a[keep], sin_a[keep]
+        
+        return ranges
     
     # 특정 위치에서의 가상 LiDAR 스캔 시뮬레이션
     def simulate_lidar(self, start_x: int, start_y: int) -> np.ndarray:
@@ -70,35 +409,249 @@ class Localizer:
         # 각도별 거리 배열 반환
         return np.array(ranges)
     
+    # 병렬 탐색 풀 시작 (LOCALIZER_WORKERS > 1, 실패 시 프로세스 내 실행)
+    def start_search_pool(self):
+        self.search_pool = None
+        if LOCALIZER_WORKERS <= 1 or len(self.scan_table) < PARALLEL_MIN_CANDIDATES:
+            return
+        
+        # 순환 import 방지 (워커 모듈이 Localizer를 사용)
+        from .worker_pool import SearchPool
+        try:
+            self.search_pool = SearchPool(self.scan_table, LOCALIZER_WORKERS, self.scan_scale)
+        except Exception as e:
+            self.search_pool = None
+            return
+        
+        # 이후 매칭도 공유 메모리 테이블 사용 (별도 복사본 해제)
+        self.scan_table = self.search_pool.scan_table
+    
+    # 병렬 탐색 풀 종료
+    def close(self):
+        if self.search_pool is not None:
+            # 풀 종료 후에도 프로세스 내 매칭이 가능하도록 공유 메모리 테이블을 복사한 뒤 해제
+            self.scan_table = np.array(self.scan_table)
+            self.search_pool.close()
+            self.search_pool = None
+    
     # 위치 찾기
     def find_location(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Tuple[Optional[Tuple[int, int]], float]:
-        best_diff = float('inf')
-        best_yx = None
+        best_yx, _, best_diff = self.find_pose(real_scan_vector, current_angle_int)
+        return best_yx, best_diff
+    
+    # 위치 추적 (이전 위치 주변 윈도우 탐색)
+    def track_location(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Tuple[Optional[Tuple[int, int]], float]:
+        best_yx, _, best_diff = self.track_pose(real_scan_vector, current_angle_int)
+        return best_yx, best_diff
+    
+    # 위치 + 방향 찾기 (전역 전수 조사)
+    def find_pose(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Tuple[Optional[Tuple[int, int]], float, float]:
+        # 반환: (best_yx, 매칭된 방향(도), 평균 오차)
+        # ROTATION_SEARCH_BINS > 0이면 IMU 각도 주변 ±k 구간의 회전도 함께 탐색
+        with self.map_lock:
+            result = self._search(real_scan_vector, current_angle_int)
+            if result is None:
+                return None, float(current_angle_int), 9999
+            
+            best_idx, best_shift, best_diff = result
+            best_yx = self._coords_of(best_idx)
+        return best_yx, self._heading_of(current_angle_int, best_shift), best_diff
+    
+    # 위치 + 방향 추적 (이전 위치 주변 윈도우 탐색)
+    def track_pose(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Tuple[Optional[Tuple[int, int]], float, float]:
+        # - 마지막 채택 위치 주변 TRACKING_WINDOW_CELLS 범위만 탐색 (IMU 각도는 그대로 회전 사전정보로 사용)
+        # - 이전 위치가 없거나 윈도우 결과가 신뢰 기준(is_confident, CONFIDENCE_THRESHOLD)을 넘지 못하면
+        #   거친 전역 탐색 → 최적 블록 주변 정밀 탐색으로 재초기화
+        with self.map_lock:
+            result = None
+            
+            # 1. 윈도우 탐색
+            if self.last_yx is not None:
+                window = self._window_indices(self.last_yx, TRACKING_WINDOW_CELLS)
+                if len(window) > 0:
+                    result = self._search(real_scan_vector, current_angle_int, window)
+                    if result is None:
+                        return None, float(current_angle_int), 9999
+            
+            if result is None or not is_confident(result[2]):
+                # 2. 거친 전역 탐색
+                coarse = self._search(real_scan_vector, current_angle_int, self.coarse_indices)
+                if coarse is None:
+                    return None, float(current_angle_int), 9999
+                
+                # 3. 거친 최적 위치 주변 정밀 탐색
+                refine = self._window_indices(self._coords_of(coarse[0]), COARSE_GRID_STEP)
+                result = self._search(real_scan_vector, current_angle_int, refine)
+            
+            best_idx, best_shift, best_diff = result
+            best_yx = self._coords_of(best_idx)
+            
+            # 신뢰할 수 없는 결과는 반환만 하고 다음 윈도우의 기준으로 쓰지 않음
+            self.last_yx = best_yx if is_confident(best_diff) else None
+            return best_yx, self._heading_of(current_angle_int, best_shift), best_diff
+    
+    # 추적 상태 초기화 (다음 스캔은 전역 탐색)
+    def reset_tracking(self):
+        self.last_yx = None
+    
+    # 후보 행 번호 → (y, x)
+    def _coords_of(self, idx: int) -> Tuple[int, int]:
+        y, x = self.scan_coords[idx]
+        return int(y), int(x)
+    
+    # IMU 각도 + 회전 보정 구간 → 방향(도)
+    @staticmethod
+    def _heading_of(current_angle_int: int, shift: int) -> float:
+        return float((current_angle_int + shift * ANGLE_STEP) % 360)
+    
+    # 회전 탐색 여부에 따른 후보 매칭
+    def _search(self, real_scan_vector: np.ndarray, current_angle_int: int,
+                indices: Optional[np.ndarray] = None) -> Optional[Tuple[int, int, float]]:
+        # 반환: (scan_table 행 번호, IMU 각도 대비 회전 보정 구간 수, 평균 오차)
+        # 후보가 PARALLEL_MIN_CANDIDATES 이상이면 병렬 탐색 풀 사용 (작은 윈도우는 전달 비용이 더 큼)
+        num_rows = len(self.scan_table) if indices is None else len(indices)
+        if self.search_pool is not None and num_rows >= PARALLEL_MIN_CANDIDATES:
+            try:
+                return self.search_pool.search(real_scan_vector, current_angle_int, indices)
+            except Exception as e:
+                # 워커 오류 시 풀을 닫고 이후 프로세스 내 실행
+                self.close()
+        
+        scored = self._score_rows(real_scan_vector, current_angle_int, indices)
+        return None if scored is None else scored[:3]
+    
+    # 후보 매칭 (프로세스 내 실행, 병렬 탐색 워커도 담당 구간에 대해 호출)
+    def _score_rows(self, real_scan_vector: np.ndarray, current_angle_int: int,
+                    indices: Optional[np.ndarray] = None) -> Optional[Tuple[int, int, float, float]]:
+        # 반환: (행 번호, 회전 보정 구간 수, 평균 오차, 후보 선택 기준 점수 - 작을수록 좋음)
+        if ROTATION_SEARCH_BINS > 0:
+            shift_idx = int(current_angle_int / ANGLE_STEP)
+            return self._match_rotations(real_scan_vector, shift_idx, indices)
         
-        # 1. 배열 회전 (Data Rotation)
+        prepared = self._prepare_scan(real_scan_vector, current_angle_int)
+        if prepared is None:
+            return None
+        best_idx, best_diff = self._match_candidates(*prepared, indices)
+        return best_idx, 0, best_diff, best_diff
+    
+    # 특정 위치 주변 윈도우 안의 후보 행 번호
+    def _window_indices(self, center_yx: Tuple[int, int], radius: int) -> np.ndarray:
+        cy, cx = center_yx
+        y0, y1 = max(0, cy - radius), min(self.height, cy + radius + 1)
+        x0, x1 = max(0, cx - radius), min(self.width, cx + radius + 1)
+        window = self.cand_index[y0:y1, x0:x1].ravel()
+        return window[window >= 0]
+    
+    # 스캔 회전 및 유효 데이터 마스킹
+    def _prepare_scan(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
         # 각도만큼 데이터를 회전시켜 0도 기준으로 변환
         shift_idx = int(current_angle_int / ANGLE_STEP)
         rotated_scan = np.roll(real_scan_vector, shift_idx)
         
-        # 2. 유효 데이터 마스킹
         valid_mask = rotated_scan > (MIN_DIST_MM / 1000.0)
         
-        if np.sum(valid_mask) < 5:
-            return None, 9999
+        if np.sum(valid_mask) < 5 or len(self.scan_table) == 0:
+            return None
+        return rotated_scan, valid_mask
+    
+    # 후보 전체(또는 일부)에 대한 일괄 오차 계산
+    def _match_candidates(self, rotated_scan: np.ndarray, valid_mask: np.ndarray,
+                          indices: Optional[np.ndarray] = None) -> Tuple[int, float]:
+        # 후보를 MATCH_CHUNK_SIZE 단위로 나누어 (청크 × 유효 구간) 크기의
+        # 임시 배열만 사용하므로 맵 크기와 무관하게 최대 메모리가 제한됨
+        # indices가 주어지면 해당 행만 비교하고, 반환값은 scan_table 기준 행 번호
+        # 양자화 테이블은 실제 스캔도 mm 정수로 변환하여 정수 오차 합으로 비교
+        valid_cols = np.flatnonzero(valid_mask)
+        integer_table = np.issubdtype(self.scan_table.dtype, np.integer)
+        if integer_table:
+            real_valid = np.rint(rotated_scan[valid_cols] / self.scan_scale).astype(np.int32)
+        else:
+            real_valid = rotated_scan[valid_cols].astype(np.float32)
+        num_rows = len(self.scan_table) if indices is None else len(indices)
         
-        real_valid = rotated_scan[valid_mask]
+        best_idx = 0
+        best_sum = np.inf
         
-        # 3. 전수 조사 (Brute-force matching)
-        for cand in self.virtual_scans:
-            sim_scan = cand['scan']
-            sim_valid = sim_scan[valid_mask]
+        for start in range(0, num_rows, MATCH_CHUNK_SIZE):
+            if indices is None:
+                rows = slice(start, start + MATCH_CHUNK_SIZE)
+                chunk = self.scan_table[rows, valid_cols]
+            else:
+                rows = indices[start:start + MATCH_CHUNK_SIZE]
+                chunk = self.scan_table[np.ix_(rows, valid_cols)]
+            if integer_table:
+                chunk = chunk.astype(np.int32)
+            np.subtract(chunk, real_valid, out=chunk)
+            np.abs(chunk, out=chunk)
+            diff_sums = chunk.sum(axis=1)
             
-            # 거리 차이 계산
-            diff = np.sum(np.abs(real_valid - sim_valid))
-            avg_diff = diff / len(real_valid)
+            # argmin은 동일 오차일 때 앞선 후보를 선택 (기존 순차 탐색과 동일)
+            local_idx = int(np.argmin(diff_sums))
+            if diff_sums[local_idx] < best_sum:
+                best_sum = float(diff_sums[local_idx])
+                best_idx = start + local_idx if indices is None else int(rows[local_idx])
+        
+        return best_idx, best_sum * self.scan_scale / len(valid_cols)
+    
+    # 후보 × 회전 구간(±ROTATION_SEARCH_BINS) 일괄 매칭
+    def _match_rotations(self, real_scan_vector: np.ndarray, shift_idx: int,
+                         indices: Optional[np.ndarray] = None) -> Optional[Tuple[int, int, float, float]]:
+        # 회전 k마다 L1 오차를 따로 계산하면 비용이 구간 수만큼 늘어나므로,
+        # 제곱 오차를 전개하여 모든 회전을 행렬곱 두 번으로 한꺼번에 계산
+        #   Σ m_k (t - r_k)² = (t²)·m_k - 2 t·(m_k r_k) + Σ m_k r_k²
+        # (전체 360° 회전이라면 FFT 상호상관이 유리하지만 좁은 구간에서는 GEMM이 더 빠름)
+        # 회전 탐색을 켜면 후보/회전 선택 기준이 L1 오차가 아니라 제곱 오차 (큰 거리 차이에 더 민감)
+        # 반환 오차는 ROTATION_SEARCH_BINS = 0일 때와 같은 평균 L1 오차 (+ 선택 기준 제곱 오차)
+        # 제곱 테이블은 상주시키지 않고 청크마다 계산 (추가 메모리는 청크 크기만큼)
+        # 양자화 테이블은 청크를 미터로 되돌리지 않고 mm 단위 그대로 비교 (실제 스캔을 mm 정수로 반올림)
+        #   int64 행렬곱은 NumPy에 BLAS 경로가 없어 float32보다 약 4배 느리므로 mm 값(uint16은 float32로 정확히 표현)에 float32 GEMM 적용
+        if len(self.scan_table) == 0:
+            return None
+        
+        shifts = np.arange(-ROTATION_SEARCH_BINS, ROTATION_SEARCH_BINS + 1)
+        rotated = np.stack([np.roll(real_scan_vector, shift_idx + k) for k in shifts], axis=1)
+        valid_masks = rotated > (MIN_DIST_MM / 1000.0)
+        
+        # 회전해도 유효 구간 수는 동일
+        valid_count = valid_masks[:, 0].sum()
+        if valid_count < 5:
+            return None
+        
+        integer_table = np.issubdtype(self.scan_table.dtype, np.integer)
+        real = np.rint(rotated / self.scan_scale) if integer_table else rotated
+        masks = valid_masks.astype(np.float32)
+        masked_real = (masks * real).astype(np.float32)
+        real_energy = (masked_real * real).sum(axis=0)
+        num_rows = len(self.scan_table) if indices is None else len(indices)
+        
+        best_idx, best_k = 0, 0
+        best_sse = np.inf
+        
+        for start in range(0, num_rows, MATCH_CHUNK_SIZE):
+            if indices is None:
+                rows = slice(start, start + MATCH_CHUNK_SIZE)
+            else:
+                rows = indices[start:start + MATCH_CHUNK_SIZE]
+            
+            table_rows = self.scan_table[rows].astype(np.float32, copy=False)
+            sse = np.square(table_rows) @ masks
+            sse -= 2 * (table_rows @ masked_real)
+            sse += real_energy
             
-            if avg_diff < best_diff:
-                best_diff = avg_diff
-                best_yx = cand['yx']
+            flat_idx = int(np.argmin(sse))
+            row, k = divmod(flat_idx, len(shifts))
+            if sse[row, k] < best_sse:
+                best_sse = sse[row, k]
+                best_idx = start + row if indices is None else int(rows[row])
+                best_k = k
         
-        return best_yx, best_diff
+        # 선택 기준 점수는 테이블 형식과 무관하게 m² 단위 (병렬 탐색 워커 간 비교)
+        if integer_table:
+            best_sse = best_sse * self.scan_scale ** 2
+        
+        # 선택된 (후보, 회전)의 평균 L1 오차
+        valid = valid_masks[:, best_k]
+        best_scan = np.asarray(self.scan_table[best_idx], dtype=np.float64) * self.scan_scale
+        best_diff = float(np.abs(best_scan[valid] - rotated[valid, best_k]).sum() / valid_count)
+        
+        return best_idx, int(shifts[best_k]), best_diff, float(best_sse)
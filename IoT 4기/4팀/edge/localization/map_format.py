@@ -0,0 +1,117 @@
+# 바이너리 맵 포맷 모듈
+# Occupancy Grid + 후보 인덱스 + 가상 스캔 테이블을 하나의 파일에 저장하고
+# np.memmap으로 복사 없이 로드
+#
+# 파일 구조 (리틀 엔디언, 각 섹션은 64바이트 정렬):
+#   헤더    : MAP_HEADER (magic, 버전, 크기, 해상도, 후보 수, 각도 구간 수, 각도 스텝, 섹션 오프셋)
+#   grid    : uint8 (height × width)        0=자유공간, 1=장애물
+#   coords  : int32 (후보 수 × 2)           후보 (y, x), scans 각 행에 대응
+#   scans   : float32 (후보 수 × 각도 구간 수) 0도 기준 가상 스캔 (구간 수 0이면 생략)
+import os
+import struct
+import numpy as np
+from typing import NamedTuple, Optional
+
+MAP_MAGIC = b'CMAP'
+MAP_VERSION = 1
+MAP_EXTENSION = '.cmap'
+
+# magic, 버전, width, height, resolution, 후보 수, 각도 구간 수, 각도 스텝, grid/coords/scans 오프셋
+MAP_HEADER = struct.Struct('<4sHIIdIIIQQQ')
+SECTION_ALIGN = 64
+
+
+class BinaryMap(NamedTuple):
+    width: int
+    height: int
+    resolution: float
+    angle_step: int
+    grid: np.ndarray
+    coords_yx: np.ndarray
+    scans: Optional[np.ndarray]
+
+
+# 섹션 오프셋 정렬
+def _align(offset: int) -> int:
+    return (offset + SECTION_ALIGN - 1) // SECTION_ALIGN * SECTION_ALIGN
+
+
+def is_binary_map(path: str) -> bool:
+    """
+    바이너리 맵 파일 여부 판별 (magic 확인)
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAP_MAGIC)) == MAP_MAGIC
+
+
+def write_binary_map(path: str, grid: np.ndarray, resolution: float, coords_yx: np.ndarray,
+                     scans: Optional[np.ndarray] = None, angle_step: int = 0):
+    """
+    바이너리 맵 파일 저장 (임시 파일 작성 후 교체)
+    
+    Args:
+        path: 저장 경로
+        grid: (height, width) Occupancy Grid
+        resolution: 그리드 해상도 (미터)
+        coords_yx: (후보 수, 2) 후보 좌표
+        scans: (후보 수, 각도 구간 수) 가상 스캔 테이블 (없으면 None)
+        angle_step: scans 계산에 사용한 각도 스텝 (도)
+    """
+    height, width = grid.shape
+    num_candidates = len(coords_yx)
+    num_bins = 0 if scans is None else scans.shape[1]
+    
+    grid_offset = _align(MAP_HEADER.size)
+    coords_offset = _align(grid_offset + height * width)
+    scans_offset = _align(coords_offset + num_candidates * 2 * 4)
+    
+    header = MAP_HEADER.pack(
+        MAP_MAGIC, MAP_VERSION, width, height, float(resolution),
+        num_candidates, num_bins, angle_step,
+        grid_offset, coords_offset, scans_offset
+    )
+    
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        sections = [
+            (0, header),
+            (grid_offset, np.ascontiguousarray(grid, dtype=np.uint8).tobytes()),
+            (coords_offset, np.ascontiguousarray(coords_yx, dtype='<i4').tobytes()),
+        ]
+        if scans is not None:
+            sections.append((scans_offset, np.ascontiguousarray(scans, dtype='<f4').tobytes()))
+        
+        for offset, payload in sections:
+            f.seek(offset)
+            f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_binary_map(path: str) -> BinaryMap:
+    """
+    바이너리 맵 파일을 읽기 전용 memmap으로 로드 (섹션 데이터 복사 없음)
+    
+    Returns:
+        BinaryMap: grid / coords_yx / scans는 np.memmap
+    """
+    with open(path, 'rb') as f:
+        header = f.read(MAP_HEADER.size)
+    
+    (magic, version, width, height, resolution, num_candidates, num_bins, angle_step,
+     grid_offset, coords_offset, scans_offset) = MAP_HEADER.unpack(header)
+    
+    if magic != MAP_MAGIC or version != MAP_VERSION:
+        raise ValueError(f"지원하지 않는 맵 파일: {path}")
+    
+    grid = np.memmap(path, dtype=np.uint8, mode='r', offset=grid_offset, shape=(height, width))
+    
+    if num_candidates > 0:
+        coords_yx = np.memmap(path, dtype='<i4', mode='r', offset=coords_offset, shape=(num_candidates, 2))
+    else:
+        coords_yx = np.zeros((0, 2), dtype=np.int32)
+    
+    scans = None
+    if num_bins > 0 and num_candidates > 0:
+        scans = np.memmap(path, dtype='<f4', mode='r', offset=scans_offset, shape=(num_candidates, num_bins))
+    
+    return BinaryMap(width, height, resolution, angle_step, grid, coords_yx, scans)
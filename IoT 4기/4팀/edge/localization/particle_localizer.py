@@ -0,0 +1,171 @@
+# 파티클 필터 위치 추정 모듈
+# Monte Carlo Localization: 파티클을 IMU 방향 변화로 전파하고 가상 스캔 테이블로 가중치 갱신
+import numpy as np
+from typing import Tuple, Optional
+
+from config import (
+    ANGLE_STEP,
+    MIN_DIST_MM,
+    PF_MIN_PARTICLES,
+    PF_MAX_PARTICLES,
+    PF_PARTICLES_PER_CELL,
+    PF_MOTION_STD,
+    PF_HEADING_STD,
+    PF_INIT_STD,
+    PF_SENSOR_SIGMA,
+    PF_RESAMPLE_RATIO
+)
+from utils.helpers import is_confident
+from .localizer import Localizer
+
+
+# 파티클 필터 위치 추정 클래스
+class ParticleLocalizer(Localizer):
+    # Localizer와 같은 find_location / find_pose 인터페이스
+    # - 파티클: (y, x, heading) 연속 좌표 (셀 단위, 도)
+    # - 예측: heading += IMU 방향 변화량 + 잡음, 위치는 랜덤 워크 (주행 거리 센서 없음)
+    # - 갱신: 파티클 셀의 가상 스캔과 실제 스캔의 평균 L1 오차 → exp(-오차 / PF_SENSOR_SIGMA)
+    # - 재샘플링: 유효 파티클 수가 PF_RESAMPLE_RATIO 미만이면 systematic resampling,
+    #   파티클이 차지한 셀 수에 비례하여 파티클 수 조절 (PF_MIN ~ PF_MAX)
+    # - 초기화/복구: 전수 조사 결과 주변에 파티클 배치
+    
+    # 파티클이 방향을 직접 추정하므로 IMU에 방향 보정을 되먹이지 않음
+    heading_feedback = False
+    
+    # 초기화
+    def __init__(self, map_path: str, seed: Optional[int] = None):
+        super().__init__(map_path)
+        self.rng = np.random.default_rng(seed)
+        self.particles = np.zeros((0, 3))
+        self.weights = np.zeros(0)
+        self.last_imu_angle = None
+    
+    # 위치 + 방향 찾기 (파티클 필터 1스텝)
+    def find_pose(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Tuple[Optional[Tuple[int, int]], float, float]:
+        with self.map_lock:
+            valid_bins = np.flatnonzero(real_scan_vector > (MIN_DIST_MM / 1000.0))
+            if len(valid_bins) < 5 or len(self.scan_table) == 0:
+                return None, float(current_angle_int), 9999
+            
+            # 1. 초기화 또는 예측
+            if len(self.particles) == 0:
+                if not self._initialize(real_scan_vector, current_angle_int):
+                    return None, float(current_angle_int), 9999
+            else:
+                self._predict(current_angle_int)
+            self.last_imu_angle = current_angle_int
+            
+            # 2. 가중치 갱신
+            errors = self._particle_errors(real_scan_vector, valid_bins)
+            self._update_weights(errors)
+            
+            # 3. 추정 결과 (최대 가중치 파티클)
+            best = int(np.argmax(self.weights))
+            best_error = float(errors[best])
+            
+            # 모든 파티클이 맵 밖이거나 신뢰 기준을 넘지 못하면 전수 조사로 재초기화
+            if not np.isfinite(best_error) or not is_confident(best_error):
+                if not self._initialize(real_scan_vector, current_angle_int):
+                    return None, float(current_angle_int), 9999
+                errors = self._particle_errors(real_scan_vector, valid_bins)
+                self._update_weights(errors)
+                best = int(np.argmax(self.weights))
+                best_error = float(errors[best])
+            
+            y, x, heading = self.particles[best]
+            best_yx = (int(y), int(x))
+            
+            # 4. 재샘플링
+            self._resample_if_needed()
+            
+            return best_yx, float(heading % 360), best_error
+    
+    # 파티클 필터는 항상 이전 상태를 이어서 추적
+    def track_pose(self, real_scan_vector: np.ndarray, current_angle_int: int) -> Tuple[Optional[Tuple[int, int]], float, float]:
+        return self.find_pose(real_scan_vector, current_angle_int)
+    
+    # 추적 상태 초기화 (다음 스캔에서 파티클 재배치)
+    def reset_tracking(self):
+        super().reset_tracking()
+        self.particles = np.zeros((0, 3))
+        self.weights = np.zeros(0)
+        self.last_imu_angle = None
+    
+    # 전수 조사 결과 주변에 파티클 배치
+    def _initialize(self, real_scan_vector: np.ndarray, current_angle_int: int) -> bool:
+        best_yx, heading, _ = Localizer.find_pose(self, real_scan_vector, current_angle_int)
+        if best_yx is None:
+            return False
+        
+        count = PF_MAX_PARTICLES
+        particles = np.empty((count, 3))
+        particles[:, 0] = best_yx[0] + 0.5 + self.rng.normal(0, PF_INIT_STD, count)
+        particles[:, 1] = best_yx[1] + 0.5 + self.rng.normal(0, PF_INIT_STD, count)
+        particles[:, 2] = heading + self.rng.normal(0, PF_HEADING_STD, count)
+        
+        self.particles = particles
+        self.weights = np.full(count, 1.0 / count)
+        return True
+    
+    # 예측 단계: IMU 방향 변화량 반영 + 위치 랜덤 워크
+    def _predict(self, current_angle_int: int):
+        count = len(self.particles)
+        delta = (current_angle_int - self.last_imu_angle + 180) % 360 - 180
+        
+        self.particles[:, 2] += delta + self.rng.normal(0, PF_HEADING_STD, count)
+        self.particles[:, :2] += self.rng.normal(0, PF_MOTION_STD, (count, 2))
+    
+    # 파티클별 평균 L1 오차 (맵 밖/장애물 위 파티클은 inf)
+    def _particle_errors(self, real_scan_vector: np.ndarray, valid_bins: np.ndarray) -> np.ndarray:
+        cell_y = np.floor(self.particles[:, 0]).astype(np.int64)
+        cell_x = np.floor(self.particles[:, 1]).astype(np.int64)
+        inside = (cell_y >= 0) & (cell_y < self.height) & (cell_x >= 0) & (cell_x < self.width)
+        
+        rows = np.full(len(self.particles), -1, dtype=np.int64)
+        rows[inside] = self.cand_index[cell_y[inside], cell_x[inside]]
+        on_free = rows >= 0
+        
+        errors = np.full(len(self.particles), np.inf)
+        if not np.any(on_free):
+            return errors
+        
+        # find_location과 같은 회전 규칙: roll(real, s)[b] == real[b - s]
+        # → real[b]는 가상 스캔의 (b + s) 구간과 비교
+        num_bins = self.scan_table.shape[1]
+        shifts = (self.particles[on_free, 2] % 360 / ANGLE_STEP).astype(np.int64)
+        cols = (valid_bins[None, :] + shifts[:, None]) % num_bins
+        virtual = self.scan_table[rows[on_free][:, None], cols] * np.float32(self.scan_scale)
+        
+        errors[on_free] = np.abs(virtual - real_scan_vector[valid_bins]).mean(axis=1)
+        return errors
+    
+    # 가중치 갱신
+    def _update_weights(self, errors: np.ndarray):
+        finite = np.isfinite(errors)
+        likelihood = np.zeros(len(errors))
+        if np.any(finite):
+            # 수치 안정성을 위해 최소 오차 기준으로 계산
+            likelihood[finite] = np.exp(-(errors[finite] - errors[finite].min()) / PF_SENSOR_SIGMA)
+        
+        weights = self.weights * likelihood
+        total = weights.sum()
+        self.weights = weights / total if total > 0 else np.full(len(errors), 1.0 / len(errors))
+    
+    # 재샘플링 (systematic) + 파티클 수 조절
+    def _resample_if_needed(self):
+        effective = 1.0 / np.sum(self.weights ** 2)
+        if effective >= PF_RESAMPLE_RATIO * len(self.particles):
+            return
+        
+        # 가중치가 있는 파티클이 차지한 셀 수에 비례하여 다음 파티클 수 결정
+        alive = self.weights > 1e-12
+        cells = np.unique(np.floor(self.particles[alive, :2]).astype(np.int64), axis=0)
+        count = int(np.clip(len(cells) * PF_PARTICLES_PER_CELL, PF_MIN_PARTICLES, PF_MAX_PARTICLES))
+        
+        positions = (self.rng.random() + np.arange(count)) / count
+        cumulative = np.cumsum(self.weights)
+        cumulative[-1] = 1.0
+        indices = np.searchsorted(cumulative, positions)
+        
+        self.particles = self.particles[indices]
+        self.weights = np.full(count, 1.0 / count)
@@ -0,0 +1,85 @@
+# 가상 스캔 테이블 디스크 캐시 모듈
+# 맵 내용과 스캔 설정이 같으면 이전 부팅에서 계산한 테이블을 mmap으로 재사용
+import os
+import hashlib
+import numpy as np
+from typing import Optional, Tuple
+
+from config import SCAN_CACHE_DIR
+
+# 캐시 포맷 버전 (테이블 계산 방식이 바뀌면 증가시켜 기존 캐시 무효화)
+SCAN_CACHE_VERSION = 1
+
+
+def scan_cache_key(map_bytes: bytes, angle_step: int, resolution: float) -> str:
+    """
+    맵 파일 내용과 스캔 설정으로 캐시 키 생성
+    
+    Args:
+        map_bytes: 맵 파일 원본 바이트
+        angle_step: 각도 스텝 (도)
+        resolution: 그리드 해상도 (미터)
+        
+    Returns:
+        str: SHA-256 기반 캐시 키
+    """
+    digest = hashlib.sha256(map_bytes)
+    digest.update(f"|{angle_step}|{resolution!r}|v{SCAN_CACHE_VERSION}".encode())
+    return digest.hexdigest()[:24]
+
+
+def scan_cache_path(key: str, cache_dir: str = SCAN_CACHE_DIR) -> str:
+    """
+    캐시 키에 해당하는 .npy 파일 경로 반환
+    """
+    return os.path.join(cache_dir, f"virtual_scans_v{SCAN_CACHE_VERSION}_{key}.npy")
+
+
+def load_scan_cache(key: str, shape: Tuple[int, int], dtype=np.float32,
+                    cache_dir: str = SCAN_CACHE_DIR) -> Optional[np.ndarray]:
+    """
+    캐시된 가상 스캔 테이블을 읽기 전용 memmap으로 로드
+    
+    Args:
+        key: 캐시 키
+        shape: 기대하는 테이블 크기 (후보 수, 각도 구간 수)
+        dtype: 기대하는 자료형
+        cache_dir: 캐시 디렉토리
+        
+    Returns:
+        Optional[np.ndarray]: 캐시 테이블 (없거나 형식이 다르면 None)
+    """
+    path = scan_cache_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    
+    try:
+        table = np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    
+    if table.shape != tuple(shape) or table.dtype != np.dtype(dtype):
+        return None
+    return table
+
+
+def save_scan_cache(key: str, table: np.ndarray, cache_dir: str = SCAN_CACHE_DIR) -> bool:
+    """
+    가상 스캔 테이블을 캐시 파일로 저장 (임시 파일 작성 후 교체)
+    
+    Returns:
+        bool: 저장 성공 여부 (읽기 전용 파일시스템 등은 실패로 처리)
+    """
+    path = scan_cache_path(key, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(table))
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
@@ -0,0 +1,189 @@
+# 병렬 후보 탐색 모듈
+# 가상 스캔 테이블을 공유 메모리에 한 번만 올려두고, 워커 프로세스마다 후보 구간(샤드)을 나누어 탐색
+import os
+import queue
+import multiprocessing
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# 워커 프로세스의 BLAS 스레드 수 (프로세스 간 병렬화와 중복되지 않도록 1로 제한)
+BLAS_THREAD_ENV = ('OPENBLAS_NUM_THREADS', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# 워커 응답 대기 시간 (초), 초과 시 오류로 보고 프로세스 내 실행으로 전환
+SEARCH_TIMEOUT = 5.0
+
+
+def _worker_main(worker_id: int, shm_name: str, shape: Tuple[int, int], table_dtype: str,
+                 scan_scale: float, row_start: int, row_end: int,
+                 task_queue, result_queue):
+    """
+    워커 프로세스 루프: 공유 테이블의 [row_start, row_end) 구간만 탐색하여 구간 내 최적 후보 반환
+    
+    Args:
+        worker_id: 워커 번호 (구간 순서)
+        shm_name: scan_table을 담은 공유 메모리 이름
+        shape: scan_table 크기 (후보 수, 각도 구간 수)
+        table_dtype: scan_table 자료형 ('float32' 또는 'uint16')
+        scan_scale: 테이블 값 1의 미터 단위 크기
+        row_start / row_end: 담당 후보 행 구간
+        task_queue: (실제 스캔, IMU 각도, 구간 기준 후보 행 번호 또는 None) 수신, None이면 종료
+        result_queue: (워커 번호, 성공 여부, (전체 기준 행 번호, 회전 구간 수, 평균 오차, 선택 기준 점수) 또는 None)
+    """
+    # 순환 import 방지 (워커 프로세스에서만 필요)
+    from .localizer import Localizer
+    
+    # 공유 메모리 해제(unlink)는 부모 프로세스가 담당
+    shm = shared_memory.SharedMemory(name=shm_name)
+    
+    scan_table = np.ndarray(shape, dtype=np.dtype(table_dtype), buffer=shm.buf)
+    
+    # 담당 구간만 가진 탐색 객체 (맵/캐시 로드 없이 매칭 메서드만 사용)
+    matcher = Localizer.__new__(Localizer)
+    matcher.scan_scale = scan_scale
+    matcher.scan_table = scan_table[row_start:row_end]
+    
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        real_scan_vector, current_angle_int, local_indices = task
+        try:
+            scored = matcher._score_rows(real_scan_vector, current_angle_int, local_indices)
+            if scored is not None:
+                idx, shift, diff, score = scored
+                scored = (idx + row_start, shift, diff, score)
+            result_queue.put((worker_id, True, scored))
+        except Exception as e:
+            result_queue.put((worker_id, False, None))
+    
+    del matcher, scan_table
+    shm.close()
+
+
+class SearchPool:
+    """
+    후보 샤드 병렬 탐색 풀
+    
+    - scan_table을 공유 메모리에 한 번 복사 (스캔마다 테이블을 전달하지 않음)
+    - 워커 i는 연속된 후보 구간 i만 담당, 스캔마다 실제 스캔 벡터(수백 바이트)만 전달
+    - 각 워커의 구간 내 최적값을 선택 기준 점수로 비교하여 전체 최적 후보 결정
+      (동점이면 앞 구간 우선 → 단일 프로세스 순차 탐색과 같은 결과)
+    """
+    
+    def __init__(self, scan_table: np.ndarray, num_workers: int, scan_scale: float = 1.0):
+        num_rows, num_bins = scan_table.shape
+        self.num_workers = max(1, min(num_workers, num_rows))
+        
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, scan_table.nbytes))
+        self.scan_table = np.ndarray(scan_table.shape, dtype=scan_table.dtype, buffer=self.shm.buf)
+        # 부모 프로세스도 공유 테이블을 그대로 사용 (복사본 중복 방지)
+        self.scan_table[:] = scan_table
+        
+        bounds = np.linspace(0, num_rows, self.num_workers + 1).astype(np.int64)
+        self.row_starts = bounds[:-1]
+        self.row_ends = bounds[1:]
+        
+        context = multiprocessing.get_context('spawn')
+        self.result_queue = context.Queue()
+        self.task_queues = []
+        self.processes = []
+        
+        saved_env = {name: os.environ.get(name) for name in BLAS_THREAD_ENV}
+        try:
+            for name in BLAS_THREAD_ENV:
+                os.environ[name] = '1'
+            for row_start, row_end in zip(self.row_starts, self.row_ends):
+                task_queue = context.Queue()
+                process = context.Process(
+                    target=_worker_main,
+                    args=(len(self.processes), self.shm.name, (num_rows, num_bins), scan_table.dtype.str,
+                          scan_scale, int(row_start), int(row_end),
+                          task_queue, self.result_queue),
+                    name=f'localizer-worker-{len(self.processes)}',
+                    daemon=True,
+                )
+                process.start()
+                self.task_queues.append(task_queue)
+                self.processes.append(process)
+        except Exception:
+            self.close()
+            raise
+        finally:
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    
+    # 후보 전체(indices=None) 또는 일부를 워커에 나누어 탐색
+    def search(self, real_scan_vector: np.ndarray, current_angle_int: int,
+               indices: Optional[np.ndarray] = None) -> Optional[Tuple[int, int, float]]:
+        # 반환: (scan_table 행 번호, 회전 보정 구간 수, 평균 오차), 유효 데이터 부족 시 None
+        # 워커 응답이 없거나 워커에서 오류가 나면 RuntimeError
+        if not all(process.is_alive() for process in self.processes):
+            raise RuntimeError('localizer worker exited')
+        real_scan_vector = np.asarray(real_scan_vector, dtype=np.float64)
+        
+        num_tasks = 0
+        for worker, task_queue in enumerate(self.task_queues):
+            if indices is None:
+                local_indices = None
+            else:
+                row_start, row_end = self.row_starts[worker], self.row_ends[worker]
+                local_indices = indices[(indices >= row_start) & (indices < row_end)] - row_start
+                if len(local_indices) == 0:
+                    continue
+            task_queue.put((real_scan_vector, current_angle_int, local_indices))
+            num_tasks += 1
+        
+        results = {}
+        try:
+            for _ in range(num_tasks):
+                worker_id, ok, scored = self.result_queue.get(timeout=SEARCH_TIMEOUT)
+                if not ok:
+                    raise RuntimeError(f'localizer worker {worker_id} failed')
+                results[worker_id] = scored
+        except queue.Empty:
+            raise RuntimeError('localizer worker timeout')
+        
+        # 구간 순서대로 비교 (동점이면 앞 구간 유지)
+        best = None
+        for worker_id in sorted(results):
+            scored = results[worker_id]
+            if scored is not None and (best is None or scored[3] < best[3]):
+                best = scored
+        
+        if best is None:
+            return None
+        best_idx, best_shift, best_diff, _ = best
+        return best_idx, best_shift, best_diff
+    
+    # 워커 종료 및 공유 메모리 해제
+    def close(self):
+        for task_queue in self.task_queues:
+            try:
+                task_queue.put(None)
+            except Exception as e:
+                pass
+        for process in self.processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        self.task_queues = []
+        self.processes = []
+        
+        # 호출 측은 먼저 scan_table 참조를 놓아야 함 (매핑 해제 후 접근 방지)
+        self.scan_table = None
+        if self.shm is not None:
+            # close()가 실패해도(남은 참조로 BufferError) unlink는 반드시 시도하여 세그먼트 누수 방지
+            try:
+                self.shm.close()
+            except BufferError:
+                pass
+            finally:
+                try:
+                    self.shm.unlink()
+                except FileNotFoundError:
+                    pass
+            self.shm = None
@@ -1,4 +1,6 @@
 from cartlocalizationsystem import CartLocalizationSystem
 
-system = CartLocalizationSystem()
-system.run()
\ No newline at end of file
+# 탐색 워커 프로세스(spawn)가 이 파일을 다시 import해도 시스템이 중복 실행되지 않도록 보호
+if __name__ == '__main__':
+    system = CartLocalizationSystem()
+    system.run()
\ No newline at end of file
@@ -0,0 +1,68 @@
+# LiDAR/IMU 세션 기록 도구
+# 실제 센서의 iter_scans 출력과 IMU 각도를 세션 파일로 저장 (replay_benchmark.py에서 재생)
+#
+# 사용법:
+#   python3 record_session.py session.clrs --duration 60
+import sys
+import time
+import argparse
+import threading
+
+from config import LIDAR_PORT, LIDAR_BAUDRATE
+from sensors import IMUHandler, LidarProcessor, SessionRecorder
+
+
+# IMU 각도 주기적 기록 스레드
+# 리플레이가 INITIAL_MAP_ANGLE_OFFSET과 방향 보정을 다시 적용하므로 보정 전 자이로 각도를 기록
+def record_imu_loop(imu, recorder, interval, stop_event):
+    while not stop_event.is_set():
+        recorder.record_imu(imu.get_raw_angle())
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LiDAR/IMU 세션 기록')
+    parser.add_argument('output', help='저장할 세션 파일 경로')
+    parser.add_argument('--duration', type=float, default=60.0, help='기록 시간 (초)')
+    parser.add_argument('--imu-rate', type=float, default=100.0, help='IMU 기록 주기 (Hz)')
+    args = parser.parse_args()
+    
+    imu = IMUHandler()
+    imu.start()
+    lidar = LidarProcessor(LIDAR_PORT, LIDAR_BAUDRATE)
+    lidar.connect()
+    if lidar.lidar is None:
+        print("LiDAR 연결 실패")
+        return 1
+    
+    recorder = SessionRecorder(args.output)
+    stop_event = threading.Event()
+    imu_thread = threading.Thread(
+        target=record_imu_loop, args=(imu, recorder, 1.0 / args.imu_rate, stop_event), daemon=True
+    )
+    imu_thread.start()
+    
+    try:
+        for scan in lidar.iter_scans():
+            recorder.record_scan(scan)
+            if recorder.elapsed() >= args.duration:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        imu_thread.join()
+        recorder.close()
+        lidar.disconnect()
+        imu.stop()
+    
+    print(f"기록 완료: {args.output} (스캔 {recorder.scan_count}개, IMU {recorder.imu_count}개)")
+    imu_stats = imu.get_stats()
+    print(f"IMU 수집 ({imu_stats['mode']}): {imu_stats['sample_rate_hz']:.1f}Hz, "
+          f"읽기 {imu_stats['reads']}회, CPU {imu_stats['cpu_percent']:.1f}%, "
+          f"FIFO 오버플로 {imu_stats['fifo_overflows']}회")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
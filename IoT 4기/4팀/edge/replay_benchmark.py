@@ -0,0 +1,93 @@
+# 세션 리플레이 벤치마크
+# 기록된 세션으로 CartLocalizationSystem을 하드웨어/서버 없이 구동하여
+# 처리량, 단계별 지연 시간, (정답 궤적이 있으면) 위치 오차를 보고
+#
+# 사용법:
+#   python3 replay_benchmark.py session.clrs                    # 최대 속도 재생
+#   python3 replay_benchmark.py session.clrs --realtime         # 기록 시각 간격대로 재생
+#   python3 replay_benchmark.py session.clrs --truth truth.csv  # 위치 오차 계산
+#
+# truth.csv 형식: 헤더 t,x,y (세션 시각(초), 미터 좌표)
+import sys
+import csv
+import time
+import argparse
+import numpy as np
+
+from cartlocalizationsystem import CartLocalizationSystem
+from sensors import SessionLog, ReplayClock, ReplayLidarProcessor, ReplayIMUHandler
+from utils import format_coordinates
+
+
+# 정답 궤적 로드 → (t, x, y) 배열
+def load_truth(path: str) -> np.ndarray:
+    with open(path, 'r', newline='') as f:
+        rows = [(float(r['t']), float(r['x']), float(r['y'])) for r in csv.DictReader(f)]
+    return np.array(rows).reshape(-1, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='세션 리플레이 벤치마크')
+    parser.add_argument('session', help='record_session.py로 기록한 세션 파일')
+    parser.add_argument('--realtime', action='store_true', help='기록 시각 간격대로 재생 (기본: 최대 속도)')
+    parser.add_argument('--truth', help='정답 궤적 CSV (t,x,y)')
+    args = parser.parse_args()
+    
+    session = SessionLog(args.session)
+    clock = ReplayClock()
+    lidar = ReplayLidarProcessor(session, clock, realtime=args.realtime)
+    imu = ReplayIMUHandler(session, clock)
+    
+    # 맵 감시/주기 통계 보고는 끔 (타이밍 왜곡 방지, 실행 중인 카트의 통계 파일을 덮어쓰지 않음)
+    system = CartLocalizationSystem(imu=imu, lidar=lidar, enable_server=False, map_reload=False, telemetry=False)
+    
+    # 최대 속도 재생: 이전 스캔을 worker가 가져간 뒤에 다음 스캔 공급
+    lidar.ready = lambda: len(system.scan_queue) == 0
+    
+    results = []
+    system.add_result_listener(
+        lambda scan_time, position_yx, error, angle: results.append((scan_time, position_yx, error))
+    )
+    
+    start = time.perf_counter()
+    system.run()
+    elapsed = time.perf_counter() - start
+    
+    stats = system.get_pipeline_stats()
+    
+    print(f"세션: {args.session} ({len(session.scans)}개 스캔, {session.duration:.1f}초)")
+    print(f"재생 모드: {'실시간' if args.realtime else '최대 속도'}, 소요 {elapsed:.2f}초")
+    print(f"위치 추정: {len(results)}개 ({len(results) / elapsed:.1f} scans/sec)")
+    print(f"버린 스캔: 큐 {stats['scans_dropped']}개, 지연 {stats['scans_stale']}개")
+    print(f"신뢰도 미달: {stats['counts'].get('below_confidence', 0)}개, "
+          f"위치 추정 실패: {stats['counts'].get('scans_unlocalized', 0)}개")
+    if stats['errors']:
+        print(f"단계별 오류: {stats['errors']} (마지막: {stats['last_errors']})")
+    print()
+    print(f"{'stage':<10}{'count':>8}{'avg':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for stage, s in stats['latency'].items():
+        print(f"{stage:<10}{s['count']:>8}{s['avg_ms']:>10.2f}{s['p50_ms']:>10.2f}"
+              f"{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}{s['max_ms']:>10.2f}")
+    
+    if args.truth and results:
+        truth = load_truth(args.truth)
+        errors = []
+        for scan_time, (gy, gx), _ in results:
+            session_time = lidar.session_time_at(scan_time)
+            if session_time is None:
+                continue
+            x, y = format_coordinates(gx, gy, system.localizer.res)
+            true_x = np.interp(session_time, truth[:, 0], truth[:, 1])
+            true_y = np.interp(session_time, truth[:, 0], truth[:, 2])
+            errors.append(np.hypot(x - true_x, y - true_y))
+        
+        errors = np.array(errors)
+        p50, p95 = np.percentile(errors, [50, 95])
+        print()
+        print(f"위치 오차 (m): mean {errors.mean():.3f}  p50 {p50:.3f}  p95 {p95:.3f}  max {errors.max():.3f}")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
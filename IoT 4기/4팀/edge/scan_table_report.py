@@ -0,0 +1,111 @@
+# 가상 스캔 테이블 형식 비교 도구
+# float32(미터) 테이블과 uint16(밀리미터) 양자화 테이블의 메모리 사용량과 위치 추정 결과 차이 보고
+#
+# 사용법:
+#   python3 scan_table_report.py                                  # config.MAP_FILE, 합성 스캔
+#   python3 scan_table_report.py --map map.json --queries 500
+#   python3 scan_table_report.py --session session.clrs           # 기록된 세션의 스캔/IMU 각도 사용
+import sys
+import time
+import argparse
+import numpy as np
+
+from config import MAP_FILE, ANGLE_STEP, INITIAL_MAP_ANGLE_OFFSET
+from localization import Localizer
+from sensors.lidar_processor import LidarProcessor
+from sensors.session_log import SessionLog
+
+# 기존 구현의 스캔 데이터 형식 (위치마다 {'coords', 'scan'} dict + float64 배열) 항목당 크기 추정
+LEGACY_ENTRY_OVERHEAD = 64 + 2 * 28 + 56 + 112  # dict + 좌표 int 2개 + 튜플 + ndarray 헤더
+
+
+# 합성 질의 생성 (테이블 행을 IMU 각도만큼 되돌리고 거리 잡음 추가, 노이즈 각도 구간 제거)
+def make_synthetic_queries(localizer, num_queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    num_bins = localizer.scan_table.shape[1]
+    queries = []
+    for _ in range(num_queries):
+        row = int(rng.integers(len(localizer.scan_table)))
+        angle = int(rng.integers(0, 360))
+        scan = np.roll(localizer.virtual_scans(row).astype(np.float64), -int(angle / ANGLE_STEP))
+        scan += rng.normal(0.0, 0.02, num_bins)
+        scan[126 // ANGLE_STEP:234 // ANGLE_STEP] = 0.0
+        queries.append((scan, angle))
+    return queries
+
+
+# 세션 파일 질의 생성 (스캔 처리 + 기록 시각의 IMU 각도, 리플레이와 같이 초기 오프셋 적용)
+def load_session_queries(path: str):
+    session = SessionLog(path)
+    return [
+        (LidarProcessor.process_scan_array(scan), (session.imu_angle_at(t) + INITIAL_MAP_ANGLE_OFFSET) % 360)
+        for t, scan in zip(session.scan_times, session.scans)
+    ]
+
+
+# 상주 메모리 (테이블 + 좌표)
+def table_bytes(localizer) -> int:
+    return localizer.scan_table.nbytes + localizer.scan_coords.nbytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가상 스캔 테이블 형식별 메모리/정확도 비교')
+    parser.add_argument('--map', default=MAP_FILE, help='맵 파일 (JSON 또는 .cmap)')
+    parser.add_argument('--queries', type=int, default=300, help='합성 질의 수')
+    parser.add_argument('--session', help='질의로 사용할 세션 파일')
+    args = parser.parse_args()
+    
+    reference = Localizer(args.map, table_format='float32')
+    compact = Localizer(args.map, table_format='uint16_mm')
+    
+    if args.session:
+        queries = load_session_queries(args.session)
+    else:
+        queries = make_synthetic_queries(reference, args.queries)
+    
+    same_pose = 0
+    error_delta = []
+    elapsed = {'float32': 0.0, 'uint16_mm': 0.0}
+    for scan, angle in queries:
+        start = time.perf_counter()
+        ref_yx, ref_heading, ref_error = reference.find_pose(scan, angle)
+        elapsed['float32'] += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        yx, heading, error = compact.find_pose(scan, angle)
+        elapsed['uint16_mm'] += time.perf_counter() - start
+        
+        if ref_yx is None or yx is None:
+            same_pose += ref_yx is None and yx is None
+            continue
+        same_pose += ref_yx == yx and ref_heading == heading
+        error_delta.append(abs(error - ref_error))
+    
+    error_delta = np.array(error_delta) if error_delta else np.zeros(1)
+    
+    # 메모리
+    num_rows, num_bins = reference.scan_table.shape
+    legacy = num_rows * (num_bins * 8 + LEGACY_ENTRY_OVERHEAD)
+    
+    print(f"맵: {args.map} (후보 {num_rows}개 × 각도 구간 {num_bins}개)")
+    print()
+    print(f"{'format':<22}{'resident':>16}{'ratio':>10}")
+    for name, size in (('float64 list (legacy)', legacy),
+                       ('float32', table_bytes(reference)),
+                       ('uint16_mm + int16', table_bytes(compact))):
+        print(f"{name:<22}{size / 1e6:>13.2f} MB{size / legacy:>10.3f}")
+    
+    # 양자화 오차 (테이블 값 자체)
+    quant_error = np.abs(compact.virtual_scans().astype(np.float64) - reference.virtual_scans())
+    print()
+    print(f"테이블 양자화 오차 (m): mean {quant_error.mean():.6f}  max {quant_error.max():.6f}")
+    print()
+    print(f"질의 {len(queries)}개: 위치/방향 일치 {same_pose}개 ({100.0 * same_pose / max(1, len(queries)):.1f}%)")
+    print(f"평균 오차 차이 (m): mean {error_delta.mean():.6f}  max {error_delta.max():.6f}")
+    for name, total in elapsed.items():
+        print(f"find_pose {name:<10} {1000.0 * total / max(1, len(queries)):.2f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
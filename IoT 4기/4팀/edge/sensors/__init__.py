@@ -1,5 +1,8 @@
 # 센서 관련 모듈
 from .imu_handler import IMUHandler
 from .lidar_processor import LidarProcessor
+from .session_log import SessionRecorder, SessionLog
+from .replay import ReplayClock, ReplayLidarProcessor, ReplayIMUHandler
 
-__all__ = ['IMUHandler', 'LidarProcessor']
+__all__ = ['IMUHandler', 'LidarProcessor', 'SessionRecorder', 'SessionLog',
+           'ReplayClock', 'ReplayLidarProcessor', 'ReplayIMUHandler']
@@ -3,16 +3,38 @@
 import time
 import threading
 import numpy as np
-from mpu9250_jmdev.registers import *
-from mpu9250_jmdev.mpu_9250 import MPU9250
+
+try:
+    from mpu9250_jmdev.registers import *
+    from mpu9250_jmdev.mpu_9250 import MPU9250
+except ImportError:  # 오프라인(벤치마크/리플레이) 환경에서는 하드웨어 라이브러리 없이 사용
+    MPU9250 = None
 
 from config import (
     IMU_I2C_BUS,
     IMU_CALIBRATION_SAMPLES,
     IMU_UPDATE_RATE,
     IMU_DEADZONE_THRESHOLD,
+    IMU_HISTORY_SIZE,
+    IMU_ACQUISITION_MODE,
+    IMU_FIFO_SAMPLE_RATE,
+    IMU_FIFO_READ_INTERVAL,
+    IMU_MAG_FUSION_ENABLED,
+    IMU_MAG_FUSION_GAIN,
+    IMU_MAG_HARD_IRON,
+    IMU_MAG_SOFT_IRON_SCALE,
     INITIAL_MAP_ANGLE_OFFSET
 )
+from utils.ring_buffer import TimeSeriesBuffer
+
+# MPU9250 FIFO 레지스터 설정값
+FIFO_GYRO_Z_ONLY = 0x10        # FIFO_EN: GYRO_ZOUT만 FIFO에 기록 (샘플당 2바이트)
+FIFO_USER_ENABLE = 0x40        # USER_CTRL: FIFO_EN
+FIFO_USER_RESET = 0x04         # USER_CTRL: FIFO_RST
+FIFO_OVERFLOW_FLAG = 0x10      # INT_STATUS: FIFO_OFLOW_INT
+FIFO_CAPACITY_BYTES = 512
+FIFO_BLOCK_BYTES = 32          # SMBus 블록 읽기 최대 길이
+DLPF_184HZ = 0x01              # CONFIG: 자이로 내부 샘플링 1kHz + 184Hz 저역 통과 필터
 
 
 # IMUHandler 클래스 정의
@@ -22,6 +44,26 @@ class IMUHandler:
         self.lock = threading.Lock()
         self.running = False
         self.current_angle = 0.0
+        # 스캔 매칭으로 추정한 누적 방향 보정값 (도)
+        self.angle_correction = 0.0
+        # (perf_counter, 누적 각도(도, 360으로 감지 않음)) 기록
+        self.history = TimeSeriesBuffer(IMU_HISTORY_SIZE)
+        self.mode = IMU_ACQUISITION_MODE
+        # 지자기 보정은 카트에 장착한 상태로 측정한 hard-iron 오프셋이 있을 때만 사용 (금속 카트 자화로 방향이 치우침)
+        self.mag_fusion = IMU_MAG_FUSION_ENABLED and IMU_MAG_HARD_IRON is not None
+        
+        # 수집 통계 (업데이트 스레드에서만 갱신)
+        self.sample_count = 0
+        self.read_count = 0
+        self.fifo_overflows = 0
+        self.mag_updates = 0
+        self.cpu_time = 0.0
+        self.loop_started = None
+        self.loop_elapsed = 0.0
+        
+        if MPU9250 is None:
+            self.mpu = None
+            return
         
         try:
             self.mpu = MPU9250(
@@ -40,10 +82,10 @@ class IMUHandler:
             
             # 자이로 바이어스(평균 오차) 계산
             self.gyro_bias = self._calibrate_gyro()
-            
+        
         except Exception as e:
             self.mpu = None
-
+    
     # 자이로 보정 메서드
     def _calibrate_gyro(self) -> float:
         bias = 0.0
@@ -51,25 +93,28 @@ class IMUHandler:
             bias += self.mpu.readGyroscopeMaster()[2]
             time.sleep(0.005)
         return bias / IMU_CALIBRATION_SAMPLES
-
+    
     # 백그라운드 업데이트 스레드 시작 메서드
     def start(self):
         if self.mpu is None:
             return
         self.running = True
-        self.thread = threading.Thread(target=self._update_loop, daemon=True)
+        target = self._fifo_update_loop if self.mode == 'fifo' else self._update_loop
+        self.thread = threading.Thread(target=target, daemon=True)
         self.thread.start()
-
+    
     # 업데이트 스레드 중지 메서드
     def stop(self):
         self.running = False
         if hasattr(self, 'thread'):
             self.thread.join()
-
+    
     # 자이로 적분 업데이트 루프
     def _update_loop(self):
         cart_theta = 0.0
         last_time = time.perf_counter()
+        self.loop_started = last_time
+        cpu_start = time.thread_time()
         
         while self.running:
             try:
@@ -77,29 +122,219 @@ class IMUHandler:
                 current_time = time.perf_counter()
                 dt = current_time - last_time
                 last_time = current_time
-
+                self.read_count += 1
+                self.sample_count += 1
+                
                 # Z축 회전량 읽기
                 gz = gyro[2] - self.gyro_bias
                 
                 # 노이즈 제거 (Deadzone)
                 if abs(gz) < IMU_DEADZONE_THRESHOLD:
                     gz = 0.0
-
+                
                 # 적분 (각도 누적)
                 cart_theta += np.radians(gz * dt)
-                deg = np.degrees(cart_theta) % 360
+                unwrapped_deg = np.degrees(cart_theta)
+                deg = unwrapped_deg % 360
                 
                 with self.lock:
                     self.current_angle = deg
+                self.history.append(current_time, unwrapped_deg)
                 
+                self.cpu_time = time.thread_time() - cpu_start
+                self.loop_elapsed = current_time - self.loop_started
                 time.sleep(IMU_UPDATE_RATE)
+            
+            except Exception as e:
+                pass
+    
+    # FIFO 수집 설정 (GYRO_ZOUT만 IMU_FIFO_SAMPLE_RATE로 FIFO에 기록)
+    def _configure_fifo(self):
+        self.mpu.writeMaster(CONFIG, DLPF_184HZ)
+        self.mpu.writeMaster(SMPLRT_DIV, 1000 // IMU_FIFO_SAMPLE_RATE - 1)
+        self.mpu.writeMaster(FIFO_EN, 0x00)
+        self.mpu.writeMaster(USER_CTRL, FIFO_USER_RESET, 0.01)
+        self.mpu.writeMaster(USER_CTRL, FIFO_USER_ENABLE)
+        self.mpu.writeMaster(FIFO_EN, FIFO_GYRO_Z_ONLY)
+    
+    # FIFO에 쌓인 자이로 Z 원시값 읽기 (오버플로 시 FIFO 초기화 후 빈 배열)
+    def _read_fifo(self) -> np.ndarray:
+        if self.mpu.readMaster(INT_STATUS, 1)[0] & FIFO_OVERFLOW_FLAG:
+            self.fifo_overflows += 1
+            self.mpu.writeMaster(USER_CTRL, FIFO_USER_ENABLE | FIFO_USER_RESET)
+            return np.zeros(0, dtype=np.int16)
+        
+        count_h, count_l = self.mpu.readMaster(FIFO_COUNTH, 2)
+        num_bytes = ((count_h & 0x1F) << 8 | count_l) & ~1  # 샘플(2바이트) 단위로 읽기
+        
+        data = bytearray()
+        while len(data) < num_bytes:
+            block = min(FIFO_BLOCK_BYTES, num_bytes - len(data))
+            data += bytes(self.mpu.readMaster(FIFO_R_W, block))
+        self.read_count += 1
+        return np.frombuffer(bytes(data), dtype='>i2')
+    
+    # 지자기 X/Y 원시값 (읽기 실패 시 None)
+    def read_mag_xy(self):
+        mx, my, _ = self.mpu.readMagnetometerMaster()
+        if mx == 0 and my == 0:
+            return None
+        return float(mx), float(my)
+    
+    # 지자기 방향 (도, hard-iron 오프셋/축 배율 보정, 기울기 보정 없음 → 카트가 수평이라고 가정, 읽기 실패 시 None)
+    def _read_mag_heading(self):
+        xy = self.read_mag_xy()
+        if xy is None:
+            return None
+        mx = (xy[0] - IMU_MAG_HARD_IRON[0]) * IMU_MAG_SOFT_IRON_SCALE[0]
+        my = (xy[1] - IMU_MAG_HARD_IRON[1]) * IMU_MAG_SOFT_IRON_SCALE[1]
+        return float(np.degrees(np.arctan2(my, mx)))
+    
+    # 정적 메서드: 제자리 회전 중 측정한 지자기 X/Y로 보정값 계산
+    @staticmethod
+    def fit_mag_calibration(mx: np.ndarray, my: np.ndarray):
+        """
+        최소/최대 기반 hard-iron 오프셋과 축 배율 계산 (카트를 수평으로 한 바퀴 이상 돌리며 측정)
+        
+        Args:
+            mx: 지자기 X 원시값 배열
+            my: 지자기 Y 원시값 배열
+        
+        Returns:
+            Tuple[Tuple[float, float], Tuple[float, float]]: ((X 오프셋, Y 오프셋), (X 배율, Y 배율))
+        """
+        offset = ((mx.max() + mx.min()) / 2, (my.max() + my.min()) / 2)
+        radius = ((mx.max() - mx.min()) / 2, (my.max() - my.min()) / 2)
+        mean_radius = (radius[0] + radius[1]) / 2
+        scale = (mean_radius / radius[0], mean_radius / radius[1])
+        return (float(offset[0]), float(offset[1])), (float(scale[0]), float(scale[1]))
+    
+    # 정적 메서드: 자이로 샘플 일괄 적분
+    @staticmethod
+    def integrate_gyro(start_deg: float, gz: np.ndarray, period: float) -> np.ndarray:
+        """
+        바이어스가 제거된 Z축 각속도 샘플을 누적 적분
+        
+        Args:
+            start_deg: 첫 샘플 직전 누적 각도 (도)
+            gz: Z축 각속도 배열 (deg/s)
+            period: 샘플 간격 (초)
+        
+        Returns:
+            np.ndarray: 샘플별 누적 각도 (도, 360으로 감지 않음)
+        """
+        # 노이즈 제거 (Deadzone)
+        gz = np.where(np.abs(gz) < IMU_DEADZONE_THRESHOLD, 0.0, gz)
+        return start_deg + np.cumsum(gz * period)
+    
+    # FIFO 기반 자이로 적분 업데이트 루프
+    def _fifo_update_loop(self):
+        period = 1.0 / IMU_FIFO_SAMPLE_RATE
+        cart_deg = 0.0
+        last_sample_time = -np.inf
+        mag_offset = None
+        
+        try:
+            self._configure_fifo()
+        except Exception as e:
+            self.mode = 'poll'
+            self._update_loop()
+            return
+        
+        self.loop_started = time.perf_counter()
+        cpu_start = time.thread_time()
+        
+        while self.running:
+            try:
+                raw = self._read_fifo()
+                read_time = time.perf_counter()
+                
+                if len(raw) > 0:
+                    # Z축 회전량 (원시값 → deg/s, 라이브러리 보정값과 자이로 바이어스 제거)
+                    gz = raw * self.mpu.gres - self.mpu.gbias[2] - self.gyro_bias
+                    angles = self.integrate_gyro(cart_deg, gz, period)
+                    cart_deg = float(angles[-1])
+                    
+                    # 샘플 시각: 마지막 샘플을 읽은 시각 기준으로 센서 샘플 간격만큼 거슬러 올라가되
+                    # 읽기 지연 편차로 이전 묶음과 겹치지 않도록 이전 마지막 샘플 이후로 제한
+                    steps = np.arange(len(raw))
+                    times = np.maximum(read_time - period * steps[::-1],
+                                       last_sample_time + period * (steps + 1))
+                    last_sample_time = float(times[-1])
+                    self.history.extend(times, angles)
+                    self.sample_count += len(raw)
+                
+                # 지자기 방향으로 드리프트 보정 (시작 시점 차이를 기준으로 유지)
+                if self.mag_fusion:
+                    mag_heading = self._read_mag_heading()
+                    if mag_heading is not None:
+                        if mag_offset is None:
+                            mag_offset = mag_heading - cart_deg
+                        error = (mag_heading - mag_offset - cart_deg + 180) % 360 - 180
+                        cart_deg += IMU_MAG_FUSION_GAIN * error
+                        self.mag_updates += 1
+                
+                with self.lock:
+                    self.current_angle = cart_deg % 360
                 
+                self.cpu_time = time.thread_time() - cpu_start
+                self.loop_elapsed = read_time - self.loop_started
+                time.sleep(IMU_FIFO_READ_INTERVAL)
+            
             except Exception as e:
                 pass
-
+    
+    # 수집 통계 반환 (실제 샘플링 주기와 업데이트 스레드 CPU 사용량)
+    def get_stats(self) -> dict:
+        elapsed = self.loop_elapsed
+        return {
+            'mode': self.mode,
+            'samples': self.sample_count,
+            'reads': self.read_count,
+            'sample_rate_hz': self.sample_count / elapsed if elapsed > 0 else 0.0,
+            'fifo_overflows': self.fifo_overflows,
+            'mag_fusion': self.mag_fusion,
+            'mag_updates': self.mag_updates,
+            'cpu_time_s': self.cpu_time,
+            'cpu_percent': 100.0 * self.cpu_time / elapsed if elapsed > 0 else 0.0,
+        }
+    
+    # 현재 각도 반환 메서드 (실수, 도)
+    def get_angle(self) -> float:
+        with self.lock:
+            # 초기 오프셋 및 방향 보정 반영 후 360도 나머지 연산
+            return (self.current_angle + INITIAL_MAP_ANGLE_OFFSET + self.angle_correction) % 360
+    
+    # 자이로 적분 각도 반환 메서드 (초기 오프셋/방향 보정 미반영, 세션 기록용)
+    def get_raw_angle(self) -> float:
+        with self.lock:
+            return self.current_angle
+    
     # 현재 각도 반환 메서드
     def get_angle_int(self) -> int:
+        return int(self.get_angle())
+    
+    # 특정 시각(perf_counter)의 각도 반환 메서드 (기록 보간, 도)
+    def get_angle_at(self, timestamp: float) -> float:
+        return float(self.get_angles_at(np.array([timestamp]))[0])
+    
+    # 여러 시각의 각도 일괄 반환 메서드 (기록 보간, 도)
+    def get_angles_at(self, timestamps: np.ndarray) -> np.ndarray:
+        # 기록 범위 밖 시각은 가장 가까운 기록 샘플 값 (한 빔이 범위를 벗어나도 나머지 빔 보정은 유지)
+        angles = self.history.interpolate(timestamps)
+        with self.lock:
+            missing = np.isnan(angles)
+            if missing.any():
+                # 기록으로 구할 수 없는 시각만 (IMU 미연결 등 기록이 없을 때) 현재 각도 사용
+                angles = np.where(missing, self.current_angle, angles)
+            return (angles + INITIAL_MAP_ANGLE_OFFSET + self.angle_correction) % 360
+    
+    # LiDAR 한 바퀴 동안의 빔별 각도 반환 메서드
+    def get_beam_angles(self, t_start: float, t_end: float, count: int) -> np.ndarray:
+        # 측정값이 t_start ~ t_end 사이에 균등한 시간 간격으로 들어왔다고 가정
+        return self.get_angles_at(np.linspace(t_start, t_end, count + 1)[1:])
+    
+    # 방향 보정 적용 메서드 (스캔 매칭 결과를 자이로 드리프트 보정에 반영)
+    def apply_heading_correction(self, delta_deg: float):
         with self.lock:
-            # 초기 오프셋 반영 및 360도 나머지 연산
-            final_angle = (self.current_angle + INITIAL_MAP_ANGLE_OFFSET) % 360
-            return int(final_angle)
+            self.angle_correction = (self.angle_correction + delta_deg) % 360
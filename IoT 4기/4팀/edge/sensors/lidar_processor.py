@@ -1,11 +1,18 @@
 # LiDAR 데이터 처리 모듈
 import time
 import numpy as np
-from typing import List, Tuple
-from rplidar import RPLidar
+from typing import List, Optional, Tuple
+
+try:
+    from rplidar import RPLidar
+except ImportError:  # 오프라인(벤치마크/리플레이) 환경에서는 하드웨어 라이브러리 없이 사용
+    RPLidar = None
 
 from config import ANGLE_STEP, NOISE_ANGLE_RANGES
 
+# RPLiDAR 각도 분해능 (1/64도 단위로 보고됨)
+ANGLE_LUT_RESOLUTION = 64
+
 
 # LiDAR 처리 클래스
 class LidarProcessor:
@@ -17,6 +24,9 @@ class LidarProcessor:
     
     # LiDAR 연결
     def connect(self):
+        if RPLidar is None:
+            self.lidar = None
+            return
         try:
             self.lidar = RPLidar(self.port, baudrate=self.baudrate)
             # 재연결 시퀀스
@@ -37,6 +47,10 @@ class LidarProcessor:
             except:
                 pass
     
+    # 스캔 수신 시각 (IMUHandler 기록과 같은 시간 기준)
+    def scan_timestamp(self) -> float:
+        return time.perf_counter()
+    
     # LiDAR 스캔 이터레이터
     def iter_scans(self):
         if self.lidar:
@@ -78,3 +92,46 @@ class LidarProcessor:
                 result_scan[i] = 0.0
         
         return result_scan
+
+    
+    # 정적 메서드: 노이즈 각도 룩업 테이블 생성 (1/64도 단위)
+    @staticmethod
+    def build_noise_lut() -> np.ndarray:
+        lut_angles = np.arange(360 * ANGLE_LUT_RESOLUTION) / ANGLE_LUT_RESOLUTION
+        lut = np.zeros(len(lut_angles), dtype=bool)
+        for min_angle, max_angle in NOISE_ANGLE_RANGES:
+            lut |= (lut_angles >= min_angle) & (lut_angles <= max_angle)
+        return lut
+    
+    # 정적 메서드: 스캔 데이터 일괄 처리 (process_scan과 동일한 결과)
+    @staticmethod
+    def process_scan_array(scan_items, beam_offsets: Optional[np.ndarray] = None) -> np.ndarray:
+        # scan_items: [(quality, angle, distance), ...] 리스트 또는 (N, 3) 배열
+        # beam_offsets: 측정값별 각도 보정값 (도, 길이 N) - 스캔 중 카트 회전 보정용
+        # - 노이즈 판별: 1/64도 룩업 테이블 (RPLiDAR가 보고하는 각도 분해능과 동일)
+        #   노이즈 구간은 센서 기준 각도이므로 보정 전 각도로 판별
+        # - 구간 평균: np.bincount 가중치 합 / 개수
+        num_bins = 360 // ANGLE_STEP
+        scan = np.asarray(scan_items, dtype=np.float64).reshape(-1, 3)
+        raw_angle = scan[:, 1]
+        dist_mm = scan[:, 2]
+        
+        lut_idx = np.rint(raw_angle * ANGLE_LUT_RESOLUTION).astype(np.int64) % len(_NOISE_LUT)
+        keep = (dist_mm != 0) & ~_NOISE_LUT[lut_idx]
+        
+        # 각도 구간 인덱스 계산
+        angle = raw_angle[keep]
+        if beam_offsets is not None:
+            angle = (angle + np.asarray(beam_offsets, dtype=np.float64)[keep]) % 360
+        idx = (angle // ANGLE_STEP).astype(np.int64) % num_bins
+        sums = np.bincount(idx, weights=dist_mm[keep] / 1000.0, minlength=num_bins)  # mm to m
+        counts = np.bincount(idx, minlength=num_bins)
+        
+        # 평균 계산 (측정값 없는 구간은 0)
+        result_scan = np.zeros(num_bins)
+        np.divide(sums, counts, out=result_scan, where=counts > 0)
+        return result_scan
+
+
+# 노이즈 각도 룩업 테이블 (모듈 로드 시 1회 생성)
+_NOISE_LUT = LidarProcessor.build_noise_lut()
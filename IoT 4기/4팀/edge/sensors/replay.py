@@ -0,0 +1,148 @@
+# 세션 리플레이 모듈
+# 기록된 세션 파일로 LidarProcessor / IMUHandler를 대체하여 하드웨어 없이 시스템 구동
+import time
+import bisect
+import threading
+import numpy as np
+from typing import Optional
+
+from config import INITIAL_MAP_ANGLE_OFFSET
+from .lidar_processor import LidarProcessor
+from .session_log import SessionLog
+
+
+class ReplayClock:
+    """
+    리플레이 세션 시각 (LiDAR 리플레이가 갱신하고 IMU 리플레이가 참조)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session_time = 0.0
+    
+    def set(self, session_time: float):
+        with self._lock:
+            self._session_time = session_time
+    
+    def now(self) -> float:
+        with self._lock:
+            return self._session_time
+
+
+class ReplayLidarProcessor(LidarProcessor):
+    """
+    세션 파일의 스캔을 iter_scans로 재생
+    
+    realtime=True면 기록 시각 간격대로, False면 최대 속도로 재생
+    최대 속도 재생에서 ready가 주어지면 ready()가 True가 될 때까지 다음 스캔을 보류
+    (예: 처리 대기 큐가 비었을 때만 공급 → 스캔 손실 없이 처리 한계 속도 측정)
+    """
+    
+    def __init__(self, session: SessionLog, clock: ReplayClock, realtime: bool = True, ready=None):
+        super().__init__(port='replay')
+        self.session = session
+        self.clock = clock
+        self.realtime = realtime
+        self.ready = ready
+        self.running = False
+        # (재생 시점 perf_counter, 세션 시각) 기록 → 결과와 기록 시각 대응에 사용
+        self._yield_perf = []
+        self._yield_session = []
+    
+    def connect(self):
+        self.running = True
+    
+    # 스캔 시각 = 재생 중인 스캔의 세션 기록 시각 (ReplayIMUHandler와 같은 시간 기준)
+    def scan_timestamp(self) -> float:
+        return self.clock.now()
+    
+    def disconnect(self):
+        self.running = False
+    
+    def iter_scans(self):
+        start_perf = time.perf_counter()
+        start_session = self.session.scan_times[0] if len(self.session.scan_times) else 0.0
+        
+        for session_time, scan in zip(self.session.scan_times, self.session.scans):
+            if not self.running:
+                break
+            
+            if self.realtime:
+                delay = (session_time - start_session) - (time.perf_counter() - start_perf)
+                if delay > 0:
+                    time.sleep(delay)
+            elif self.ready is not None:
+                while self.running and not self.ready():
+                    time.sleep(0.0005)
+            
+            self.clock.set(session_time)
+            self._yield_perf.append(time.perf_counter())
+            self._yield_session.append(session_time)
+            yield scan
+    
+    # 재생 시점(perf_counter) → 해당 스캔의 세션 기록 시각
+    def session_time_at(self, perf_time: float) -> Optional[float]:
+        idx = bisect.bisect_right(self._yield_perf, perf_time) - 1
+        if idx < 0:
+            return None
+        return self._yield_session[idx]
+
+
+class ReplayIMUHandler:
+    """
+    세션 파일의 IMU 각도를 재생 (IMUHandler와 같은 인터페이스)
+    """
+    
+    def __init__(self, session: SessionLog, clock: ReplayClock):
+        self.session = session
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.angle_correction = 0.0
+    
+    def start(self):
+        pass
+    
+    def stop(self):
+        pass
+    
+    def get_angle(self) -> float:
+        angle = self.session.imu_angle_at(self.clock.now())
+        with self.lock:
+            return (angle + INITIAL_MAP_ANGLE_OFFSET + self.angle_correction) % 360
+    
+    def get_angle_int(self) -> int:
+        return int(self.get_angle())
+    
+    # 세션 시각 기준 각도 조회 (IMUHandler.get_angle_at과 같은 인터페이스)
+    def get_angle_at(self, timestamp: float) -> float:
+        return float(self.get_angles_at(np.array([timestamp]))[0])
+    
+    def get_angles_at(self, timestamps: np.ndarray) -> np.ndarray:
+        if len(self.session.imu_times) == 0:
+            angles = np.zeros(np.shape(timestamps))
+        else:
+            angles = np.interp(timestamps, self.session.imu_times, self.session.imu_unwrapped)
+        with self.lock:
+            return (angles + INITIAL_MAP_ANGLE_OFFSET + self.angle_correction) % 360
+    
+    def get_beam_angles(self, t_start: float, t_end: float, count: int) -> np.ndarray:
+        return self.get_angles_at(np.linspace(t_start, t_end, count + 1)[1:])
+    
+    def apply_heading_correction(self, delta_deg: float):
+        with self.lock:
+            self.angle_correction = (self.angle_correction + delta_deg) % 360
+    
+    # 수집 통계 (세션에 기록된 IMU 샘플 기준)
+    def get_stats(self) -> dict:
+        times = self.session.imu_times
+        duration = times[-1] - times[0] if len(times) > 1 else 0.0
+        return {
+            'mode': 'replay',
+            'samples': len(times),
+            'reads': len(times),
+            'sample_rate_hz': (len(times) - 1) / duration if duration > 0 else 0.0,
+            'fifo_overflows': 0,
+            'mag_updates': 0,
+            'cpu_time_s': 0.0,
+            'cpu_percent': 0.0,
+        }
@@ -0,0 +1,127 @@
+# LiDAR/IMU 세션 기록 파일 모듈
+# iter_scans 원본 출력과 IMU 각도를 타임스탬프와 함께 압축 바이너리로 저장/로드
+#
+# 파일 형식 (리틀 엔디언):
+#   헤더   : b'CLRS' + uint16 버전 + uint16 예약
+#   레코드 : 1바이트 종류 + 본문
+#     'S' 스캔 : float64 시각 + uint16 측정값 수 N + N × (uint8 quality, float32 angle, float32 distance)
+#     'I' IMU  : float64 시각 + float32 자이로 적분 각도(도, INITIAL_MAP_ANGLE_OFFSET/방향 보정 적용 전)
+#   시각은 기록 시작 시점 기준 초 (time.perf_counter 차이)
+import time
+import struct
+import threading
+import numpy as np
+from typing import List, Tuple
+
+SESSION_MAGIC = b'CLRS'
+SESSION_VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_SCAN_HEAD = struct.Struct('<dH')
+_IMU_BODY = struct.Struct('<df')
+
+# 스캔 측정값 1개 (quality, angle, distance)
+MEASUREMENT_DTYPE = np.dtype([('quality', 'u1'), ('angle', '<f4'), ('distance', '<f4')])
+
+
+class SessionRecorder:
+    """
+    LiDAR 스캔과 IMU 각도를 세션 파일로 기록 (스레드 안전)
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(SESSION_MAGIC, SESSION_VERSION, 0))
+        self._start = time.perf_counter()
+        self.scan_count = 0
+        self.imu_count = 0
+    
+    # 기록 시작 기준 경과 시간
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+    
+    # 스캔 1회 기록 (iter_scans가 반환한 리스트 그대로)
+    def record_scan(self, scan_items):
+        timestamp = self.elapsed()
+        measurements = np.array([tuple(m) for m in scan_items], dtype=MEASUREMENT_DTYPE)
+        
+        with self._lock:
+            self._file.write(b'S')
+            self._file.write(_SCAN_HEAD.pack(timestamp, len(measurements)))
+            self._file.write(measurements.tobytes())
+            self.scan_count += 1
+    
+    # IMU 각도 1회 기록
+    def record_imu(self, angle: float):
+        timestamp = self.elapsed()
+        with self._lock:
+            self._file.write(b'I')
+            self._file.write(_IMU_BODY.pack(timestamp, angle))
+            self.imu_count += 1
+    
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class SessionLog:
+    """
+    기록된 세션 파일 로드
+    
+    Attributes:
+        scan_times: 스캔 시각 배열 (초)
+        scans: 스캔별 (quality, angle, distance) 리스트
+        imu_times: IMU 샘플 시각 배열 (초)
+        imu_angles: IMU 각도 배열 (도, 0~360)
+    """
+    
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            data = f.read()
+        
+        magic, version, _ = _HEADER.unpack_from(data, 0)
+        if magic != SESSION_MAGIC or version != SESSION_VERSION:
+            raise ValueError(f"지원하지 않는 세션 파일: {path}")
+        
+        scan_times: List[float] = []
+        scans: List[List[Tuple[int, float, float]]] = []
+        imu_samples: List[Tuple[float, float]] = []
+        
+        offset = _HEADER.size
+        while offset < len(data):
+            kind = data[offset:offset + 1]
+            offset += 1
+            
+            if kind == b'S':
+                timestamp, count = _SCAN_HEAD.unpack_from(data, offset)
+                offset += _SCAN_HEAD.size
+                measurements = np.frombuffer(data, dtype=MEASUREMENT_DTYPE, count=count, offset=offset)
+                offset += count * MEASUREMENT_DTYPE.itemsize
+                scan_times.append(timestamp)
+                scans.append(measurements.tolist())
+            elif kind == b'I':
+                imu_samples.append(_IMU_BODY.unpack_from(data, offset))
+                offset += _IMU_BODY.size
+            else:
+                raise ValueError(f"손상된 세션 파일: {path} (offset {offset - 1})")
+        
+        self.scan_times = np.array(scan_times)
+        self.scans = scans
+        imu = np.array(imu_samples, dtype=np.float64).reshape(-1, 2)
+        self.imu_times = imu[:, 0]
+        self.imu_angles = imu[:, 1]
+        self.imu_unwrapped = np.degrees(np.unwrap(np.radians(self.imu_angles)))
+    
+    # 특정 시각의 IMU 각도 (선형 보간, 0/360 경계 처리)
+    def imu_angle_at(self, timestamp: float) -> float:
+        if len(self.imu_times) == 0:
+            return 0.0
+        return float(np.interp(timestamp, self.imu_times, self.imu_unwrapped) % 360)
+    
+    @property
+    def duration(self) -> float:
+        ends = [t[-1] for t in (self.scan_times, self.imu_times) if len(t)]
+        return max(ends) if ends else 0.0
@@ -1,4 +1,9 @@
 # 유틸리티 모듈
 from .helpers import calculate_confidence_score, format_coordinates, is_confident, print_status
+from .pipeline import LatestQueue, StageLatency, LATENCY_BUCKETS_MS
+from .ring_buffer import TimeSeriesBuffer
+from .telemetry import PipelineCounters, TelemetryReporter
 
-__all__ = ['calculate_confidence_score', 'format_coordinates', 'is_confident', 'print_status']
+__all__ = ['calculate_confidence_score', 'format_coordinates', 'is_confident', 'print_status',
+           'LatestQueue', 'StageLatency', 'LATENCY_BUCKETS_MS', 'TimeSeriesBuffer',
+           'PipelineCounters', 'TelemetryReporter']
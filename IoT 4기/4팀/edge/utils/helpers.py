@@ -1,4 +1,5 @@
 # 유틸리티 헬퍼 함수 모듈
+import time
 from typing import Tuple
 
 from config import CONFIDENCE_THRESHOLD
@@ -46,4 +47,21 @@ def format_coordinates(grid_x: int, grid_y: int, resolution: float = 0.1) -> Tup
     """
     x_meter = float(f"{grid_x * resolution + resolution / 2:.2f}")
     y_meter = float(f"{grid_y * resolution + resolution / 2:.2f}")
-    return x_meter, y_meter
\ No newline at end of file
+    return x_meter, y_meter
+
+
+def print_status(timestamp: float, x: float, y: float, angle: int, confidence: int, warning: bool = False):
+    """
+    카트 상태를 포맷팅하여 출력
+    
+    Args:
+        timestamp: 측정 시각 (time.time())
+        x: X 좌표 (미터)
+        y: Y 좌표 (미터)
+        angle: 카트 각도 (도)
+        confidence: 신뢰도 점수 (0-10)
+        warning: 도난 의심 여부
+    """
+    time_str = time.strftime('%H:%M:%S', time.localtime(timestamp))
+    status = "도난 의심" if warning else "정상"
+    print(f"[{time_str}] X: {x:.2f}m  Y: {y:.2f}m  각도: {angle}°  신뢰도: {confidence}/10  ({status})")
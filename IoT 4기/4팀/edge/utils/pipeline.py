@@ -0,0 +1,126 @@
+# 스레드 파이프라인 유틸리티 모듈
+# 단계 간 최신 데이터 전달 큐 및 단계별 지연 시간 측정
+import time
+import threading
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+
+# 지연 시간 히스토그램 구간 경계 (밀리초, 마지막 구간은 최대 경계 초과)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class LatestQueue:
+    """
+    최신 데이터 우선 큐 (스레드 안전)
+    
+    가득 찬 상태에서 put하면 가장 오래된 항목을 버리므로
+    생산자는 절대 막히지 않고, 소비자는 항상 최신 데이터를 받음
+    """
+    
+    def __init__(self, maxsize: int = 1):
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+        self.put_count = 0
+        self.dropped = 0
+    
+    def put(self, item: Any):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.put_count += 1
+            self._cond.notify()
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        항목 꺼내기
+        
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무한 대기)
+            
+        Returns:
+            Optional[Any]: 가장 오래된 항목 (시간 초과 시 None)
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._items) > 0, timeout):
+                return None
+            return self._items.popleft()
+    
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+class StageLatency:
+    """
+    파이프라인 단계별 지연 시간 통계
+    
+    누적 횟수/평균/최대값과 최근 window개 샘플의 백분위수를 제공
+    """
+    
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+    
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.last = seconds
+            if seconds > self.max:
+                self.max = seconds
+    
+    @contextmanager
+    def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - start)
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        현재 통계 반환 (밀리초 단위)
+        
+        Returns:
+            Dict[str, float]: count, avg_ms, last_ms, max_ms, p50_ms, p95_ms, p99_ms
+        """
+        with self._lock:
+            samples = np.array(self._samples)
+            count, total, last, peak = self.count, self.total, self.last, self.max
+        
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]) if len(samples) else (0.0, 0.0, 0.0)
+        return {
+            'count': count,
+            'avg_ms': total / count * 1e3 if count else 0.0,
+            'last_ms': last * 1e3,
+            'max_ms': peak * 1e3,
+            'p50_ms': float(p50) * 1e3,
+            'p95_ms': float(p95) * 1e3,
+            'p99_ms': float(p99) * 1e3,
+        }
+    
+    def histogram(self, bounds_ms: Sequence[float] = LATENCY_BUCKETS_MS) -> List[int]:
+        """
+        최근 window개 샘플의 지연 시간 분포
+        
+        Args:
+            bounds_ms: 구간 경계 (밀리초, 오름차순)
+            
+        Returns:
+            List[int]: 구간별 샘플 수 (len(bounds_ms) + 1개, i번째 = bounds_ms[i-1] 이상 bounds_ms[i] 미만)
+        """
+        with self._lock:
+            samples = np.array(self._samples)
+        
+        buckets = np.searchsorted(np.asarray(bounds_ms, dtype=np.float64), samples * 1e3, side='right')
+        return np.bincount(buckets, minlength=len(bounds_ms) + 1).tolist()
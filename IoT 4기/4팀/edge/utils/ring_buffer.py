@@ -0,0 +1,79 @@
+# 시계열 링 버퍼 모듈
+# 고정 크기 (시각, 값) 샘플 저장 및 임의 시각 선형 보간
+import threading
+import numpy as np
+
+
+class TimeSeriesBuffer:
+    """
+    고정 크기 시계열 링 버퍼 (스레드 안전)
+    
+    가장 오래된 샘플부터 덮어쓰며, 시각은 단조 증가한다고 가정
+    값은 보간이 가능하도록 연속값(예: 360도로 감지 않은 누적 각도)으로 저장
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = np.zeros(capacity)
+        self._values = np.zeros(capacity)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+    
+    def append(self, timestamp: float, value: float):
+        with self._lock:
+            self._times[self._next] = timestamp
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+    
+    def extend(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        여러 샘플 일괄 추가 (시각 순서대로)
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)[-self.capacity:]
+        values = np.asarray(values, dtype=np.float64)[-self.capacity:]
+        count = len(timestamps)
+        if count == 0:
+            return
+        
+        with self._lock:
+            idx = (self._next + np.arange(count)) % self.capacity
+            self._times[idx] = timestamps
+            self._values[idx] = values
+            self._next = (self._next + count) % self.capacity
+            self._count = min(self._count + count, self.capacity)
+    
+    def snapshot(self):
+        """
+        저장된 샘플을 시각 순서대로 반환
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (시각 배열, 값 배열)
+        """
+        with self._lock:
+            start = (self._next - self._count) % self.capacity
+            idx = (start + np.arange(self._count)) % self.capacity
+            return self._times[idx], self._values[idx]
+    
+    def interpolate(self, timestamps) -> np.ndarray:
+        """
+        임의 시각의 값 선형 보간 (범위 밖은 가장 가까운 끝 값, NaN 샘플은 건너뜀)
+        
+        Args:
+            timestamps: 조회할 시각 (스칼라 또는 배열)
+            
+        Returns:
+            np.ndarray: 보간된 값 (유효한 샘플이 없으면 NaN)
+        """
+        times, values = self.snapshot()
+        finite = np.isfinite(values)
+        if not finite.all():
+            times, values = times[finite], values[finite]
+        if len(times) == 0:
+            return np.full(np.shape(timestamps), np.nan)
+        return np.interp(timestamps, times, values)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
@@ -0,0 +1,148 @@
+# 파이프라인 텔레메트리 모듈
+# 단계별 카운터/오류 집계 및 주기적 통계 보고 (서버 이벤트 + 로컬 통계 파일)
+import os
+import json
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class PipelineCounters:
+    """
+    파이프라인 카운터 및 단계별 오류 집계 (스레드 안전)
+    
+    - count(name): 스캔 수신/처리/전송 등 이벤트 횟수 누적
+    - record_error(stage, e): 단계별 예외 횟수와 마지막 예외 메시지 기록
+      (예외를 그대로 무시하지 않고 어느 단계에서 몇 번 실패했는지 남김)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._errors = {}
+        self._last_errors = {}
+        self.started = time.time()
+    
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+    
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counts.get(name, 0)
+    
+    def record_error(self, stage: str, error: BaseException):
+        with self._lock:
+            self._errors[stage] = self._errors.get(stage, 0) + 1
+            self._last_errors[stage] = f'{type(error).__name__}: {error}'
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 집계 반환
+        
+        Returns:
+            Dict[str, Any]: uptime_s, counts {이름: 횟수}, errors {단계: 횟수}, last_errors {단계: 메시지}
+        """
+        with self._lock:
+            return {
+                'uptime_s': time.time() - self.started,
+                'counts': dict(self._counts),
+                'errors': dict(self._errors),
+                'last_errors': dict(self._last_errors),
+            }
+
+
+class TelemetryReporter:
+    """
+    주기적 통계 보고 스레드
+    
+    interval초마다 collect()의 전체 통계를 로컬 파일에 기록하고 (임시 파일 작성 후 교체 → 읽는 쪽은 항상 완전한 JSON),
+    압축한 요약(compact)을 Socket.IO 이벤트로 전송
+    """
+    
+    def __init__(self, collect: Callable[[], Dict[str, Any]], interval: float,
+                 path: Optional[str] = None, socket_client=None, event_name: str = 'edge_stats'):
+        self.collect = collect
+        self.interval = interval
+        self.path = path
+        self.socket_client = socket_client
+        self.event_name = event_name
+        self.reports = 0
+        self.send_failures = 0
+        self.write_failures = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._report_loop, name='telemetry', daemon=True)
+        self._thread.start()
+    
+    # 보고 스레드 정지 (종료 직전 통계를 한 번 더 보고)
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+    
+    def _report_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.report()
+        self.report()
+    
+    # 통계 1회 보고
+    def report(self):
+        try:
+            stats = self.collect()
+        except Exception as e:
+            self.write_failures += 1
+            return
+        
+        self.reports += 1
+        stats['reports'] = self.reports
+        
+        if self.path:
+            try:
+                self.write_file(self.path, stats)
+            except Exception as e:
+                self.write_failures += 1
+        
+        if self.socket_client is not None and self.socket_client.is_connected:
+            if not self.socket_client.send_event(self.event_name, self.compact(stats)):
+                self.send_failures += 1
+    
+    # 정적 메서드: 통계 파일 기록 (같은 디렉터리의 임시 파일 작성 후 원자적 교체)
+    @staticmethod
+    def write_file(path: str, stats: Dict[str, Any]):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(stats, f, indent=2, default=float)
+        os.replace(tmp_path, path)
+    
+    # 정적 메서드: 서버 전송용 요약
+    @staticmethod
+    def compact(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        전체 통계를 전송용 요약으로 변환
+        
+        Args:
+            stats: CartLocalizationSystem.get_pipeline_stats() 결과
+        
+        Returns:
+            Dict[str, Any]: up(가동 시간 초), n(카운터), err(단계별 오류 수),
+                            lat({단계: [p50, p95, max] ms, 0.1ms 단위}), hist({단계: 구간별 샘플 수})
+        """
+        latency = stats.get('latency', {})
+        return {
+            'up': round(stats.get('uptime_s', 0.0), 1),
+            'n': stats.get('counts', {}),
+            'err': stats.get('errors', {}),
+            'lat': {
+                stage: [round(s['p50_ms'], 1), round(s['p95_ms'], 1), round(s['max_ms'], 1)]
+                for stage, s in latency.items()
+            },
+            'hist': stats.get('histogram', {}),
+        }
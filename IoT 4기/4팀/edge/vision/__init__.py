@@ -0,0 +1,9 @@
+# 카메라 영상 처리 모듈
+from .change_detector import ChangeDetector, crop_roi, roi_image_size
+from .tracker import IoUTracker, Track
+from .frame_source import (
+    PicameraSource, VideoFrameSource, ImageDirFrameSource, open_frame_source
+)
+
+__all__ = ['ChangeDetector', 'crop_roi', 'roi_image_size', 'IoUTracker', 'Track',
+           'PicameraSource', 'VideoFrameSource', 'ImageDirFrameSource', 'open_frame_source']
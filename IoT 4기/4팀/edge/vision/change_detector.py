@@ -0,0 +1,151 @@
+# 카메라 변화 감지 모듈
+# 축소한 회색조 프레임으로 이전 프레임 대비 변화 여부와 변화 영역을 계산하여 YOLO 실행 여부/입력 영역 결정
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+# (x, y, w, h) 원본 프레임 픽셀 좌표
+BBox = Tuple[int, int, int, int]
+
+
+class ChangeDetector:
+    """
+    축소 회색조 프레임 차분 기반 변화 감지
+    
+    - 프레임을 1/downscale 크기로 줄인 뒤 회색조로 변환 (원본 크기 색 변환/차분 없이 픽셀 수 1/downscale²만 처리)
+      INTER_LINEAR 정수배 축소는 출력 픽셀마다 원본 2×2 평균이므로 센서 잡음도 일부 감소
+      (INTER_AREA는 3채널 원본 전체를 읽어 640x480 기준 약 7배 느림)
+    - 축소/회색조/차분/이진화 버퍼는 미리 할당하여 프레임마다 재사용
+    - 기준 프레임은 회색조 축소 버퍼로 보관 (매 프레임 다시 변환하지 않음), 감지 후 현재 프레임과 버퍼 교체
+    - 변화 픽셀 수는 원본 해상도 기준으로 환산하여 min_area와 비교 (기존 DIFF_AREA_MIN과 같은 단위)
+    """
+    
+    def __init__(self, frame_size: Tuple[int, int] = (640, 480), downscale: int = 4,
+                 diff_threshold: int = 20, min_area: int = 1000, margin: int = 32,
+                 color_conversion: int = cv2.COLOR_RGB2GRAY):
+        """
+        Args:
+            frame_size: 원본 프레임 크기 (width, height)
+            downscale: 축소 배율 (가로/세로 각각)
+            diff_threshold: 변화로 볼 회색조 밝기 차이
+            min_area: 변화로 볼 최소 변화 픽셀 수 (원본 해상도 기준)
+            margin: 변화 영역 경계 상자 여백 (원본 픽셀)
+            color_conversion: 회색조 변환 코드 (카메라 프레임 채널 순서)
+        """
+        self.frame_width, self.frame_height = frame_size
+        self.downscale = downscale
+        self.diff_threshold = diff_threshold
+        self.min_area = min_area
+        self.margin = margin
+        self.color_conversion = color_conversion
+        
+        small_w = max(1, self.frame_width // downscale)
+        small_h = max(1, self.frame_height // downscale)
+        self.small_size = (small_w, small_h)
+        
+        # 재사용 버퍼
+        self._small = np.empty((small_h, small_w, 3), dtype=np.uint8)
+        self._gray = np.empty((small_h, small_w), dtype=np.uint8)
+        self._baseline = np.empty((small_h, small_w), dtype=np.uint8)
+        self._diff = np.empty((small_h, small_w), dtype=np.uint8)
+        self._mask = np.empty((small_h, small_w), dtype=np.uint8)
+        self._open_mask = np.empty((small_h, small_w), dtype=np.uint8)
+        self._kernel = np.ones((3, 3), dtype=np.uint8)
+        self.has_baseline = False
+        
+        # 마지막 감지 결과 (원본 해상도 기준 변화 픽셀 수)
+        self.changed_pixels = 0
+    
+    # 기준 프레임 설정 (변화 없음으로 간주)
+    def reset(self, frame: np.ndarray):
+        self._to_small_gray(frame)
+        self._gray, self._baseline = self._baseline, self._gray
+        self.has_baseline = True
+        self.changed_pixels = 0
+    
+    def detect(self, frame: np.ndarray) -> Optional[BBox]:
+        """
+        이전 프레임 대비 변화 영역 계산 (현재 프레임이 다음 비교의 기준이 됨)
+        
+        Args:
+            frame: 원본 컬러 프레임 (frame_size 크기, 3채널 uint8)
+        
+        Returns:
+            Optional[BBox]: 변화 영역 경계 상자 (원본 좌표, 여백 포함), 변화가 min_area 미만이면 None
+        """
+        if not self.has_baseline:
+            self.reset(frame)
+            return None
+        
+        self._to_small_gray(frame)
+        cv2.absdiff(self._gray, self._baseline, dst=self._diff)
+        cv2.threshold(self._diff, self.diff_threshold, 255, cv2.THRESH_BINARY, dst=self._mask)
+        
+        # 현재 프레임을 기준 프레임으로 (버퍼 교체, 복사 없음)
+        self._gray, self._baseline = self._baseline, self._gray
+        
+        area_scale = self.downscale * self.downscale
+        self.changed_pixels = cv2.countNonZero(self._mask) * area_scale
+        if self.changed_pixels < self.min_area:
+            return None
+        
+        # 흩어진 잡음 픽셀이 경계 상자를 넓히지 않도록 열림 연산 후 경계 상자 (모두 지워지면 원래 마스크 사용)
+        cv2.morphologyEx(self._mask, cv2.MORPH_OPEN, self._kernel, dst=self._open_mask)
+        mask = self._open_mask if cv2.countNonZero(self._open_mask) > 0 else self._mask
+        x, y, w, h = cv2.boundingRect(mask)
+        
+        return self._to_frame_bbox(x, y, w, h)
+    
+    # 원본 프레임 → 축소 회색조 버퍼 (self._gray)
+    def _to_small_gray(self, frame: np.ndarray):
+        cv2.resize(frame, self.small_size, dst=self._small, interpolation=cv2.INTER_LINEAR)
+        cv2.cvtColor(self._small, self.color_conversion, dst=self._gray)
+    
+    # 축소 좌표 경계 상자 → 원본 좌표 (여백 포함, 프레임 범위로 제한)
+    def _to_frame_bbox(self, x: int, y: int, w: int, h: int) -> BBox:
+        x0 = max(0, x * self.downscale - self.margin)
+        y0 = max(0, y * self.downscale - self.margin)
+        x1 = min(self.frame_width, (x + w) * self.downscale + self.margin)
+        y1 = min(self.frame_height, (y + h) * self.downscale + self.margin)
+        return x0, y0, x1 - x0, y1 - y0
+
+
+def crop_roi(frame: np.ndarray, bbox: BBox, min_size: int = 160, align: int = 32) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    변화 영역을 YOLO 입력용 ROI로 잘라내기
+    
+    경계 상자를 중심 기준으로 최소 min_size까지 넓히고 align의 배수로 맞춤
+    (YOLO 레터박스 패딩 최소화), 프레임 밖으로 나가면 안쪽으로 이동
+    
+    Args:
+        frame: 원본 프레임
+        bbox: 변화 영역 (x, y, w, h)
+        min_size: ROI 최소 가로/세로 (픽셀)
+        align: ROI 가로/세로 배수 (YOLO stride)
+    
+    Returns:
+        Tuple[np.ndarray, Tuple[int, int]]: (ROI 뷰 - 복사 없음, ROI 왼쪽 위의 원본 좌표 (x, y))
+    """
+    frame_h, frame_w = frame.shape[:2]
+    x, y, w, h = bbox
+    
+    def span(start: int, length: int, limit: int) -> Tuple[int, int]:
+        size = max(length, min_size)
+        size = min(limit, -(-size // align) * align)
+        lo = start + length // 2 - size // 2
+        lo = min(max(0, lo), limit - size)
+        return lo, lo + size
+    
+    x0, x1 = span(x, w, frame_w)
+    y0, y1 = span(y, h, frame_h)
+    return frame[y0:y1, x0:x1], (x0, y0)
+
+
+def roi_image_size(roi: np.ndarray, max_size: int, align: int = 32) -> int:
+    """
+    ROI 크기에 맞춘 YOLO 입력 크기 (긴 변을 align 배수로 올림, 최대 max_size)
+    
+    작은 ROI를 전체 프레임 크기(max_size)로 확대하여 추론하지 않도록 입력 크기를 줄임
+    """
+    longest = max(roi.shape[:2])
+    return int(min(max_size, -(-longest // align) * align))
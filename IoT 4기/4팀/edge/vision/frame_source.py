@@ -0,0 +1,176 @@
+# 카메라 프레임 소스 모듈
+# Picamera2 실시간 캡처와 녹화 영상/이미지 폴더 리플레이를 같은 capture_array() 인터페이스로 제공
+import os
+import time
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+try:
+    from picamera2 import Picamera2
+except ImportError:  # 오프라인(벤치마크/리플레이) 환경에서는 하드웨어 라이브러리 없이 사용
+    Picamera2 = None
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class PicameraSource:
+    """
+    Picamera2 실시간 캡처 (camera.py 기본 소스)
+    
+    capture_array()는 RGB 순서 프레임 반환 (Picamera2 'BGR888' 포맷의 메모리 배열 순서)
+    """
+    
+    def __init__(self, frame_size: Tuple[int, int] = (640, 480)):
+        if Picamera2 is None:
+            raise RuntimeError("picamera2가 설치되어 있지 않습니다 (리플레이는 영상/이미지 폴더 경로 사용)")
+        self.frame_size = frame_size
+        self.picam2 = Picamera2()
+        config = self.picam2.create_preview_configuration(main={"format": "BGR888", "size": frame_size})
+        self.picam2.configure(config)
+    
+    def start(self):
+        self.picam2.start()
+    
+    def stop(self):
+        self.picam2.stop()
+    
+    def capture_array(self) -> np.ndarray:
+        return self.picam2.capture_array()
+
+
+class ReplayFrameSource:
+    """
+    녹화 프레임 리플레이 공통 처리 (하위 클래스는 _grab/_retrieve만 구현)
+    
+    - capture_array(): Picamera2와 같은 RGB 순서, frame_size 크기 프레임 반환, 끝나면 None
+    - realtime=True: 기록 fps 간격대로 재생, 처리가 늦으면 지난 프레임은 건너뜀
+      (실제 카메라처럼 호출 시점의 최신 프레임 → 캡처 루프가 느려도 영상 시간은 그대로 흐름)
+    - realtime=False: 모든 프레임을 대기 없이 순서대로 반환 (처리 한계 속도 측정)
+    """
+    
+    def __init__(self, fps: float, frame_size: Tuple[int, int] = (640, 480), realtime: bool = True):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.frame_size = frame_size
+        self.realtime = realtime
+        
+        # 재생 통계
+        self.frames_read = 0
+        self.frames_skipped = 0
+        self.position = 0
+        self._start = None
+    
+    def start(self):
+        self._start = time.perf_counter()
+    
+    def stop(self):
+        pass
+    
+    # 재생한 영상 시간 (초)
+    def media_time(self) -> float:
+        return self.position / self.fps
+    
+    def capture_array(self) -> Optional[np.ndarray]:
+        if self._start is None:
+            self.start()
+        
+        if self.realtime:
+            # 다음 프레임 시각까지 대기, 이미 지난 프레임은 디코딩 없이 건너뜀
+            target = self.position / self.fps - (time.perf_counter() - self._start)
+            if target > 0:
+                time.sleep(target)
+            due = int((time.perf_counter() - self._start) * self.fps)
+            while self.position < due:
+                if not self._grab():
+                    return None
+                self.position += 1
+                self.frames_skipped += 1
+        
+        frame_bgr = self._retrieve()
+        if frame_bgr is None:
+            return None
+        self.position += 1
+        self.frames_read += 1
+        
+        if (frame_bgr.shape[1], frame_bgr.shape[0]) != tuple(self.frame_size):
+            frame_bgr = cv2.resize(frame_bgr, self.frame_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    
+    # 프레임 하나 건너뛰기 (성공 여부)
+    def _grab(self) -> bool:
+        raise NotImplementedError
+    
+    # 다음 프레임 BGR 반환 (끝이면 None)
+    def _retrieve(self) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+
+class VideoFrameSource(ReplayFrameSource):
+    """
+    녹화 영상 파일 리플레이 (cv2.VideoCapture, fps는 파일 메타데이터 사용)
+    """
+    
+    def __init__(self, path: str, frame_size: Tuple[int, int] = (640, 480), realtime: bool = True):
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        if not self.capture.isOpened():
+            raise FileNotFoundError(f"영상 파일을 열 수 없습니다: {path}")
+        super().__init__(self.capture.get(cv2.CAP_PROP_FPS), frame_size, realtime)
+        self.frame_count = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    def stop(self):
+        self.capture.release()
+    
+    def _grab(self) -> bool:
+        return self.capture.grab()
+    
+    def _retrieve(self) -> Optional[np.ndarray]:
+        ok, frame = self.capture.read()
+        return frame if ok else None
+
+
+class ImageDirFrameSource(ReplayFrameSource):
+    """
+    이미지 폴더 리플레이 (파일 이름 순서, 프레임 간격은 fps 인자)
+    """
+    
+    def __init__(self, path: str, fps: float = 30.0, frame_size: Tuple[int, int] = (640, 480),
+                 realtime: bool = True):
+        self.path = path
+        self.files: List[str] = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            raise FileNotFoundError(f"이미지 파일이 없습니다: {path}")
+        super().__init__(fps, frame_size, realtime)
+        self.frame_count = len(self.files)
+    
+    def _grab(self) -> bool:
+        return self.position < len(self.files)
+    
+    def _retrieve(self) -> Optional[np.ndarray]:
+        if self.position >= len(self.files):
+            return None
+        return cv2.imread(self.files[self.position], cv2.IMREAD_COLOR)
+
+
+def open_frame_source(path: Optional[str] = None, frame_size: Tuple[int, int] = (640, 480),
+                      realtime: bool = True, fps: float = 30.0):
+    """
+    경로에 맞는 프레임 소스 생성
+    
+    Args:
+        path: None이면 Picamera2, 폴더면 이미지 폴더, 그 외는 영상 파일
+        frame_size: 출력 프레임 크기 (width, height)
+        realtime: 리플레이를 기록 속도대로 재생할지 여부
+        fps: 이미지 폴더의 프레임 속도
+    
+    Returns:
+        PicameraSource | VideoFrameSource | ImageDirFrameSource
+    """
+    if path is None:
+        return PicameraSource(frame_size)
+    if os.path.isdir(path):
+        return ImageDirFrameSource(path, fps, frame_size, realtime)
+    return VideoFrameSource(path, frame_size, realtime)
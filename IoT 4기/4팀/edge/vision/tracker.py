@@ -0,0 +1,179 @@
+# 물품 추적 모듈
+# YOLO 검출 상자를 IoU로 이전 트랙과 연결하여 물품별 진입/이탈 이벤트 생성 (클래스별 1회 전송 대신 물품 개수 단위 집계)
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+# (x1, y1, x2, y2) 원본 프레임 픽셀 좌표
+Box = Tuple[float, float, float, float]
+# (클래스 이름, 신뢰도, 상자)
+Detection = Tuple[str, float, Box]
+
+
+class Track:
+    """
+    추적 중인 물품 하나
+    
+    - hits: 연결된 검출 횟수, misses: 추론 영역 안에 있었는데 연결되지 않은 연속 횟수
+    - confirmed: 진입 이벤트를 보낸 트랙 (이탈 시에만 제거 이벤트 전송)
+    """
+    
+    def __init__(self, track_id: int, class_name: str, conf: float, box: Box):
+        self.track_id = track_id
+        self.class_name = class_name
+        self.conf = conf
+        self.box = box
+        self.hits = 1
+        self.misses = 0
+        self.confirmed = False
+    
+    def __repr__(self):
+        return f'Track({self.track_id}, {self.class_name}, hits={self.hits}, misses={self.misses})'
+
+
+class IoUTracker:
+    """
+    IoU 기반 경량 다중 물체 추적 (같은 클래스끼리 IoU가 큰 쌍부터 탐욕적 연결)
+    
+    - 트랙은 시간이 아니라 추론 결과로만 갱신: YOLO가 드물게 실행되어도 트랙은 그대로 유지
+      (장바구니 안 물품은 움직이지 않으므로 변화가 없으면 추론도 이탈 판정도 없음)
+    - 이탈 판정은 이번 추론 영역(ROI)이 트랙 상자를 min_coverage 이상 덮을 때만 누적
+      → ROI 밖의 물품은 검출되지 않아도 misses가 늘지 않음
+    - min_hits번 연결되면 진입(confirmed), max_misses번 연속 누락되면 이탈
+      (손에 잠깐 가려져 한 번 누락된 물품은 유지, 진입/이탈 이벤트는 항상 쌍으로 발생)
+    - 미확정 트랙은 pending_box()로 영역을 알려 호출 측이 변화가 없어도 다시 추론하게 함
+      (한 번의 오검출은 다음 추론에서 누락되어 진입 이벤트 없이 제거)
+    """
+    
+    def __init__(self, iou_threshold: float = 0.3, min_hits: int = 2,
+                 max_misses: int = 2, min_coverage: float = 0.5):
+        """
+        Args:
+            iou_threshold: 같은 물품으로 연결할 최소 IoU
+            min_hits: 진입으로 확정할 연결 횟수
+            max_misses: 이탈로 판정할 연속 누락 횟수
+            min_coverage: 누락으로 셀 추론 영역의 트랙 상자 포함 비율
+        """
+        self.iou_threshold = iou_threshold
+        self.min_hits = min_hits
+        self.max_misses = max_misses
+        self.min_coverage = min_coverage
+        self.tracks: List[Track] = []
+        self._next_id = 1
+    
+    def update(self, detections: Sequence[Detection],
+               region: Optional[Box] = None) -> Tuple[List[Track], List[Track]]:
+        """
+        추론 1회 결과로 트랙 갱신
+        
+        Args:
+            detections: 이번 추론의 검출 목록 (원본 프레임 좌표)
+            region: 이번 추론 영역 (x1, y1, x2, y2), None이면 전체 프레임
+        
+        Returns:
+            Tuple[List[Track], List[Track]]: (이번에 진입 확정된 트랙, 이번에 이탈한 확정 트랙)
+        """
+        matches, unmatched_tracks, unmatched_detections = self._match(detections)
+        entered, exited = [], []
+        
+        for t, d in matches:
+            track = self.tracks[t]
+            track.class_name, track.conf, track.box = detections[d]
+            track.hits += 1
+            track.misses = 0
+            if not track.confirmed and track.hits >= self.min_hits:
+                track.confirmed = True
+                entered.append(track)
+        
+        # 추론 영역 안에서 검출되지 않은 트랙만 누락으로 셈
+        removed = set()
+        for t in unmatched_tracks:
+            track = self.tracks[t]
+            if region is not None and self._coverage(track.box, region) < self.min_coverage:
+                continue
+            track.misses += 1
+            if track.misses >= self.max_misses:
+                removed.add(t)
+                if track.confirmed:
+                    exited.append(track)
+        
+        if removed:
+            self.tracks = [track for i, track in enumerate(self.tracks) if i not in removed]
+        
+        for d in unmatched_detections:
+            class_name, conf, box = detections[d]
+            track = Track(self._next_id, class_name, conf, box)
+            self._next_id += 1
+            self.tracks.append(track)
+            if track.hits >= self.min_hits:
+                track.confirmed = True
+                entered.append(track)
+        
+        return entered, exited
+    
+    # 확정된 트랙 수 (장바구니에 있는 것으로 보고한 물품 수)
+    def confirmed_count(self) -> int:
+        return sum(1 for track in self.tracks if track.confirmed)
+    
+    # 미확정 트랙 전체를 덮는 상자 (x1, y1, x2, y2), 없으면 None
+    def pending_box(self) -> Optional[Box]:
+        boxes = [track.box for track in self.tracks if not track.confirmed]
+        if not boxes:
+            return None
+        boxes = np.array(boxes, dtype=np.float64)
+        return (float(boxes[:, 0].min()), float(boxes[:, 1].min()),
+                float(boxes[:, 2].max()), float(boxes[:, 3].max()))
+    
+    def reset(self):
+        self.tracks = []
+    
+    # 트랙-검출 연결 (같은 클래스, IoU 내림차순 탐욕적 매칭)
+    def _match(self, detections: Sequence[Detection]) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+        if not self.tracks or not detections:
+            return [], list(range(len(self.tracks))), list(range(len(detections)))
+        
+        track_boxes = np.array([track.box for track in self.tracks], dtype=np.float64)
+        detection_boxes = np.array([box for _, _, box in detections], dtype=np.float64)
+        iou = self.iou_matrix(track_boxes, detection_boxes)
+        
+        # 다른 클래스끼리는 연결하지 않음
+        track_classes = np.array([track.class_name for track in self.tracks])
+        detection_classes = np.array([name for name, _, _ in detections])
+        iou[track_classes[:, None] != detection_classes[None, :]] = 0.0
+        
+        matches = []
+        used_tracks, used_detections = set(), set()
+        for flat in np.argsort(-iou, axis=None):
+            t, d = divmod(int(flat), iou.shape[1])
+            if iou[t, d] < self.iou_threshold:
+                break
+            if t in used_tracks or d in used_detections:
+                continue
+            matches.append((t, d))
+            used_tracks.add(t)
+            used_detections.add(d)
+        
+        unmatched_tracks = [t for t in range(len(self.tracks)) if t not in used_tracks]
+        unmatched_detections = [d for d in range(len(detections)) if d not in used_detections]
+        return matches, unmatched_tracks, unmatched_detections
+    
+    # 정적 메서드: 상자 집합 간 IoU 행렬 (N×M)
+    @staticmethod
+    def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+        x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+        y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+        x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+        y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+        inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+        
+        area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+        area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+        union = area_a[:, None] + area_b[None, :] - inter
+        return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+    
+    # 정적 메서드: 상자 중 영역 안에 들어가는 면적 비율
+    @staticmethod
+    def _coverage(box: Box, region: Box) -> float:
+        w = max(0.0, min(box[2], region[2]) - max(box[0], region[0]))
+        h = max(0.0, min(box[3], region[3]) - max(box[1], region[1]))
+        area = (box[2] - box[0]) * (box[3] - box[1])
+        return w * h / area if area > 0 else 1.0
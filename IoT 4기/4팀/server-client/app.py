@@ -1,103 +1,179 @@
-# main.py
-from flask import Flask, render_template, redirect, url_for
-from flask_socketio import SocketIO, emit
-from config import Config
-from database import DatabaseManager
-from cart_manager import CartManager
-
-app = Flask(__name__)
-app.config['SECRET_KEY'] = Config.SECRET_KEY
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# --- 인스턴스 초기화 ---
-db_manager = DatabaseManager()
-cart_manager = CartManager(db_manager)
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-@app.route('/shoppingEnd')
-def shopping_end():
-    return render_template('shopping_end.html', finished_id=cart_manager.cart_id)
-
-@app.route('/restartShopping')
-def restart_shopping():
-    cart_manager.restart_shopping()
-    return redirect(url_for('index'))
-
-# --- 소켓 이벤트 ---
-
-@app.route('/update_full_state') # 혹은 socketio.on('update_full_state')
-@socketio.on('update_full_state')
-def handle_full_state(data):
-    # 로직 매니저에게 데이터 전달
-    should_broadcast = cart_manager.update_state(data)
-    
-    if should_broadcast:
-        # 웹 브라우저 전송
-        socketio.emit('sc_data', cart_manager.get_state())
-
-@socketio.on('update_confidence')
-def handle_confidence(data):
-    cart_manager.handle_risk()
-    val = data.get('confidence', 'Unknown')
-    socketio.emit('show_warning', {'msg': '도난이 감지되었습니다!', 'confidence': val})
-
-PRODUCT_PRICES = {
-    "scissors": 1000,
-    "remote": 3000,
-    "mouse": 15000,
-    "unknown": 0
-}
-cart_inventory = {}
-# ---------------------------------------------------------
-# [NEW] 3. 물품 감지 데이터 수신 -> 장바구니 리스트 업데이트
-# ---------------------------------------------------------
-# ---------------------------------------------------------
-# [NEW] 물품 감지 -> 가격 계산 -> 웹으로 전송
-# ---------------------------------------------------------
-@socketio.on('update_item')
-def handle_item_update(data):
-    global cart_inventory
-    
-    item_name = data.get('item_name')
-    
-    if item_name:
-        # 1. 수량 증가 로직
-        if item_name in cart_inventory:
-            cart_inventory[item_name] += 1
-        else:
-            cart_inventory[item_name] = 1
-            
-        print(f"🛒 장바구니 업데이트: {item_name} (총 {cart_inventory[item_name]}개)")
-
-        # 2. 웹으로 보낼 데이터 가공 (리스트 형태 + 총액)
-        receipt_data = []
-        grand_total = 0
-        
-        for name, count in cart_inventory.items():
-            price = PRODUCT_PRICES.get(name, 0) # 가격표에 없으면 0원
-            total_price = price * count
-            grand_total += total_price
-            
-            receipt_data.append({
-                'name': name,
-                'price': price,
-                'count': count,
-                'total': total_price
-            })
-        
-        # 3. 변경된 영수증 정보 전송
-        socketio.emit('update_receipt', {
-            'items': receipt_data,
-            'grand_total': grand_total
-        })
-
-if __name__ == '__main__':
-    try:
-        print("🚀 Server Started on port 8000...")
-        socketio.run(app, host='0.0.0.0', port=8000, debug=False)
-    finally:
-        db_manager.close()
+# main.py
+import struct
+from flask import Flask, render_template, redirect, url_for, jsonify, request, abort
+from flask_socketio import SocketIO, emit, join_room
+from config import Config
+from database import DatabaseManager
+from cart_registry import CartRegistry
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = Config.SECRET_KEY
+socketio = SocketIO(app, cors_allowed_origins="*")
+
+# --- 인스턴스 초기화 ---
+db_manager = DatabaseManager()
+cart_registry = CartRegistry(db_manager)
+
+# 페이지의 카트 선택: ?cart=<device_id> (없으면 기본 카트)
+def requested_device_id():
+    return request.args.get('cart') or Config.DEFAULT_DEVICE_ID
+
+@app.route('/')
+def index():
+    return render_template('index.html', device_id=requested_device_id())
+
+# 카트 세션은 엣지가 접속할 때만 생기므로 모르는 카트는 404 (페이지 요청으로 세션을 만들지 않음)
+@app.route('/shoppingEnd')
+def shopping_end():
+    cart_manager = cart_registry.get(requested_device_id())
+    if cart_manager is None:
+        abort(404)
+    return render_template('shopping_end.html', finished_id=cart_manager.cart_id, device_id=cart_manager.device_id)
+
+@app.route('/restartShopping')
+def restart_shopping():
+    cart_manager = cart_registry.get(requested_device_id())
+    if cart_manager is None:
+        abort(404)
+    cart_manager.restart_shopping()
+    return redirect(url_for('index', cart=cart_manager.device_id))
+
+# 엣지 파이프라인 통계 최근 값 조회 (?cart=<device_id>면 해당 카트만, 없으면 전체 {device_id: 통계})
+@app.route('/edge_stats')
+def edge_stats():
+    device_id = request.args.get('cart')
+    if device_id:
+        return jsonify(latest_edge_stats.get(device_id, {}))
+    return jsonify(latest_edge_stats)
+
+# InfluxDB write-behind 버퍼 통계 (큐 깊이, spill 로그 대기 라인, 전송/재전송/실패 수)
+@app.route('/db_stats')
+def db_stats():
+    return jsonify(db_manager.get_write_stats())
+
+# --- 소켓 이벤트 ---
+
+# 접속: auth = {'device_id': ..., 'role': 'edge' | 'dashboard'}
+# - 엣지: 소켓을 카트에 연결 (이후 이벤트는 이 카트 상태로 처리)
+# - 대시보드: 카트 room에 입장 (자기 카트 이벤트만 수신), 늦게 접속해도 현재 영수증 전체를 바로 받음
+#   카트 세션은 만들지 않음 (엣지가 아직 접속하지 않았으면 빈 영수증, 엣지가 접속하면 같은 room으로 이벤트 수신)
+@socketio.on('connect')
+def handle_connect(auth=None):
+    auth = auth or {}
+    device_id = auth.get('device_id') or request.args.get('device_id')
+    
+    if auth.get('role') == 'dashboard':
+        device_id = cart_registry.resolve(device_id)
+        join_room(CartRegistry.room(device_id))
+        emit('update_receipt', cart_registry.receipt_snapshot(device_id))
+    else:
+        cart_registry.bind(request.sid, device_id)
+
+@socketio.on('disconnect')
+def handle_disconnect(*args):
+    cart_registry.unbind(request.sid)
+
+# 이벤트를 보낸 엣지의 카트 (엣지로 연결되지 않은 소켓이면 None → 이벤트 무시)
+def current_cart():
+    return cart_registry.for_sid(request.sid)
+
+@app.route('/update_full_state') # 혹은 socketio.on('update_full_state')
+@socketio.on('update_full_state')
+def handle_full_state(data):
+    cart_manager = current_cart()
+    if cart_manager is None:
+        return
+    
+    # 로직 매니저에게 데이터 전달
+    should_broadcast = cart_manager.update_state(data)
+    
+    if should_broadcast:
+        # 해당 카트 대시보드로 전송
+        socketio.emit('sc_data', cart_manager.get_state(), to=CartRegistry.room(cart_manager.device_id))
+
+@socketio.on('update_confidence')
+def handle_confidence(data):
+    cart_manager = current_cart()
+    if cart_manager is None:
+        return
+    cart_manager.handle_risk()
+    val = data.get('confidence', 'Unknown')
+    socketio.emit('show_warning', {'msg': '도난이 감지되었습니다!', 'confidence': val},
+                  to=CartRegistry.room(cart_manager.device_id))
+
+# 엣지 batched 모드 압축 프레임: flags(uint8), x(float32), y(float32), angle(int16), confidence(uint8)
+# flags: bit0 = 상태 포함, bit1 = 도난 경고 포함 (edge/communication/socket_client.py와 동일)
+PACKED_FRAME = struct.Struct('<BffhB')
+
+@socketio.on('update_packed')
+def handle_packed(data):
+    flags, x, y, angle, confidence = PACKED_FRAME.unpack(bytes(data))
+    
+    # 기존 개별 이벤트와 같은 순서: 도난 경고 → 상태
+    if flags & 0x02:
+        handle_confidence({'confidence': confidence})
+    if flags & 0x01:
+        handle_full_state({'x': x, 'y': y, 'angle': angle})
+
+# 엣지 파이프라인 요약 통계 (edge/utils/telemetry.py TelemetryReporter.compact 형식)
+# up: 가동 시간(초), n: 단계별 카운터, err: 단계별 오류 수, lat: {단계: [p50, p95, max] ms}, hist: {단계: 지연 구간별 샘플 수}
+# 카트별 최근 값 {device_id: 통계}
+latest_edge_stats = {}
+
+@socketio.on('edge_stats')
+def handle_edge_stats(data):
+    cart_manager = current_cart()
+    if cart_manager is not None:
+        latest_edge_stats[cart_manager.device_id] = data
+
+# ---------------------------------------------------------
+# [NEW] 3. 물품 감지 데이터 수신 -> 장바구니 리스트 업데이트
+# ---------------------------------------------------------
+# ---------------------------------------------------------
+# [NEW] 물품 감지 -> 영수증 변경분 -> 웹으로 전송
+# ---------------------------------------------------------
+# 가격은 products.json 가격표(ProductCatalog, 서버 시작 시 한 번 로드, 파일이 바뀌면 다시 읽음)에서 조회
+# 웹으로는 바뀐 줄과 새 총액만 전송 (receipt_delta), 전체 영수증(update_receipt)은 접속 시/요청 시에만
+@socketio.on('update_item')
+def handle_item_update(data):
+    cart_manager = current_cart()
+    item_name = data.get('item_name')
+    
+    if cart_manager is not None and item_name:
+        # 1. 수량 증가 (카트별 영수증의 해당 줄과 총액만 갱신)
+        delta = cart_manager.add_item(item_name)
+        
+        print(f"🛒 [{cart_manager.device_id}] 장바구니 업데이트: {item_name} (총 {delta['item']['count']}개)")
+        emit_receipt_delta(cart_manager, delta)
+
+# 물품 이탈 (엣지 트래커가 장바구니에서 빠진 물품 하나마다 전송) -> 수량 감소 -> 웹으로 전송
+@socketio.on('remove_item')
+def handle_item_remove(data):
+    cart_manager = current_cart()
+    if cart_manager is None:
+        return
+    item_name = data.get('item_name')
+    
+    delta = cart_manager.remove_item(item_name)
+    if delta is not None:
+        print(f"🛒 [{cart_manager.device_id}] 장바구니 제거: {item_name} (남은 {delta['item']['count']}개)")
+        emit_receipt_delta(cart_manager, delta)
+
+# 대시보드의 전체 영수증 요청 (변경분 version이 건너뛰었을 때 등) -> 요청한 브라우저에만 전송
+@socketio.on('request_receipt')
+def handle_receipt_request(data=None):
+    device_id = (data or {}).get('device_id')
+    emit('update_receipt', cart_registry.receipt_snapshot(device_id))
+
+# 영수증 변경분 전송 (바뀐 줄 1개 + 총액 + version, count 0이면 해당 줄 삭제)
+def emit_receipt_delta(cart_manager, delta):
+    socketio.emit('receipt_delta', delta, to=CartRegistry.room(cart_manager.device_id))
+
+if __name__ == '__main__':
+    try:
+        print("🚀 Server Started on port 8000...")
+        socketio.run(app, host='0.0.0.0', port=8000, debug=False)
+    finally:
+        cart_registry.close()
+        db_manager.close()
         print("InfluxDB 연결 종료")
\ No newline at end of file
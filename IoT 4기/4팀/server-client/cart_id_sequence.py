@@ -0,0 +1,106 @@
+# cart_id_sequence.py
+import os
+import time
+import threading
+from config import Config
+
+class CartIdSequence:
+    # 쇼핑 세션 ID(cart_id) 순번 (로컬 상태 파일에 다음 ID 하나만 저장)
+    # - 시작 시 파일의 정수 하나만 읽음 (기록이 쌓여도 일정 시간, DB 조회 없음)
+    # - 발급할 때마다 다음 ID를 임시 파일에 쓰고 교체 → 서버가 중간에 꺼져도 같은 ID를 다시 발급하지 않음
+    # - 파일이 없을 때만 migrate(보통 DB의 마지막 cart_id 조회)로 시작 값을 정하고 파일 생성 (최초 1회 이전)
+    # - migrate가 실패하면(None 반환 또는 예외) 파일을 만들지 않고 백그라운드 스레드가 retry_interval마다 다시 이전
+    #   (느린 DB 조회가 발급 경로(소켓 접속, /restartShopping)를 막지 않음)
+    #   그동안은 기존 기록의 순번과 겹칠 수 없는 임시 ID(밀리초 단위 Unix 시각, PROVISIONAL_MIN 이상)를 발급
+    #   이전에 성공하면 이전 값부터 파일에 기록하고 순번 발급 (DB 장애 중 잘못된 시작 값이 파일에 영구히 남지 않음)
+    PROVISIONAL_MIN = 10 ** 12  # 임시 ID 하한 (2001년 이후 밀리초 시각, 일반 순번은 이보다 훨씬 작음)
+
+    def __init__(self, path=Config.CART_ID_FILE, migrate=None, retry_interval=Config.CART_ID_MIGRATE_RETRY_INTERVAL):
+        self.path = path
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._migrate = None
+        self.migrated = False
+        self._next_id = 1
+        self._last_provisional = 0
+        self._load(migrate)
+
+    def next(self):
+        # 다음 ID 발급 (DB 조회 없음, 이전 대기 중이면 임시 ID)
+        with self._lock:
+            if self._migrate is not None:
+                cart_id = max(int(time.time() * 1000), self._last_provisional + 1)
+                self._last_provisional = cart_id
+                return cart_id
+            cart_id = self._next_id
+            self._write(cart_id + 1)
+            self._next_id = cart_id + 1
+            return cart_id
+
+    def peek(self):
+        return self._next_id
+
+    def pending(self):
+        # 이전 대기 중 여부 (True면 임시 ID 발급 중, 파일 없음)
+        return self._migrate is not None
+
+    def close(self):
+        # 이전 재시도 스레드 정지
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _load(self, migrate):
+        try:
+            with open(self.path, 'r') as f:
+                self._next_id = int(f.read().strip())
+                return
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            print(f"⚠️ cart_id 순번 파일 손상, 다시 생성합니다: {self.path}")
+
+        if migrate is None:
+            self._write(self._next_id)
+            return
+        # 서버 시작 시 한 번은 바로 이전, 실패하면 백그라운드에서 재시도
+        self._migrate = migrate
+        if not self._try_migrate():
+            self._thread = threading.Thread(target=self._migrate_loop, name='cart-id-migrate', daemon=True)
+            self._thread.start()
+
+    def _migrate_loop(self):
+        while not self._stop_event.wait(self.retry_interval):
+            if self._try_migrate():
+                return
+
+    def _try_migrate(self):
+        # 기존 기록에서 다음 ID 계산 (DB 조회는 잠금 밖에서 → 조회 중에도 임시 ID 발급, 성공 여부 반환)
+        try:
+            next_id = self._migrate()
+        except Exception:
+            next_id = None
+        if next_id is None:
+            print(f"⚠️ cart_id 이전 실패 (DB 조회 불가), 이전될 때까지 임시 ID를 발급하고 {self.retry_interval:.0f}초마다 다시 시도합니다")
+            return False
+        with self._lock:
+            next_id = int(next_id)
+            # 기록의 마지막 ID가 (장애 중 기록이 재전송된) 임시 ID면 이번에 발급한 임시 ID 다음부터
+            if next_id >= self.PROVISIONAL_MIN:
+                next_id = max(next_id, self._last_provisional + 1)
+            self._write(next_id)
+            self._next_id = next_id
+            self._migrate = None
+            self.migrated = True
+        return True
+
+    def _write(self, next_id):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f'{next_id}\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -1,18 +1,35 @@
 # cart_manager.py
 import time
 from config import Config
+from receipt import Receipt
 
 class CartManager:
-    def __init__(self, db_manager):
+    # 카트 1대의 상태/장바구니/도난 타이머 (CartRegistry가 device_id마다 하나씩 생성)
+    # allocate_cart_id: 쇼핑 세션 ID 발급 함수 (여러 카트가 공유하는 순번, 없으면 DB 조회, 조회 실패 시 1)
+    # catalog: 상품 가격표 (ProductCatalog, 모든 카트 공유)
+    def __init__(self, db_manager, catalog, device_id='default', allocate_cart_id=None):
         self.db = db_manager
-        self.cart_id = self.db.get_next_cart_id()
+        self.catalog = catalog
+        self.device_id = device_id
+        self.allocate_cart_id = allocate_cart_id or (lambda: self.db.get_next_cart_id() or 1)
+        self.cart_id = self.allocate_cart_id()
         
         self.state = {'x': 0.0, 'y': 0.0, 'angle': 0}
         self.last_risk_time = 0.0
+        self.receipt = Receipt(catalog)
 
     def restart_shopping(self):
-        # 쇼핑 재시작 및 ID 증가
-        self.cart_id += 1
+        # 쇼핑 재시작: 새 ID 발급 (다른 카트와 겹치지 않음), 영수증 비우기
+        self.cart_id = self.allocate_cart_id()
+        self.receipt = Receipt(self.catalog)
+
+    def add_item(self, item_name):
+        # 물품 1개 추가 후 영수증 변경분 반환
+        return self.receipt.add(item_name)
+
+    def remove_item(self, item_name):
+        # 물품 1개 제거 후 영수증 변경분 반환 (없던 물품이면 None)
+        return self.receipt.remove(item_name)
 
     def handle_risk(self):
         # 도난 발생 처리
@@ -0,0 +1,70 @@
+# cart_registry.py
+import threading
+from config import Config
+from cart_manager import CartManager
+from receipt import ProductCatalog, Receipt
+from cart_id_sequence import CartIdSequence
+
+class CartRegistry:
+    # 카트(device_id)별 CartManager 세션 관리
+    # - 엣지는 접속 시 auth로 device_id를 보내고, 이후 이벤트는 소켓 sid → 카트로 바로 찾음 (카트 수와 무관한 O(1))
+    # - 카트 세션은 엣지가 접속(bind)할 때만 생성 → 대시보드/페이지의 임의 device_id로 세션 ID가 소모되지 않음
+    # - 대시보드는 카트별 Socket.IO room(cart:<device_id>)에 들어가 자기 카트 이벤트만 받음
+    # - 쇼핑 세션 ID(cart_id)는 모든 카트가 하나의 순번(CartIdSequence 파일)을 공유하여 겹치지 않게 발급
+    # - 상품 가격표는 한 번 읽어 모든 카트가 공유
+    def __init__(self, db_manager, catalog=None, sequence=None, default_device_id=Config.DEFAULT_DEVICE_ID):
+        self.db = db_manager
+        self.catalog = catalog or ProductCatalog()
+        self.sequence = sequence or CartIdSequence(migrate=db_manager.get_next_cart_id)
+        self.default_device_id = default_device_id
+        self._lock = threading.Lock()
+        self._carts = {}
+        self._sid_devices = {}
+
+    def resolve(self, device_id=None):
+        # device_id가 없으면 기본 카트
+        return device_id or self.default_device_id
+
+    def get(self, device_id=None):
+        # 카트 세션 조회 (생성하지 않음, 엣지가 접속한 적 없는 카트면 None)
+        return self._carts.get(self.resolve(device_id))
+
+    def bind(self, sid, device_id=None):
+        # 엣지 소켓을 카트에 연결 (처음 접속한 device_id면 카트 세션 생성)
+        device_id = self.resolve(device_id)
+        cart = self._carts.get(device_id)
+        if cart is None:
+            with self._lock:
+                cart = self._carts.get(device_id)
+                if cart is None:
+                    cart = CartManager(self.db, self.catalog, device_id, self.allocate_cart_id)
+                    self._carts[device_id] = cart
+        self._sid_devices[sid] = device_id
+        return cart
+
+    def unbind(self, sid):
+        self._sid_devices.pop(sid, None)
+
+    def for_sid(self, sid):
+        # 이벤트를 보낸 엣지 소켓의 카트 (엣지로 연결되지 않은 소켓이면 None)
+        device_id = self._sid_devices.get(sid)
+        return None if device_id is None else self._carts.get(device_id)
+
+    def receipt_snapshot(self, device_id=None):
+        # 카트 전체 영수증 (엣지가 아직 접속하지 않은 카트는 빈 영수증, version 0)
+        cart = self.get(device_id)
+        return cart.receipt.snapshot() if cart is not None else Receipt(self.catalog).snapshot()
+
+    def allocate_cart_id(self):
+        # 공유 순번에서 다음 쇼핑 세션 ID 발급
+        return self.sequence.next()
+
+    def device_ids(self):
+        return list(self._carts)
+
+    def close(self):
+        self.sequence.close()
+
+    @staticmethod
+    def room(device_id):
+        return f'cart:{device_id}'
@@ -1,3 +1,5 @@
+import os
+
 class Config:
     SECRET_KEY = 'secret!'
     
@@ -7,9 +9,28 @@ class Config:
     INFLUXDB_ORG = "4team"
     INFLUXDB_BUCKET = "4team"
     
+    # InfluxDB write-behind 설정 (cart_state 기록)
+    WRITE_QUEUE_SIZE = 10000  # 메모리 대기 라인 최대 수 (넘치면 전송 스레드가 spill 로그로)
+    WRITE_BATCH_SIZE = 500  # 한 번에 전송할 라인 수
+    WRITE_FLUSH_INTERVAL = 0.5  # 배치가 덜 찼어도 전송하는 주기 (초)
+    WRITE_RETRY_INTERVAL = 5.0  # DB 연결 실패 후 재시도 간격 (초)
+    WRITE_TIMEOUT = 5.0  # 전송 요청 제한 시간 (초)
+    WRITE_SPILL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cart_state.spill')  # DB 장애 중 라인 프로토콜 기록
+    
     # 로직 설정
     RISK_TIMEOUT = 2  # 도난 차단 시간
     IGNORE_ZONES = [
         {'x': 0.0, 'y': 0.0, 'name': 'StartPoint'},
         {'x': 1.2, 'y': 1.2, 'name': 'EndPoint'}
-    ]
\ No newline at end of file
+    ]
+    
+    # 상품 가격표 (서버 시작 시 한 번 읽어 캐시, 파일이 바뀌면 다시 읽음)
+    PRODUCT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'products.json')
+    PRODUCT_CATALOG_CHECK_INTERVAL = 5.0  # 가격표 파일 수정 여부 확인 간격 (초)
+    
+    # 쇼핑 세션 ID 순번 파일 (없으면 InfluxDB의 마지막 cart_id로 최초 1회 생성)
+    CART_ID_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cart_id.seq')
+    CART_ID_MIGRATE_RETRY_INTERVAL = 30.0  # 최초 이전 시 DB 조회 실패 후 백그라운드 재시도 간격 (초, 그동안 시각 기반 임시 ID 발급)
+    
+    # 멀티 카트 설정
+    DEFAULT_DEVICE_ID = 'default'  # device_id 없이 접속한 엣지/대시보드가 쓰는 카트 (기존 단일 카트 동작)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # database.py
-from influxdb_client import InfluxDBClient, WriteOptions
+from influxdb_client import InfluxDBClient
 from config import Config
+from write_behind import WriteBehindWriter, encode_cart_state
 
 class DatabaseManager:
     def __init__(self):
@@ -9,16 +10,16 @@ class DatabaseManager:
             token=Config.INFLUXDB_TOKEN, 
             org=Config.INFLUXDB_ORG
         )
-        self.write_api = self.client.write_api(write_options=WriteOptions(
-            batch_size=500,
-            flush_interval=500,
-            jitter_interval=0,
-            retry_interval=5000
-        ))
         self.query_api = self.client.query_api()
+        
+        # cart_state 기록은 write-behind 버퍼로 (소켓 핸들러는 DB 응답을 기다리지 않음, 장애 중에는 spill 로그)
+        self.writer = WriteBehindWriter()
+        self.writer.start()
 
     def get_next_cart_id(self):
         # 기존 데이터에서 마지막 ID를 조회하여 다음 ID 반환
+        # (1년치 cart_state 전체를 읽는 느린 조회 → CartIdSequence 파일이 없을 때 최초 1회 이전용으로만 사용)
+        # 조회 실패(DB 연결 불가 등)는 None → 기록이 없는 것(1)과 구분하여 CartIdSequence가 나중에 다시 시도
         try:
             query = f'''from(bucket:"{Config.INFLUXDB_BUCKET}") |> range(start: -1y)
                         |> filter(fn: (r) => r._measurement == "cart_state")
@@ -27,23 +28,22 @@ class DatabaseManager:
                         |> sort(columns: ["_time"], desc: true)
                         |> limit(n:1)'''
             tables = self.query_api.query(query, org=Config.INFLUXDB_ORG)
+        except Exception as e:
+            print(f"⚠️ 마지막 cart_id 조회 실패: {e}")
+            return None
+        try:
             last_val = tables[0].records[0].values.get("cart_id")
             return int(last_val) + 1
-        except Exception as e:
+        except (IndexError, TypeError, ValueError):
             return 1
 
     def save_cart_state(self, cart_id, state):
-        # 카트 상태 저장
-        point = {
-            "measurement": "cart_state",
-            "tags": { "cart_id": cart_id },
-            "fields": {
-                "x": state['x'],
-                "y": state['y'],
-                "angle": state['angle']
-            }
-        }
-        self.write_api.write(bucket=Config.INFLUXDB_BUCKET, record=point)
+        # 카트 상태 저장 (라인 프로토콜로 미리 인코딩 후 전송 예약, 기록 시각 포함)
+        self.writer.write(encode_cart_state(cart_id, state))
+
+    def get_write_stats(self):
+        return self.writer.get_stats()
 
     def close(self):
+        self.writer.stop()
         self.client.close()
\ No newline at end of file
@@ -0,0 +1,91 @@
+# receipt.py
+import os
+import json
+import time
+import threading
+from config import Config
+
+class ProductCatalog:
+    # 상품 가격표 (products.json을 처음 한 번 읽어 메모리에 캐시)
+    # 가격 조회 시 check_interval마다 파일 수정 시각만 확인하고, 바뀌었을 때만 다시 읽음 (서버 재시작 없이 가격 변경)
+    def __init__(self, path=Config.PRODUCT_CATALOG, check_interval=Config.PRODUCT_CATALOG_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.prices = {}
+        self.mtime = None
+        self._next_check = 0.0
+        self.reload()
+
+    def reload(self):
+        # 파일 수정 시각이 같으면 다시 읽지 않음 (변경 여부 반환)
+        # 서버 실행 중 읽기 실패(편집 중인 파일 등)는 기존 가격표를 유지하고 다음 확인 때 다시 시도
+        self._next_check = time.monotonic() + self.check_interval
+        try:
+            mtime = os.path.getmtime(self.path)
+            if mtime == self.mtime:
+                return False
+            with open(self.path, 'r', encoding='utf-8') as f:
+                products = json.load(f)
+        except (OSError, ValueError) as e:
+            if self.mtime is None:
+                raise
+            print(f"⚠️ 가격표 다시 읽기 실패 (기존 가격 유지): {e}")
+            return False
+        self.prices = {name: int(product.get('price', 0)) for name, product in products.items()}
+        self.mtime = mtime
+        return True
+
+    def price(self, name):
+        # 이미 영수증에 있는 줄의 단가는 바뀌지 않음 (새로 추가되는 줄부터 새 가격)
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        return self.prices.get(name, 0)  # 가격표에 없으면 0원
+
+class Receipt:
+    # 카트 1대의 누적 영수증
+    # - 물품 추가/제거 시 해당 줄과 총액만 갱신 (전체 목록 재계산 없음, O(1))
+    # - version: 변경마다 1 증가 → 대시보드가 변경분(delta)을 놓쳤는지 확인하고 전체(snapshot) 재요청
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self.lines = {}
+        self.grand_total = 0
+        self.version = 0
+
+    def add(self, name):
+        # 물품 1개 추가 후 변경분 반환
+        with self._lock:
+            line = self.lines.get(name)
+            if line is None:
+                line = {'name': name, 'price': self.catalog.price(name), 'count': 0, 'total': 0}
+                self.lines[name] = line
+            line['count'] += 1
+            line['total'] += line['price']
+            self.grand_total += line['price']
+            return self._delta(line)
+
+    def remove(self, name):
+        # 물품 1개 제거 후 변경분 반환 (없던 물품이면 None, 수량 0이 되면 줄 삭제)
+        with self._lock:
+            line = self.lines.get(name)
+            if line is None:
+                return None
+            line['count'] -= 1
+            line['total'] -= line['price']
+            self.grand_total -= line['price']
+            if line['count'] <= 0:
+                del self.lines[name]
+            return self._delta(line)
+
+    def snapshot(self):
+        # 전체 영수증 (기존 update_receipt 형식 + version)
+        with self._lock:
+            return {
+                'items': [dict(line) for line in self.lines.values()],
+                'grand_total': self.grand_total,
+                'version': self.version,
+            }
+
+    def _delta(self, line):
+        self.version += 1
+        return {'item': dict(line), 'grand_total': self.grand_total, 'version': self.version}
@@ -16,7 +16,7 @@ var config = {
 // ★ [핵심] 대시보드 기능을 관리하는 클래스 정의
 class CartDashboard {
     constructor() {
-        this.socket = io();
+        this.socket = io({ auth: CART_SOCKET_AUTH });
         this.unityInstance = null;
         
         // 상태 변수
@@ -152,7 +152,7 @@ class CartDashboard {
 
         // 복잡한 소켓 통신 없이 바로 결과 페이지로 이동합니다.
         // 현재 쇼핑은 끝났으니, 결과 페이지에서 다시 시작할 때 ID를 올리면 됩니다.
-        window.location.href = "/shoppingEnd";
+        window.location.href = "/shoppingEnd?cart=" + encodeURIComponent(CART_DEVICE_ID);
     }
 
     // [외부 호출용 함수] 카메라 전환
@@ -0,0 +1,343 @@
+# write_behind.py
+import os
+import time
+import queue
+import threading
+import collections
+import urllib.error
+import urllib.parse
+import urllib.request
+from config import Config
+
+# --- 라인 프로토콜 인코딩 ---
+
+def _escape_key(value):
+    # measurement/태그 키·값/필드 키 이스케이프 (쉼표, 공백, 등호)
+    return str(value).replace('\\', '\\\\').replace(',', '\\,').replace(' ', '\\ ').replace('=', '\\=')
+
+def _field_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f'{value}i'
+    if isinstance(value, float):
+        return repr(value)
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def encode_line(measurement, tags, fields, timestamp_ns):
+    # 포인트 1개 → 라인 프로토콜 한 줄 (타임스탬프는 ns, 나중에 재전송해도 기록 시각 유지)
+    tag_part = ''.join(f',{_escape_key(k)}={_escape_key(v)}' for k, v in tags.items())
+    field_part = ','.join(f'{_escape_key(k)}={_field_value(v)}' for k, v in fields.items())
+    return f'{_escape_key(measurement)}{tag_part} {field_part} {timestamp_ns}'
+
+def encode_cart_state(cart_id, state, timestamp_ns=None):
+    # cart_state 포인트 (기존 save_cart_state의 dict 포인트와 같은 태그/필드)
+    return encode_line(
+        'cart_state',
+        {'cart_id': cart_id},
+        {'x': float(state['x']), 'y': float(state['y']), 'angle': int(state['angle'])},
+        timestamp_ns if timestamp_ns is not None else time.time_ns(),
+    )
+
+# --- write-behind 전송 ---
+
+class WriteBehindWriter:
+    # InfluxDB write-behind 버퍼
+    # - write(): 미리 인코딩한 라인을 크기 제한 큐에 넣고 바로 반환 (소켓 핸들러는 DB도 파일도 기다리지 않음)
+    #   큐가 가득 차면 넘친 라인은 overflow 버퍼에만 넣고, 전송 스레드가 디스크 spill 로그로 옮김
+    #   (overflow 버퍼도 큐 크기만큼 차 있으면 버리고 lost로 집계)
+    # - 전송 스레드: batch_size개 또는 flush_interval마다 /api/v2/write로 한 번에 POST
+    # - DB가 느리거나 꺼져 있으면 배치를 spill 로그(라인 프로토콜, 추가 전용)에 기록하고 retry_interval마다 재연결 시도
+    # - spill 로그가 남아 있으면(DB 장애 후 또는 DB는 정상이지만 큐가 넘친 경우) 새 배치 전에 오래된 순서대로 재전송
+    #   로그를 batch_size줄씩 스트리밍으로 읽고, 보낸 위치는 커서 파일(.offset, 바이트 오프셋)에 기록
+    #   (로그 전체를 메모리에 읽거나 다시 쓰지 않음, 실패한 배치는 로그를 건드리지 않고 다음에 같은 위치부터 재전송)
+    #   큐에 한 배치 이상 쌓이면 재전송을 멈추고 새 배치부터 보낸 뒤 이어서 재전송 (서버 재시작 후에도 커서부터 재전송)
+    #   커서 기록 전에 종료되면 마지막 배치를 한 번 더 보냄 (같은 태그/시각의 포인트는 InfluxDB에서 덮어써져 중복되지 않음)
+    # - 잘못된 데이터(400/413/422)는 재시도해도 실패하므로 버리고 rejected로 집계
+    def __init__(self, url=Config.INFLUXDB_URL, token=Config.INFLUXDB_TOKEN, org=Config.INFLUXDB_ORG,
+                 bucket=Config.INFLUXDB_BUCKET, maxsize=Config.WRITE_QUEUE_SIZE,
+                 batch_size=Config.WRITE_BATCH_SIZE, flush_interval=Config.WRITE_FLUSH_INTERVAL,
+                 retry_interval=Config.WRITE_RETRY_INTERVAL, timeout=Config.WRITE_TIMEOUT,
+                 spill_path=Config.WRITE_SPILL_FILE):
+        query = urllib.parse.urlencode({'org': org, 'bucket': bucket, 'precision': 'ns'})
+        self.write_url = f"{url.rstrip('/')}/api/v2/write?{query}"
+        self.headers = {'Authorization': f'Token {token}', 'Content-Type': 'text/plain; charset=utf-8'}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.timeout = timeout
+        self.spill_path = spill_path
+        self.cursor_path = f'{spill_path}.offset'
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._overflow = collections.deque()
+        self._spill_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._retry_at = 0.0
+
+        # 전송/백프레셔 통계
+        self.queued = 0
+        self.written = 0
+        self.batches = 0
+        self.spilled = 0
+        self.overflowed = 0
+        self.replayed = 0
+        self.rejected = 0
+        self.lost = 0
+        self.failures = 0
+        self.queue_high_water = 0
+        self.last_latency = 0.0
+        self.last_error = None
+        self.db_up = True
+        self.spill_pending = self._count_spill_lines()  # 지난 실행에서 남은 로그(커서 이후) → 첫 전송 전에 재전송
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._write_loop, name='influx-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        # 전송 스레드 정지 (남은 큐는 한 번 전송 시도, 실패하면 spill 로그로)
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def write(self, line):
+        # 라인 1개 전송 예약 (대기/파일 I/O 없음)
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            if len(self._overflow) >= self._queue.maxsize:
+                self.lost += 1
+                return False
+            self._overflow.append(line)
+            self.overflowed += 1
+            return False
+        self.queued += 1
+        depth = self._queue.qsize()
+        if depth > self.queue_high_water:
+            self.queue_high_water = depth
+        return True
+
+    def get_stats(self):
+        return {
+            'db_up': self.db_up,
+            'queue_depth': self._queue.qsize(),
+            'queue_capacity': self._queue.maxsize,
+            'queue_high_water': self.queue_high_water,
+            'queued': self.queued,
+            'written': self.written,
+            'batches': self.batches,
+            'spilled': self.spilled,
+            'overflowed': self.overflowed,
+            'overflow_pending': len(self._overflow),
+            'spill_pending': self.spill_pending,
+            'replayed': self.replayed,
+            'rejected': self.rejected,
+            'lost': self.lost,
+            'failures': self.failures,
+            'last_latency_ms': self.last_latency * 1e3,
+            'last_error': self.last_error,
+        }
+
+    def _write_loop(self):
+        while not self._stop_event.is_set():
+            batch = self._next_batch()
+            self._spill_overflow()
+
+            # DB가 꺼져 있으면 재시도 시각까지는 바로 spill
+            if not self.db_up and time.monotonic() < self._retry_at:
+                self._spill(batch)
+                continue
+
+            # 재시도 시각이 됐거나 spill 로그가 남아 있으면 로그부터 재전송 (실패하면 이번 배치도 spill)
+            if not self.db_up or self.spill_pending:
+                if not self._replay_spill():
+                    self._spill(batch)
+                    continue
+                self.db_up = True
+
+            if batch:
+                self._send_or_spill(batch)
+
+        # 정지: 남은 큐 처리 (DB가 꺼져 있으면 spill 로그로 → 다음 실행에서 재전송)
+        self._spill_overflow()
+        remaining = []
+        while True:
+            try:
+                remaining.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if remaining:
+            if self.db_up:
+                self._send_or_spill(remaining)
+            else:
+                self._spill(remaining)
+
+    # 큐에서 배치 수집 (batch_size개가 모이거나 flush_interval이 지나면 반환)
+    def _next_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _send_or_spill(self, batch):
+        result = self._post(batch)
+        if result == 'ok':
+            self.written += len(batch)
+        elif result == 'rejected':
+            self.rejected += len(batch)
+        else:
+            self._mark_down()
+            self._spill(batch)
+
+    # 배치 POST → 'ok' | 'rejected' (데이터 오류, 재시도 안 함) | 'failed' (연결/서버 오류, 재시도)
+    def _post(self, batch):
+        body = ('\n'.join(batch) + '\n').encode('utf-8')
+        request = urllib.request.Request(self.write_url, data=body, headers=self.headers, method='POST')
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+            self.last_latency = time.perf_counter() - start
+            self.batches += 1
+            return 'ok'
+        except urllib.error.HTTPError as e:
+            self.last_error = f'HTTP {e.code}'
+            if e.code in (400, 413, 422):
+                return 'rejected'
+            return 'failed'
+        except Exception as e:
+            self.last_error = f'{type(e).__name__}: {e}'
+            return 'failed'
+
+    def _mark_down(self):
+        self.failures += 1
+        self.db_up = False
+        self._retry_at = time.monotonic() + self.retry_interval
+
+    # overflow 버퍼(write()에서 큐가 넘친 라인)를 spill 로그로 이동 (전송 스레드에서만 호출)
+    def _spill_overflow(self):
+        lines = []
+        while self._overflow:
+            lines.append(self._overflow.popleft())
+        self._spill(lines)
+
+    # spill 로그에 추가 (라인 프로토콜 그대로, 추가 전용)
+    def _spill(self, lines):
+        if not lines:
+            return
+        try:
+            with self._spill_lock:
+                with open(self.spill_path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+                self.spill_pending += len(lines)
+            self.spilled += len(lines)
+        except Exception as e:
+            self.lost += len(lines)
+            self.last_error = f'spill: {type(e).__name__}: {e}'
+
+    def _replay_spill(self):
+        # spill 로그를 커서 위치부터 batch_size줄씩 읽어 재전송 (실패 시 False, 커서는 보낸 배치 끝까지만 이동)
+        # 큐에 한 배치 이상 쌓이면 커서만 남겨 두고 True (다음 루프에서 이어서 재전송)
+        # 끝까지 보내면 커서 파일과 로그 삭제 (커서 먼저 → 중간에 종료돼도 로그를 건너뛰지 않음)
+        if not os.path.exists(self.spill_path):
+            with self._spill_lock:
+                self.spill_pending = 0
+            return True
+
+        with open(self.spill_path, 'rb') as f:
+            f.seek(self._read_cursor())
+            first = True
+            while True:
+                if self._stop_event.is_set():
+                    return False
+                if not first and self._queue.qsize() >= self.batch_size:
+                    return True
+                first = False
+                self._spill_overflow()  # 재전송 중 넘친 라인은 로그 끝에 추가 → 이번 재전송에서 이어서 전송
+                chunk = self._read_spill_batch(f)
+                if not chunk:
+                    break
+                result = self._post(chunk)
+                if result == 'ok':
+                    self.written += len(chunk)
+                    self.replayed += len(chunk)
+                elif result == 'rejected':
+                    self.rejected += len(chunk)
+                else:
+                    self._mark_down()
+                    return False
+                self._write_cursor(f.tell())
+                with self._spill_lock:
+                    self.spill_pending -= len(chunk)
+
+        with self._spill_lock:
+            self._remove_file(self.cursor_path)
+            self._remove_file(self.spill_path)
+            self.spill_pending = 0
+        return True
+
+    def _read_spill_batch(self, f):
+        # 현재 위치에서 최대 batch_size줄 (빈 줄 제외)
+        lines = []
+        while len(lines) < self.batch_size:
+            raw = f.readline()
+            if not raw:
+                break
+            line = raw.decode('utf-8', errors='replace').strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    def _read_cursor(self):
+        try:
+            with open(self.cursor_path, 'r') as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_cursor(self, offset):
+        # 임시 파일 작성 후 교체 (종료 시점과 관계없이 이전/새 커서 중 하나만 남음)
+        tmp_path = f'{self.cursor_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+        os.replace(tmp_path, self.cursor_path)
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _count_spill_lines(self):
+        # 지난 실행에서 남은 로그의 커서 이후 라인 수 (한 줄씩 읽어 셈)
+        if not os.path.exists(self.spill_path):
+            self._remove_file(self.cursor_path)
+            return 0
+        offset = self._read_cursor()
+        with open(self.spill_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            # 기록 중 종료되어 줄바꿈 없이 끝난 라인은 마무리 (다음 기록과 한 줄로 붙지 않게)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            if offset > size:
+                offset = 0
+                self._write_cursor(0)
+            f.seek(offset)
+            return sum(1 for line in f if line.strip())
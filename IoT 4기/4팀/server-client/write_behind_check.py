@@ -0,0 +1,162 @@
+# write_behind_check.py
+# DB write-behind 장애 복구 점검 (로컬 HTTP 서버를 InfluxDB /api/v2/write 대신 사용, 실제 DB 불필요)
+# 정상 → 장애(503) → 복구(재전송 중 일부 배치 실패) → 장애 중 서버 재시작 → 복구 순서로 라인을 보내고
+# DB가 받은 라인이 보낸 라인과 중복/누락 없이 같은지, 끝난 뒤 spill 로그/커서 파일이 남지 않았는지 확인
+#
+# 사용법:
+#   python3 write_behind_check.py                  # 단계별 1000줄
+#   python3 write_behind_check.py --lines 20000    # 큰 spill 로그
+# 실패하면 종료 코드 1
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import collections
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from write_behind import WriteBehindWriter, encode_cart_state
+
+class FakeInflux:
+    # /api/v2/write 대역 (받은 라인 기록, mode: 'up' | 'down'(503) | 'flaky'(3번째 요청마다 503))
+    def __init__(self):
+        self.received = []
+        self.mode = 'up'
+        self.requests = 0
+        self._lock = threading.Lock()
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8')
+                self.send_response(204 if owner.accept(body) else 503)
+                self.end_headers()
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def accept(self, body):
+        with self._lock:
+            self.requests += 1
+            if self.mode == 'down' or (self.mode == 'flaky' and self.requests % 3 == 0):
+                return False
+            self.received.extend(line for line in body.split('\n') if line)
+            return True
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def wait_until(condition, timeout):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return condition()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='write-behind 장애/복구 시 중복·누락 점검')
+    parser.add_argument('--lines', type=int, default=1000, help='단계별 라인 수')
+    parser.add_argument('--batch-size', type=int, default=50, help='전송/재전송 배치 크기')
+    parser.add_argument('--timeout', type=float, default=30.0, help='단계별 최대 대기 시간 (초)')
+    args = parser.parse_args()
+
+    db = FakeInflux()
+    work_dir = tempfile.mkdtemp(prefix='write_behind_check_')
+    spill_path = os.path.join(work_dir, 'cart_state.spill')
+
+    def make_writer():
+        writer = WriteBehindWriter(url=db.url, token='check', org='check', bucket='check',
+                                   maxsize=args.batch_size * 4, batch_size=args.batch_size,
+                                   flush_interval=0.05, retry_interval=0.2, timeout=1.0, spill_path=spill_path)
+        writer.start()
+        return writer
+
+    sent = []
+
+    def produce(writer, count):
+        # 라인마다 다른 시각 → 같은 라인이 두 번 오면 중복 전송
+        for i in range(count):
+            line = encode_cart_state(len(sent) % 7 + 1, {'x': i * 0.1, 'y': 1.0, 'angle': i % 360},
+                                     1_700_000_000_000_000_000 + len(sent))
+            sent.append(line)
+            writer.write(line)
+            if i % 100 == 99:
+                time.sleep(0.01)
+
+    errors = []
+    writer = make_writer()
+    try:
+        produce(writer, args.lines)
+        if not wait_until(lambda: len(db.received) == len(sent), args.timeout):
+            errors.append(f'정상: {len(sent)}줄 중 {len(db.received)}줄 수신')
+        print(f"정상       전송 {len(sent)}, 수신 {len(db.received)}")
+
+        db.mode = 'down'
+        produce(writer, args.lines)
+        wait_until(lambda: writer.get_stats()['queue_depth'] == 0, args.timeout)
+        time.sleep(0.3)
+        stats = writer.get_stats()
+        print(f"장애       spill 대기 {stats['spill_pending']}, 실패 {stats['failures']}")
+        if stats['spill_pending'] == 0 or not os.path.exists(spill_path):
+            errors.append('장애: spill 로그에 기록되지 않음')
+
+        db.mode = 'flaky'
+        produce(writer, args.lines)
+        if not wait_until(lambda: writer.get_stats()['spill_pending'] == 0 and len(db.received) >= len(sent),
+                          args.timeout):
+            errors.append(f"복구: spill 대기 {writer.get_stats()['spill_pending']}줄 남음")
+        stats = writer.get_stats()
+        print(f"복구       재전송 {stats['replayed']}, 실패 {stats['failures']}, 수신 {len(db.received)}")
+
+        # 장애 중 서버 재시작 → 새 writer가 남은 로그를 커서부터 재전송
+        db.mode = 'down'
+        produce(writer, args.lines)
+        writer.stop()
+        pending = writer.get_stats()['spill_pending']
+        db.mode = 'flaky'
+        writer = make_writer()
+        print(f"재시작     남은 로그 {pending}, 새 writer 대기 {writer.spill_pending}")
+        if writer.spill_pending != pending:
+            errors.append(f'재시작: 남은 로그 {pending}줄, 새 writer {writer.spill_pending}줄')
+        produce(writer, args.lines)
+        if not wait_until(lambda: writer.get_stats()['spill_pending'] == 0 and len(db.received) >= len(sent),
+                          args.timeout):
+            errors.append(f"재시작 후 복구: spill 대기 {writer.get_stats()['spill_pending']}줄 남음")
+        writer.stop()
+    finally:
+        writer.stop()
+        db.close()
+
+    counts = collections.Counter(db.received)
+    duplicates = sum(n - 1 for n in counts.values() if n > 1)
+    missing = len(set(sent) - set(counts))
+    leftover = os.listdir(work_dir)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"결과       전송 {len(sent)}, 수신 {len(db.received)}, 중복 {duplicates}, 누락 {missing}, 남은 파일 {leftover}")
+
+    if duplicates:
+        errors.append(f'중복 {duplicates}줄')
+    if missing:
+        errors.append(f'누락 {missing}줄')
+    if leftover:
+        errors.append(f'남은 파일 {leftover}')
+    if errors:
+        print()
+        for error in errors:
+            print(f"⚠️ {error}")
+        return 1
+    print("✅ 중복/누락 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())